@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Hermetic benchmarks for Jenkins job discovery.
+
+Runs JenkinsJobParser.get_jobs and initialize_tools against a local fake
+Jenkins controller and compares the results with stored baselines.
+
+Usage:
+    python benchmarks/bench_discovery.py                     # run and compare with baselines
+    python benchmarks/bench_discovery.py --scenario small    # run a single scenario
+    python benchmarks/bench_discovery.py --update-baselines  # record new baselines
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, Any, Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_jenkins import FakeJenkinsServer
+
+BASELINES_PATH = Path(__file__).parent / 'baselines.json'
+
+# Absolute differences below these are treated as measurement noise
+TIME_NOISE_SECONDS = 0.05
+MEMORY_NOISE_MB = 0.5
+
+# Synthetic controllers, from quick smoke runs to a large controller
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    'small': {
+        'folder_depth': 2, 'folders_per_level': 3, 'jobs_per_folder': 5,
+        'parameter_mix': {'string': 2, 'boolean': 1, 'choice': 1},
+    },
+    'deep': {
+        'folder_depth': 4, 'folders_per_level': 3, 'jobs_per_folder': 4,
+        'parameter_mix': {'string': 3, 'boolean': 2, 'choice': 2, 'text': 1},
+    },
+    'slow': {
+        'folder_depth': 2, 'folders_per_level': 4, 'jobs_per_folder': 6,
+        'parameter_mix': {'string': 2, 'choice': 1}, 'latency': 0.02,
+    },
+    'flaky': {
+        'folder_depth': 2, 'folders_per_level': 3, 'jobs_per_folder': 5,
+        'parameter_mix': {'string': 2, 'boolean': 1}, 'error_rate': 0.05,
+    },
+}
+
+# Discovery configurations measured for every scenario
+CASES: Dict[str, Dict[str, Any]] = {
+    'threaded_per_job': {'engine': 'threaded', 'mode': 'per_job'},
+    'threaded_tree': {'engine': 'threaded', 'mode': 'tree'},
+    'async_per_job': {'engine': 'async', 'mode': 'per_job'},
+    'async_tree': {'engine': 'async', 'mode': 'tree'},
+}
+
+def build_config(server_url: str, case: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the dynamic configuration used by initialize_tools for a case."""
+    return {
+        'jenkins': {
+            'url': server_url,
+            'username': 'admin',
+            'password': 'benchmark-token',
+            'discovery': {
+                'engine': case['engine'],
+                'mode': case['mode'],
+                'backoff_factor': 0.01,
+            },
+        }
+    }
+
+def measure(func: Callable[[], int], server: FakeJenkinsServer, repeat: int) -> Dict[str, Any]:
+    """
+    Measure wall time over ``repeat`` runs, then peak memory in a traced run.
+
+    Wall time is the fastest run; requests and bytes, which vary with
+    injected errors and retries, are the median over all runs.
+    """
+    func = quiet(func)
+    timings = []
+    request_counts = []
+    byte_counts = []
+    jobs = 0
+    for _ in range(repeat):
+        server.reset_counters()
+        started = time.perf_counter()
+        jobs = func()
+        timings.append(time.perf_counter() - started)
+        request_counts.append(server.request_count)
+        byte_counts.append(server.bytes_sent)
+    requests_made = int(statistics.median(request_counts))
+    bytes_sent = int(statistics.median(byte_counts))
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    wall_time = min(timings)
+    return {
+        'wall_time': round(wall_time, 4),
+        'requests': requests_made,
+        'bytes': bytes_sent,
+        'peak_memory_mb': round(peak / (1024 * 1024), 2),
+        'jobs': jobs,
+        'jobs_per_second': round(jobs / wall_time, 1) if wall_time else 0.0,
+    }
+
+def quiet(func: Callable[[], Any]) -> Callable[[], Any]:
+    """Discard output printed by the code under measurement."""
+    def wrapper() -> Any:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func()
+    return wrapper
+
+def run_scenario(name: str, options: Dict[str, Any], repeat: int) -> Dict[str, Dict[str, Any]]:
+    from jenkins_ops.tools import initialize_tools, create_parser, get_jenkins_config
+    from jenkins_ops.tools.details_tool import JenkinsJobDetailsTool
+    from kubiya_sdk.tools.registry import tool_registry
+
+    results = {}
+    with FakeJenkinsServer(**options) as server:
+        print(f"\n== {name}: {server.tree.job_count} jobs in {server.tree.folder_count} folders")
+        for case_name, case in CASES.items():
+            tool_registry.dynamic_config = build_config(server.url, case)
+            config = quiet(get_jenkins_config)()
+
+            def discover() -> int:
+                jobs_info, _, _ = create_parser(config).get_jobs()
+                return len(jobs_info)
+
+            def initialize() -> int:
+                # Count job tools only, not the job details tool
+                return sum(1 for tool in initialize_tools() if not isinstance(tool, JenkinsJobDetailsTool))
+
+            for target, func in (('get_jobs', discover), ('initialize_tools', initialize)):
+                key = f"{case_name}.{target}"
+                results[key] = measure(func, server, repeat)
+                result = results[key]
+                result['expected_jobs'] = server.tree.job_count
+                print(
+                    f"{key:<36} {result['wall_time']:>8.3f}s {result['requests']:>6} req "
+                    f"{result['peak_memory_mb']:>8.2f} MB {result['jobs']:>6} jobs {result['jobs_per_second']:>9.1f} jobs/s"
+                )
+    return results
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baselines: Dict[str, Dict[str, Any]],
+    time_tolerance: float,
+    memory_tolerance: float,
+    request_tolerance: float
+) -> List[str]:
+    """Return a description of every metric that regressed past its baseline, and of every wrong job count."""
+    regressions = []
+    for key, result in results.items():
+        if result['jobs'] != result['expected_jobs']:
+            regressions.append(f"{key}: {result['jobs']} jobs discovered, the controller has {result['expected_jobs']}")
+        baseline = baselines.get(key)
+        if not baseline:
+            continue
+        if result['wall_time'] > baseline['wall_time'] * (1 + time_tolerance) + TIME_NOISE_SECONDS:
+            regressions.append(f"{key}: wall time {result['wall_time']}s > baseline {baseline['wall_time']}s")
+        if result['requests'] > baseline['requests'] * (1 + request_tolerance):
+            regressions.append(f"{key}: {result['requests']} requests > baseline {baseline['requests']}")
+        if result['peak_memory_mb'] > baseline['peak_memory_mb'] * (1 + memory_tolerance) + MEMORY_NOISE_MB:
+            regressions.append(f"{key}: peak memory {result['peak_memory_mb']} MB > baseline {baseline['peak_memory_mb']} MB")
+        if result['jobs'] < baseline['jobs']:
+            regressions.append(f"{key}: {result['jobs']} jobs discovered < baseline {baseline['jobs']}")
+    return regressions
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Jenkins job discovery against a fake controller")
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS), help="Scenario to run (default: all)")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per case; the fastest is reported")
+    parser.add_argument('--baselines', default=str(BASELINES_PATH), help="Baselines file")
+    parser.add_argument('--update-baselines', action='store_true', help="Store the results as the new baselines")
+    parser.add_argument('--time-tolerance', type=float, default=0.5, help="Allowed relative wall time regression")
+    parser.add_argument('--memory-tolerance', type=float, default=0.25, help="Allowed relative peak memory regression")
+    parser.add_argument('--request-tolerance', type=float, default=0.1, help="Allowed relative request count regression (retries vary)")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    os.environ.setdefault('JENKINS_URL', 'http://127.0.0.1')
+
+    baselines = {}
+    if os.path.exists(args.baselines):
+        with open(args.baselines) as f:
+            baselines = json.load(f)
+
+    regressions = []
+    for name in args.scenario or sorted(SCENARIOS):
+        results = run_scenario(name, SCENARIOS[name], args.repeat)
+        if args.update_baselines:
+            # A run that missed jobs must never become a baseline
+            regressions.extend(f"{name}/{line}" for line in compare(results, {}, 0, 0, 0))
+            baselines[name] = results
+        else:
+            regressions.extend(f"{name}/{line}" for line in compare(
+                results, baselines.get(name, {}), args.time_tolerance, args.memory_tolerance, args.request_tolerance
+            ))
+
+    if args.update_baselines:
+        if regressions:
+            print("\nBaselines not written, wrong job counts:\n- " + "\n- ".join(regressions))
+            return 1
+        with open(args.baselines, 'w') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\nBaselines written to {args.baselines}")
+        return 0
+
+    if regressions:
+        print("\nRegressions against baselines:\n- " + "\n- ".join(regressions))
+        return 1
+    print("\nNo regressions against baselines")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
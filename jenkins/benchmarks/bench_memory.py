@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for discovered job metadata.
+
+Processes the jobs of a synthetic controller offline (no HTTP requests) and
+compares the memory retained by ``jobs_info`` in the compact JobInfo layout
+with the plain dict layout it replaced.
+
+Usage:
+    python benchmarks/bench_memory.py                  # 20000 jobs, all scenarios
+    python benchmarks/bench_memory.py --jobs 5000      # smaller controller
+    python benchmarks/bench_memory.py --scenario unique
+"""
+import argparse
+import gc
+import logging
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, Any, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_jenkins import FakeJenkinsTree
+
+BASE_URL = 'http://jenkins.example.com'
+
+# Folder layout of the synthetic controller; jobs_per_folder is derived from --jobs
+FOLDER_DEPTH = 2
+FOLDERS_PER_LEVEL = 10
+
+# Parameter templates shared by the jobs: few templates share compiled schemas,
+# 'unique' gives almost every job its own parameter definitions
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    'templated': {'templates': 4, 'parameter_mix': {'string': 3, 'boolean': 2, 'choice': 2, 'text': 1}},
+    'unique': {'templates': None, 'parameter_mix': {'string': 3, 'boolean': 2, 'choice': 2, 'text': 1}},
+}
+
+# Job info layouts compared for every scenario
+LAYOUTS = ('dict', 'compact')
+
+def collect_jobs(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Flatten the synthetic folder tree into its job payloads."""
+    jobs = []
+    for item in items:
+        if 'jobs' in item:
+            jobs.extend(collect_jobs(item['jobs']))
+        else:
+            jobs.append(item)
+    return jobs
+
+def measure(layout: str, jobs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Process every job into ``jobs_info`` and measure the memory it retains."""
+    from jenkins_ops.tools.parser import JenkinsJobParser
+
+    parser = JenkinsJobParser(BASE_URL, 'admin', 'benchmark-token')
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    jobs_info = {}
+    for job in jobs:
+        job_info = parser._process_single_job(job['fullName'], job['url'], job)
+        # The dict layout is what discovery kept per job before JobInfo
+        jobs_info[job['fullName']] = job_info.to_dict() if layout == 'dict' else job_info
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'jobs': len(jobs_info),
+        'retained_mb': round(retained / (1024 * 1024), 2),
+        'peak_mb': round(peak / (1024 * 1024), 2),
+        'bytes_per_job': round(retained / len(jobs_info)) if jobs_info else 0,
+        'wall_time': round(elapsed, 3),
+    }
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare the memory of the compact and dict job info layouts")
+    parser.add_argument('--jobs', type=int, default=20000, help="Approximate number of synthetic jobs")
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS), help="Scenario to run (default: all)")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    folders = sum(FOLDERS_PER_LEVEL ** level for level in range(FOLDER_DEPTH + 1))
+    jobs_per_folder = max(1, round(args.jobs / folders))
+
+    for name in args.scenario or sorted(SCENARIOS):
+        options = SCENARIOS[name]
+        tree = FakeJenkinsTree(
+            BASE_URL,
+            folder_depth=FOLDER_DEPTH,
+            folders_per_level=FOLDERS_PER_LEVEL,
+            jobs_per_folder=jobs_per_folder,
+            parameter_mix=options['parameter_mix'],
+            templates=options['templates'] or folders * jobs_per_folder,
+        )
+        jobs = collect_jobs(tree.root['jobs'])
+        print(f"\n== {name}: {len(jobs)} jobs")
+
+        results = {layout: measure(layout, jobs) for layout in LAYOUTS}
+        for layout, result in results.items():
+            print(
+                f"{layout:<10} {result['retained_mb']:>9.2f} MB retained {result['peak_mb']:>9.2f} MB peak "
+                f"{result['bytes_per_job']:>7} B/job {result['wall_time']:>8.3f}s"
+            )
+        if results['dict']['retained_mb']:
+            saved = 1 - results['compact']['retained_mb'] / results['dict']['retained_mb']
+            print(f"compact layout retains {saved:.0%} less memory than the dict layout")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,304 @@
+"""Local fake Jenkins controller used by the discovery benchmarks.
+
+The server generates a synthetic folder tree and serves the subset of the
+Jenkins JSON API that ``JenkinsJobParser`` relies on, including ``tree=``
+field selection with ``{start,end}`` ranges.
+"""
+import gzip
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs, unquote
+
+FOLDER_CLASS = 'com.cloudbees.hudson.plugins.folder.Folder'
+PIPELINE_CLASS = 'org.jenkinsci.plugins.workflow.job.WorkflowJob'
+FREESTYLE_CLASS = 'hudson.model.FreeStyleProject'
+
+PARAMETER_TEMPLATES = {
+    'string': lambda i: {
+        '_class': 'hudson.model.StringParameterDefinition',
+        'name': f'STRING_PARAM_{i}',
+        'description': f'String parameter {i}',
+        'defaultParameterValue': {'_class': 'hudson.model.StringParameterValue', 'name': f'STRING_PARAM_{i}', 'value': f'value-{i}'},
+        'type': 'StringParameterDefinition',
+    },
+    'boolean': lambda i: {
+        '_class': 'hudson.model.BooleanParameterDefinition',
+        'name': f'BOOL_PARAM_{i}',
+        'description': f'Boolean parameter {i}',
+        'defaultParameterValue': {'_class': 'hudson.model.BooleanParameterValue', 'name': f'BOOL_PARAM_{i}', 'value': False},
+        'type': 'BooleanParameterDefinition',
+    },
+    'choice': lambda i: {
+        '_class': 'hudson.model.ChoiceParameterDefinition',
+        'name': f'CHOICE_PARAM_{i}',
+        'description': f'Choice parameter {i}',
+        'defaultParameterValue': {'_class': 'hudson.model.StringParameterValue', 'name': f'CHOICE_PARAM_{i}', 'value': 'dev'},
+        'choices': ['dev', 'staging', 'production'],
+        'type': 'ChoiceParameterDefinition',
+    },
+    'text': lambda i: {
+        '_class': 'hudson.model.TextParameterDefinition',
+        'name': f'TEXT_PARAM_{i}',
+        'description': f'Text parameter {i}',
+        'defaultParameterValue': {'_class': 'hudson.model.StringParameterValue', 'name': f'TEXT_PARAM_{i}', 'value': ''},
+        'type': 'TextParameterDefinition',
+    },
+}
+
+def parse_tree(spec: str) -> Dict[str, Tuple[Optional[Dict], Optional[Tuple[int, Optional[int]]]]]:
+    """Parse a Jenkins ``tree`` expression into ``{field: (subtree, range)}``."""
+    fields, pos = _parse_fields(spec, 0)
+    return fields
+
+def _parse_fields(spec: str, pos: int):
+    fields = {}
+    while pos < len(spec):
+        start = pos
+        while pos < len(spec) and spec[pos] not in ',[]{':
+            pos += 1
+        name = spec[start:pos]
+        subtree = None
+        rng = None
+        if pos < len(spec) and spec[pos] == '[':
+            subtree, pos = _parse_fields(spec, pos + 1)
+            pos += 1  # closing bracket
+        if pos < len(spec) and spec[pos] == '{':
+            end = spec.index('}', pos)
+            rng = _parse_range(spec[pos + 1:end])
+            pos = end + 1
+        if name:
+            fields[name] = (subtree, rng)
+        if pos < len(spec) and spec[pos] == ',':
+            pos += 1
+        elif pos < len(spec) and spec[pos] == ']':
+            return fields, pos
+    return fields, pos
+
+def _parse_range(text: str) -> Tuple[int, Optional[int]]:
+    if ',' in text:
+        start, end = text.split(',', 1)
+        return int(start or 0), (int(end) if end else None)
+    return 0, int(text)
+
+def apply_tree(obj: Any, tree: Dict) -> Any:
+    """Project ``obj`` through a parsed tree expression, like Jenkins does."""
+    if isinstance(obj, list):
+        return [apply_tree(item, tree) for item in obj]
+    if not isinstance(obj, dict):
+        return obj
+    result = {}
+    if '_class' in obj:
+        result['_class'] = obj['_class']
+    for name, (subtree, rng) in tree.items():
+        if name == '*':
+            for key, value in obj.items():
+                if key not in result and key != 'jobs':
+                    result[key] = apply_tree(value, {})
+            continue
+        if name not in obj:
+            continue
+        value = obj[name]
+        if isinstance(value, list) and rng is not None:
+            value = value[rng[0]:rng[1]]
+        if subtree is not None:
+            value = apply_tree(value, subtree)
+        elif isinstance(value, (dict, list)):
+            # Jenkins renders bare object references as their class only
+            value = apply_tree(value, {})
+        result[name] = value
+    return result
+
+def default_view(obj: Dict[str, Any]) -> Dict[str, Any]:
+    """Render an object the way ``api/json`` does without a tree parameter."""
+    result = {key: value for key, value in obj.items() if key != 'jobs'}
+    if 'jobs' in obj:
+        result['jobs'] = [
+            {'_class': job['_class'], 'name': job['name'], 'url': job['url'], 'color': job.get('color', 'notbuilt')}
+            for job in obj['jobs']
+        ]
+    return result
+
+class FakeJenkinsTree:
+    """Synthetic Jenkins item hierarchy."""
+
+    def __init__(
+        self,
+        base_url: str,
+        folder_depth: int = 2,
+        folders_per_level: int = 3,
+        jobs_per_folder: int = 5,
+        parameter_mix: Optional[Dict[str, int]] = None,
+        templates: int = 4,
+        seed: int = 0,
+    ):
+        self.base_url = base_url.rstrip('/') + '/'
+        self.parameter_mix = parameter_mix or {'string': 2, 'boolean': 1, 'choice': 1}
+        self.templates = max(1, templates)
+        self.random = random.Random(seed)
+        self.job_count = 0
+        self.folder_count = 0
+        self.root = {
+            '_class': 'hudson.model.Hudson',
+            'url': self.base_url,
+            'jobs': self._build_level('', self.base_url, folder_depth, folders_per_level, jobs_per_folder),
+        }
+
+    def _parameter_definitions(self, template: int) -> List[Dict[str, Any]]:
+        definitions = []
+        index = 0
+        for kind, count in self.parameter_mix.items():
+            for _ in range(count):
+                index += 1
+                definition = PARAMETER_TEMPLATES[kind](index)
+                definition['description'] += f' (template {template})'
+                definitions.append(definition)
+        return definitions
+
+    def _build_level(self, prefix: str, url: str, depth: int, folders: int, jobs: int) -> List[Dict[str, Any]]:
+        items = []
+        for i in range(jobs):
+            self.job_count += 1
+            name = f'job-{i}'
+            full_name = f'{prefix}{name}'
+            template = self.random.randrange(self.templates)
+            definitions = self._parameter_definitions(template)
+            items.append({
+                '_class': PIPELINE_CLASS if i % 2 == 0 else FREESTYLE_CLASS,
+                'name': name,
+                'fullName': full_name,
+                'url': f'{url}job/{name}/',
+                'description': f'Synthetic job {full_name}',
+                'buildable': True,
+                'color': 'blue',
+                'lastBuild': {'_class': 'org.jenkinsci.plugins.workflow.job.WorkflowRun', 'number': i + 1, 'timestamp': 1700000000000 + i},
+                'healthReport': [{'score': 100, 'description': 'Build stability: No recent builds failed.'}],
+                'property': [{'_class': 'hudson.model.ParametersDefinitionProperty', 'parameterDefinitions': definitions}],
+                'actions': [{'_class': 'hudson.model.ParametersDefinitionProperty', 'parameterDefinitions': definitions}, {}],
+            })
+        if depth > 0:
+            for i in range(folders):
+                self.folder_count += 1
+                name = f'folder-{i}'
+                folder_url = f'{url}job/{name}/'
+                items.append({
+                    '_class': FOLDER_CLASS,
+                    'name': name,
+                    'fullName': f'{prefix}{name}',
+                    'url': folder_url,
+                    'description': f'Synthetic folder {prefix}{name}',
+                    'jobs': self._build_level(f'{prefix}{name}/', folder_url, depth - 1, folders, jobs),
+                })
+        return items
+
+    def resolve(self, path: str) -> Optional[Dict[str, Any]]:
+        """Find the item addressed by a ``/job/a/job/b/...`` path."""
+        parts = [unquote(part) for part in path.strip('/').split('/') if part]
+        node = self.root
+        while parts:
+            if parts[0] != 'job' or len(parts) < 2:
+                break
+            name = parts[1]
+            node = next((item for item in node.get('jobs', []) if item['name'] == name), None)
+            if node is None:
+                return None
+            parts = parts[2:]
+        return node
+
+class FakeJenkinsServer:
+    """Threaded HTTP server serving a :class:`FakeJenkinsTree`."""
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, seed: int = 0, **tree_options):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.request_count = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self.httpd.server_address[1]}'
+        self.tree = FakeJenkinsTree(self.url, seed=seed, **tree_options)
+        self._thread = None
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                server._handle(self)
+
+        return Handler
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        with self._lock:
+            self.request_count += 1
+            fail = self.error_rate and self.random.random() < self.error_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            self._send(handler, 503, b'{"message": "Service Unavailable"}')
+            return
+
+        parsed = urlparse(handler.path)
+        path = parsed.path
+        query = parse_qs(parsed.query)
+        if not path.endswith('/api/json'):
+            self._send(handler, 404, b'{}')
+            return
+
+        node = self.tree.resolve(path[:-len('api/json')])
+        if node is None:
+            self._send(handler, 404, b'{}')
+            return
+
+        if 'tree' in query:
+            payload = apply_tree(node, parse_tree(query['tree'][0]))
+        else:
+            payload = default_view(node)
+        self._send(handler, 200, json.dumps(payload).encode(), gzip_ok='gzip' in handler.headers.get('Accept-Encoding', ''))
+
+    def _send(self, handler: BaseHTTPRequestHandler, status: int, body: bytes, gzip_ok: bool = False) -> None:
+        headers = {'Content-Type': 'application/json'}
+        if gzip_ok:
+            body = gzip.compress(body)
+            headers['Content-Encoding'] = 'gzip'
+        if status == 503:
+            headers['Retry-After'] = '0'
+        with self._lock:
+            self.bytes_sent += len(body)
+        handler.send_response(status)
+        for key, value in headers.items():
+            handler.send_header(key, value)
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def start(self) -> 'FakeJenkinsServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.request_count = 0
+            self.bytes_sent = 0
+
+    def __enter__(self) -> 'FakeJenkinsServer':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
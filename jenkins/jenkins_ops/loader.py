@@ -0,0 +1,12 @@
+"""
+Entry point for the Kubiya source loader.
+
+The loader runs every module of the source and then reads the tool
+registry, without calling ``get_tools()`` itself. Running this module is
+therefore the first tool request: it discovers the Jenkins jobs and
+registers their tools. This is the only module with that side effect;
+library code calls ``jenkins_ops.get_tools()`` instead of importing it.
+"""
+from jenkins_ops.tools.discover import get_tools
+
+tools = get_tools()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Print the full description and parameter details of a Jenkins job.
+
+Run by the jenkins_job_details tool. Generated job tools carry descriptions
+cut to a budget; this script fetches the complete details from Jenkins on
+demand. Uses only the standard library, so nothing is installed per run.
+"""
+import base64
+import html
+import json
+import os
+import re
+import sys
+from typing import Dict, Any, List
+from urllib.error import HTTPError
+from urllib.parse import quote
+from urllib.request import Request, urlopen
+
+CONFIG_PATH = '/tmp/jenkins_details_config.json'
+
+# Tool argument holding the full job name
+JOB_ARG = 'job'
+
+PARAMETER_FIELDS = 'name,type,description,choices,defaultParameterValue[value]'
+JOB_FIELDS = (
+    f'fullName,description,url,buildable,'
+    f'property[parameterDefinitions[{PARAMETER_FIELDS}]],actions[parameterDefinitions[{PARAMETER_FIELDS}]]'
+)
+
+def job_path(job_name: str) -> str:
+    """Return the URL path of a job from its full name, e.g. ``folder/my-job``."""
+    return ''.join(f"job/{quote(part)}/" for part in job_name.strip('/').split('/'))
+
+def strip_html(text: str) -> str:
+    text = re.sub(r'<\s*(br|/p|/div|/li)\s*/?\s*>', '\n', text or '', flags=re.IGNORECASE)
+    return html.unescape(re.sub(r'</?[a-zA-Z][a-zA-Z0-9]*(\s[^<>]*)?/?>', '', text)).strip()
+
+def fetch_job(jenkins_url: str, username: str, api_token: str, job_name: str) -> Dict[str, Any]:
+    auth = base64.b64encode(f"{username}:{api_token}".encode()).decode()
+    url = f"{jenkins_url.rstrip('/')}/{job_path(job_name)}api/json?tree={JOB_FIELDS}"
+    request = Request(url, headers={'Authorization': f'Basic {auth}'})
+    with urlopen(request, timeout=30) as response:
+        return json.load(response)
+
+def parameter_definitions(job: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Collect parameter definitions from properties and actions, without duplicates."""
+    definitions = {}
+    for source in job.get('property', []) + job.get('actions', []):
+        for definition in (source or {}).get('parameterDefinitions') or []:
+            definitions.setdefault(definition.get('name'), definition)
+    return list(definitions.values())
+
+def format_details(job: Dict[str, Any]) -> str:
+    lines = [f"📋 {job.get('fullName')}", f"🔗 {job.get('url')}"]
+    if not job.get('buildable', True):
+        lines.append("⚠️ The job is disabled")
+    description = strip_html(job.get('description') or '')
+    lines.extend(['', description or "No description"])
+
+    definitions = parameter_definitions(job)
+    lines.extend(['', f"Parameters ({len(definitions)}):"])
+    for definition in definitions:
+        kind = (definition.get('type') or '').replace('ParameterDefinition', '')
+        lines.append(f"\n• {definition.get('name')} ({kind or 'unknown'})")
+        if definition.get('description'):
+            lines.extend(f"    {line}" for line in strip_html(definition['description']).split('\n'))
+        default = (definition.get('defaultParameterValue') or {}).get('value')
+        if default not in (None, ''):
+            lines.append(f"    Default: {json.dumps(default) if isinstance(default, (dict, list)) else default}")
+        if definition.get('choices'):
+            lines.append(f"    Allowed values ({len(definition['choices'])}):")
+            lines.extend(f"      - {choice}" for choice in definition['choices'])
+    return '\n'.join(lines)
+
+def main():
+    with open(CONFIG_PATH) as f:
+        config = json.load(f)
+    job_name = (os.environ.get(JOB_ARG) or '').strip()
+    if not job_name:
+        print(f"❌ The {JOB_ARG} argument is required, e.g. team-a/deploy")
+        sys.exit(1)
+
+    try:
+        job = fetch_job(
+            config.get('jenkins_url') or os.environ['JENKINS_URL'],
+            config['username'],
+            os.environ[config.get('token_secret') or 'JENKINS_API_TOKEN'],
+            job_name
+        )
+    except HTTPError as e:
+        print(f"❌ Failed to fetch job {job_name}: HTTP {e.code}" + (" (job not found)" if e.code == 404 else ""))
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Failed to fetch job {job_name}: {str(e)}")
+        sys.exit(1)
+
+    print(format_details(job))
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,551 @@
 #!/usr/bin/env python3
-try:
-    import jenkins
-except ImportError:
-    print("WARN: jenkins module not found,this could be OK if you are just syncing (discovering) jobs against the Jenkins server")
-    pass
+import asyncio
+import base64
+import fcntl
+import gzip
+import hashlib
+import random
+import re
 import time
 import json
 import os
 import sys
+import signal
 import logging
-from typing import Dict, Any, Optional, Tuple
+import threading
+import uuid
+import requests
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from typing import Callable, Deque, Dict, Any, Iterator, List, Optional, Tuple
+from urllib.parse import quote, urljoin
 
 logger = logging.getLogger(__name__)
 
+# Responses worth retrying, as in jenkins_ops.tools.transport
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+# Throttling responses, the only ones a POST is retried on: a gateway error
+# may come after Jenkins already queued or stopped the build
+THROTTLE_STATUS_CODES = {429, 503}
+
+# Bounds (seconds) of the adaptive build and queue poll intervals
+MIN_POLL_INTERVAL = 2.0
+QUEUE_POLL_INTERVAL = 1.0
+MAX_QUEUE_POLL_INTERVAL = 10.0
+POLL_BACKOFF = 1.5
+
+# Console output is read in chunks of this size, so a log is never held in memory at once
+LOG_CHUNK_SIZE = 64 * 1024
+# Longer lines are split, bounding the memory of a line without newlines
+MAX_LINE_BYTES = 64 * 1024
+
+# Optional tool argument holding a JSON list of parameter sets to build concurrently
+PARAMETER_SETS_ARG = 'jenkins_parameter_sets'
+
+# Index of recently triggered builds by parameter hash, see BuildIndex
+DEFAULT_DEDUP_INDEX_PATH = '/tmp/jenkins-dedup/builds.json'
+# Seconds after which an index claim without a queue item is considered abandoned
+DEDUP_CLAIM_TIMEOUT = 30.0
+
+# Build class of pipeline runs, whose stages are described by the wfapi endpoints
+PIPELINE_RUN_CLASS = 'org.jenkinsci.plugins.workflow.job.WorkflowRun'
+# Progress line per stage status reported by wfapi/describe; other statuses are not printed
+STAGE_MESSAGES = {
+    'IN_PROGRESS': "▶️ Stage {name} started",
+    'PAUSED_PENDING_INPUT': "⏸️ Stage {name} is waiting for input",
+    'SUCCESS': "✅ Stage {name} succeeded in {duration}",
+    'UNSTABLE': "⚠️ Stage {name} is unstable after {duration}",
+    'FAILED': "❌ Stage {name} failed after {duration}",
+    'ABORTED': "🛑 Stage {name} aborted after {duration}",
+}
+
+class BuildCancelled(Exception):
+    """Raised when a build is cancelled while queued or running."""
+    pass
+
+class PollScheduler:
+    """
+    Build poll intervals adapted to the expected build duration.
+
+    Polls start at ``min_interval`` right after the build starts and back off
+    exponentially up to ``max_interval``. Near the predicted completion the
+    interval shrinks to half the remaining time, so the result is picked up
+    quickly. Builds running past the prediction back off again from
+    ``min_interval``.
+    """
+
+    def __init__(
+        self,
+        expected_duration: Optional[float],
+        min_interval: float = MIN_POLL_INTERVAL,
+        max_interval: float = 30.0,
+        backoff: float = POLL_BACKOFF
+    ):
+        self.expected_duration = expected_duration
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.backoff = backoff
+        self._interval = min_interval
+        self._overrun = False
+
+    def next_interval(self, elapsed: float) -> float:
+        """Return the delay before the next poll, given the seconds the build has been running."""
+        if self.expected_duration:
+            remaining = self.expected_duration - elapsed
+            if remaining <= 0 and not self._overrun:
+                self._overrun = True
+                self._interval = self.min_interval
+
+        interval = min(self._interval, self.max_interval)
+        self._interval = min(self._interval * self.backoff, self.max_interval)
+
+        if self.expected_duration and not self._overrun:
+            interval = min(interval, max(self.min_interval, remaining / 2))
+        return interval
+
+def build_started_at(build_info: Dict[str, Any]) -> float:
+    """
+    Return when a build started, on the local monotonic clock.
+
+    The Jenkins timestamp is compared with the local clock only once, when
+    the build is first seen; elapsed time is then measured with
+    ``time.monotonic()``, so clock skew or jumps do not change it.
+    """
+    now = time.monotonic()
+    timestamp = build_info.get('timestamp')
+    if not timestamp:
+        return now
+    return now - max(0.0, time.time() - timestamp / 1000)
+
+def print_lines(lines: List[str]) -> None:
+    sys.stdout.write('\n'.join(lines) + '\n')
+    sys.stdout.flush()
+
+def make_line_filter(pattern: Optional[str]) -> Optional[Callable[[str], Optional[str]]]:
+    """
+    Build a console line filter from a regular expression.
+
+    Like the keyword filter of the resource-lifecycle Terraform tools, the
+    filter returns the line when it should be shown and ``None`` otherwise.
+    """
+    if not pattern:
+        return None
+    regex = re.compile(pattern)
+
+    def filter_line(line: str) -> Optional[str]:
+        return line if regex.search(line) else None
+
+    return filter_line
+
+class BuildLog:
+    """
+    Bounded-memory sink for the console output of one build.
+
+    Output is written compressed to ``archive_path`` as it arrives and split
+    into lines, which are passed to ``output`` in batches. With a
+    ``line_filter``, only accepted lines are passed on and runs of identical
+    lines are collapsed into a count; without one, every line is passed on
+    unchanged. Only the last ``tail_lines`` lines are kept in memory, for the
+    summary at the end.
+    """
+
+    def __init__(
+        self,
+        archive_path: Optional[str] = None,
+        line_filter: Optional[Callable[[str], Optional[str]]] = None,
+        tail_lines: int = 50,
+        output: Optional[Callable[[List[str]], None]] = None
+    ):
+        self.archive_path = archive_path
+        self.line_filter = line_filter
+        self.output = output or print_lines
+        self.tail: Deque[str] = deque(maxlen=max(0, tail_lines))
+        self.bytes = 0
+        self.lines = 0
+        self.hidden = 0
+        self._pending = b''
+        self._last_line: Optional[str] = None
+        self._repeated = 0
+        self._archive = None
+        if archive_path:
+            os.makedirs(os.path.dirname(archive_path) or '.', exist_ok=True)
+            self._archive = gzip.open(archive_path, 'wb', compresslevel=6)
+
+    def write(self, data: bytes) -> None:
+        """Consume a chunk of console output."""
+        if not data:
+            return
+        self.bytes += len(data)
+        if self._archive:
+            self._archive.write(data)
+        data = self._pending + data
+        end = data.rfind(b'\n')
+        if end < 0:
+            self._pending = data
+            if len(self._pending) > MAX_LINE_BYTES:
+                self._pending = b''
+                self._add_lines([data.decode(errors='replace')])
+            return
+        # Decode complete lines only, so multi-byte characters are never split
+        self._pending = data[end + 1:]
+        self._add_lines(data[:end].decode(errors='replace').split('\n'))
+
+    def _add_lines(self, lines: List[str]) -> None:
+        lines = [line.rstrip('\r') for line in lines]
+        self.lines += len(lines)
+        self.tail.extend(lines[-self.tail.maxlen:] if self.tail.maxlen else ())
+        if not self.line_filter:
+            if lines:
+                self.output(lines)
+            return
+
+        shown = [line for line in lines if self.line_filter(line) is not None]
+        self.hidden += len(lines) - len(shown)
+        batch = []
+        for line in shown:
+            if line == self._last_line:
+                self._repeated += 1
+                continue
+            if self._repeated:
+                batch.append(f"... previous line repeated {self._repeated} more times")
+                self._repeated = 0
+            self._last_line = line
+            batch.append(line)
+        if batch:
+            self.output(batch)
+
+    def close(self) -> None:
+        """Emit the last partial line and finish the archive."""
+        if self._pending:
+            pending, self._pending = self._pending, b''
+            self._add_lines([pending.decode(errors='replace')])
+        if self._repeated:
+            self.output([f"... previous line repeated {self._repeated} more times"])
+            self._repeated = 0
+        if self._archive:
+            self._archive.close()
+            self._archive = None
+
+    def summary(self) -> List[str]:
+        """Lines describing what was not shown: the tail when lines were filtered, and the archive."""
+        lines = []
+        if self.hidden:
+            lines.append(
+                f"🔎 {self.hidden} of {self.lines} log lines hidden by the log filter, last {len(self.tail)} lines:"
+            )
+            lines.extend(self.tail)
+        if self.archive_path:
+            lines.append(f"🗄️ Full log ({self.bytes} bytes) archived to {self.archive_path}")
+        return lines
+
+def format_duration(millis: int) -> str:
+    seconds = max(0, int(millis or 0) // 1000)
+    minutes, seconds = divmod(seconds, 60)
+    return f"{minutes}m{seconds:02d}s" if minutes else f"{seconds}s"
+
+class StageProgress:
+    """
+    Stage-level progress of a pipeline build, from its ``wfapi/describe`` document.
+
+    The runner requests the document with the ETag of the previous answer and
+    hands changed documents to ``update``, which skips documents whose content
+    hash did not change (Jenkins does not send ETags for every version of the
+    plugin) and returns one line per stage whose status changed.
+    """
+
+    def __init__(self):
+        self.etag: Optional[str] = None
+        self.available = True
+        self.stages: List[Dict[str, Any]] = []
+        self._digest: Optional[str] = None
+        self._statuses: Dict[str, str] = {}
+
+    def update(self, body: bytes, etag: Optional[str] = None) -> List[str]:
+        self.etag = etag
+        digest = hashlib.sha1(body).hexdigest()
+        if digest == self._digest:
+            return []
+        self._digest = digest
+
+        self.stages = json.loads(body).get('stages', [])
+        lines = []
+        for stage in self.stages:
+            key = str(stage.get('id', stage.get('name')))
+            status = stage.get('status', '')
+            if self._statuses.get(key) == status:
+                continue
+            self._statuses[key] = status
+            message = STAGE_MESSAGES.get(status)
+            if message:
+                lines.append(message.format(
+                    name=stage.get('name', key), duration=format_duration(stage.get('durationMillis', 0))
+                ))
+        return lines
+
+    def summary(self) -> List[str]:
+        """A table of every stage with its final status and duration."""
+        if not self.stages:
+            return []
+        width = max(len(stage.get('name', '')) for stage in self.stages)
+        lines = ["📊 Stages:"]
+        for stage in self.stages:
+            lines.append(
+                f"  {stage.get('name', '').ljust(width)}  {stage.get('status', '-').ljust(12)}"
+                f"  {format_duration(stage.get('durationMillis', 0))}"
+            )
+        return lines
+
+def parameter_hash(jenkins_url: str, job_name: str, parameters: Dict[str, Any]) -> str:
+    """Hash of a build request, identical for the same job and the same normalized parameters."""
+    payload = {
+        'url': jenkins_url.rstrip('/'),
+        'job': job_name.strip('/'),
+        'parameters': {name: str(value) for name, value in parameters.items()},
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+class BuildIndex:
+    """
+    Small on-disk index of recently triggered builds, keyed by parameter hash.
+
+    Entries record the queue item and, once known, the build number of a
+    build request. Runners sharing the index file (on a shared volume, or
+    the fan-out builds of one run) find an identical request with one
+    lookup instead of scanning the job's build history. Access is
+    serialized with an ``fcntl`` lock on a sibling ``.lock`` file, held
+    only to read or update entries and never across Jenkins API calls.
+    Entries older than the window are dropped on every write.
+    """
+
+    def __init__(self, path: str, window: float):
+        self.path = path
+        self.window = window
+        self._thread_lock = threading.Lock()
+
+    @contextmanager
+    def locked(self) -> Iterator[Dict[str, Dict[str, Any]]]:
+        """Hold the index lock and yield its live entries; changes are written back on exit."""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with self._thread_lock, open(f"{self.path}.lock", 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                entries = self._load()
+                yield entries
+                self._save(entries)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable build index {self.path}: {str(e)}")
+            return {}
+        cutoff = time.time() - self.window
+        return {key: entry for key, entry in entries.items() if entry.get('triggered_at', 0) >= cutoff}
+
+    def _save(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, self.path)
+
+def request_not_sent(error: requests.exceptions.RequestException) -> bool:
+    """Return whether a request failed while connecting, before any of it reached Jenkins."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+class JenkinsApiError(Exception):
+    """Raised when the Jenkins API answers with an error status."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+class JenkinsApiClient:
+    """
+    Minimal Jenkins JSON API client for the runner.
+
+    Uses one pooled, authenticated ``requests`` session, built the same way as
+    ``jenkins_ops.tools.transport.create_session`` (the runner ships as a
+    single file, so it cannot import it). The CSRF crumb is fetched on the
+    first POST and reused; it is refreshed once if Jenkins rejects it.
+    Nothing is requested until the first API call.
+    """
+
+    def __init__(
+        self,
+        jenkins_url: str,
+        username: str,
+        api_token: str,
+        pool_size: int = 4,
+        timeout: float = 30.0,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5
+    ):
+        self.jenkins_url = jenkins_url.rstrip('/') + '/'
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        # None until fetched, then the crumb header or {} when CSRF protection is off
+        self._crumb: Optional[Dict[str, str]] = None
+        self._crumb_lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        auth = base64.b64encode(f"{username}:{api_token}".encode()).decode()
+        self.session.headers.update({
+            'Authorization': f'Basic {auth}',
+            'Accept-Encoding': 'gzip, deflate',
+        })
+
+    def job_url(self, job_name: str) -> str:
+        """Return the URL path of a job from its full name, e.g. ``folder/my-job``."""
+        return ''.join(f"job/{quote(part)}/" for part in job_name.strip('/').split('/'))
+
+    def _get_crumb(self, refresh: bool = False) -> Dict[str, str]:
+        with self._crumb_lock:
+            if self._crumb is None or refresh:
+                response = self.session.get(urljoin(self.jenkins_url, 'crumbIssuer/api/json'), timeout=self.timeout)
+                if response.status_code == 404:
+                    self._crumb = {}
+                else:
+                    self._raise_for_status(response)
+                    data = response.json()
+                    self._crumb = {data['crumbRequestField']: data['crumb']}
+            return self._crumb
+
+    def _raise_for_status(self, response: requests.Response) -> None:
+        if response.status_code < 400:
+            return
+        if response.status_code == 401:
+            message = "Authentication failed, check the Jenkins username and JENKINS_API_TOKEN"
+        elif response.status_code == 403:
+            message = f"Permission denied for {response.url}"
+        elif response.status_code == 404:
+            message = f"Not found: {response.url}"
+        else:
+            message = f"Jenkins returned HTTP {response.status_code} for {response.url}"
+        raise JenkinsApiError(message, response.status_code)
+
+    def request(self, method: str, path: str, allowed_statuses: Tuple[int, ...] = (), **kwargs) -> requests.Response:
+        """
+        Send a request relative to the Jenkins URL.
+
+        GET requests are retried on connection errors and on throttling and
+        gateway errors. Other requests, such as queueing or stopping a build,
+        are not idempotent: they are only retried when Jenkins throttled them
+        or when the connection failed before the request was sent.
+        """
+        url = urljoin(self.jenkins_url, path)
+        kwargs.setdefault('timeout', self.timeout)
+        extra_headers = kwargs.pop('headers', None) or {}
+        crumb_refreshed = False
+        attempt = 0
+        while True:
+            headers = dict(extra_headers)
+            if method != 'GET':
+                headers.update(self._get_crumb())
+            try:
+                response = self.session.request(method, url, headers=headers, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if (method != 'GET' and not request_not_sent(e)) or attempt >= self.max_retries:
+                    raise
+                response = None
+
+            if response is not None:
+                if response.status_code == 403 and method != 'GET' and self._crumb and not crumb_refreshed:
+                    # The crumb expired with the web session, get a new one
+                    self._get_crumb(refresh=True)
+                    crumb_refreshed = True
+                    continue
+                retry_statuses = RETRY_STATUS_CODES if method == 'GET' else THROTTLE_STATUS_CODES
+                if response.status_code not in retry_statuses or attempt >= self.max_retries:
+                    if response.status_code not in allowed_statuses:
+                        self._raise_for_status(response)
+                    return response
+
+            delay = random.uniform(0, min(30.0, self.backoff_factor * (2 ** attempt)))
+            attempt += 1
+            logger.warning(f"Retrying {method} {url} in {delay:.2f}s (attempt {attempt}/{self.max_retries})")
+            time.sleep(delay)
+
+    def get_json(self, path: str, **kwargs) -> Dict[str, Any]:
+        return self.request('GET', path, **kwargs).json()
+
+    def get_whoami(self) -> Dict[str, Any]:
+        return self.get_json('me/api/json')
+
+    def get_version(self) -> str:
+        return self.request('GET', '').headers.get('X-Jenkins', 'unknown')
+
+    def build_job(self, job_name: str, parameters: Optional[Dict[str, Any]] = None) -> int:
+        """Queue a build and return its queue item id."""
+        endpoint = 'buildWithParameters' if parameters else 'build'
+        response = self.request('POST', f"{self.job_url(job_name)}{endpoint}", params=parameters or None)
+        match = re.search(r'/queue/item/(\d+)', response.headers.get('Location', ''))
+        if not match:
+            raise JenkinsApiError(f"Jenkins did not return a queue item for {job_name} (HTTP {response.status_code})")
+        return int(match.group(1))
+
+    def get_queue_item(self, queue_id: int) -> Dict[str, Any]:
+        return self.get_json(f"queue/item/{queue_id}/api/json")
+
+    def cancel_queue(self, queue_id: int) -> None:
+        # Jenkins redirects or answers 404 after cancelling, depending on the version
+        self.request('POST', 'queue/cancelItem', params={'id': queue_id}, allow_redirects=False, allowed_statuses=(404,))
+
+    def get_build_info(self, job_name: str, build_number: int) -> Dict[str, Any]:
+        return self.get_json(f"{self.job_url(job_name)}{build_number}/api/json")
+
+    def get_recent_builds(self, job_name: str, count: int = 10) -> List[Dict[str, Any]]:
+        """Return the result and duration of the job's most recent builds."""
+        tree = f"builds[result,duration]{{0,{count}}}"
+        return self.get_json(f"{self.job_url(job_name)}api/json", params={'tree': tree}).get('builds', [])
+
+    def get_console_text(self, job_name: str, build_number: int) -> requests.Response:
+        """Streamed response with the full console output; read it with ``iter_content``."""
+        return self.request('GET', f"{self.job_url(job_name)}{build_number}/consoleText", stream=True)
+
+    def get_progressive_console(self, job_name: str, build_number: int, offset: int = 0) -> requests.Response:
+        """
+        Streamed response with the console output from byte ``offset``.
+
+        The ``X-Text-Size`` header carries the next offset and ``X-More-Data``
+        whether the build is still writing output.
+        """
+        return self.request(
+            'GET', f"{self.job_url(job_name)}{build_number}/logText/progressiveText",
+            params={'start': offset}, stream=True
+        )
+
+    def get_pipeline_description(
+        self, job_name: str, build_number: int, etag: Optional[str] = None
+    ) -> requests.Response:
+        """
+        Response with the stage description of a pipeline build.
+
+        With ``etag``, Jenkins may answer 304 when nothing changed. A 404 means
+        the Pipeline Stage View plugin is not installed.
+        """
+        return self.request(
+            'GET', f"{self.job_url(job_name)}{build_number}/wfapi/describe",
+            headers={'If-None-Match': etag} if etag else None, allowed_statuses=(304, 404)
+        )
+
+    def stop_build(self, job_name: str, build_number: int) -> None:
+        self.request('POST', f"{self.job_url(job_name)}{build_number}/stop", allow_redirects=False)
+
 class JenkinsJobRunner:
     """Handles Jenkins job execution and monitoring."""
     
@@ -23,7 +556,15 @@ class JenkinsJobRunner:
         api_token: str,
         job_name: str,
         stream_logs: bool = True,
-        poll_interval: int = 30
+        poll_interval: int = 30,
+        queue_timeout: int = 600,
+        verbose: bool = False,
+        log_filter: Optional[str] = None,
+        log_tail_lines: int = 50,
+        log_archive_dir: Optional[str] = None,
+        stage_progress: bool = True,
+        dedup_window: float = 0,
+        dedup_index_path: str = DEFAULT_DEDUP_INDEX_PATH
     ):
         self.jenkins_url = jenkins_url
         self.username = username
@@ -31,7 +572,19 @@ class JenkinsJobRunner:
         self.job_name = job_name
         self.stream_logs = stream_logs
         self.poll_interval = poll_interval
-        self.server = None
+        self.queue_timeout = queue_timeout
+        self.verbose = verbose
+        self.line_filter = make_line_filter(log_filter)
+        self.log_tail_lines = log_tail_lines
+        self.log_archive_dir = log_archive_dir
+        self.stage_progress = stage_progress
+        self.build_index = BuildIndex(dedup_index_path, dedup_window) if dedup_window > 0 else None
+        self.server: Optional[JenkinsApiClient] = None
+        self.cancel_event = threading.Event()
+
+    def cancel(self) -> None:
+        """Request cancellation of the queued or running build."""
+        self.cancel_event.set()
 
     def _unsanitize_parameters(self, parameters: Dict[str, Any], param_types: Dict[str, Dict[str, str]]) -> Dict[str, Any]:
         """Convert parameters back to their original names and types for Jenkins API."""
@@ -56,17 +609,24 @@ class JenkinsJobRunner:
             
         return unsanitized
 
-    def connect(self) -> None:
-        """Establish connection to Jenkins server."""
+    def connect(self, pool_size: int = 4) -> None:
+        """
+        Create the Jenkins API client.
+
+        No request is made here; the connection is opened by the first API
+        call. In verbose mode the user and version are checked up front.
+        """
         try:
-            self.server = jenkins.Jenkins(
+            self.server = JenkinsApiClient(
                 self.jenkins_url,
                 username=self.username,
-                password=self.api_token
+                api_token=self.api_token,
+                pool_size=pool_size
             )
-            user = self.server.get_whoami()
-            version = self.server.get_version()
-            logger.info(f"Connected to Jenkins {version} as {user['fullName']}")
+            if self.verbose:
+                user = self.server.get_whoami()
+                version = self.server.get_version()
+                logger.info(f"Connected to Jenkins {version} as {user['fullName']}")
         except Exception as e:
             logger.error(f"Failed to connect to Jenkins: {str(e)}")
             raise
@@ -97,8 +657,13 @@ class JenkinsJobRunner:
         
         return jenkins_params
 
-    def trigger_build(self, parameters: Dict[str, Any]) -> int:
-        """Trigger Jenkins build with parameters."""
+    def trigger_build(self, parameters: Dict[str, Any]) -> Tuple[int, bool]:
+        """
+        Trigger Jenkins build with parameters.
+
+        Returns the build number and whether the build was started by an
+        earlier identical request; such a build is followed but never stopped.
+        """
         try:
             # Load parameter type information
             with open('/tmp/jenkins_config.json', 'r') as f:
@@ -113,49 +678,438 @@ class JenkinsJobRunner:
             logger.debug(f"Original parameters: {parameters}")
             logger.debug(f"Parameters for Jenkins: {jenkins_params}")
             
+            if self.build_index:
+                return self._trigger_deduplicated(jenkins_params)
+
             # Queue the build with prepared parameters
             queue_id = self.server.build_job(self.job_name, parameters=jenkins_params)
             
-            # Get build number from queue
-            while True:
-                queue_item = self.server.get_queue_item(queue_id)
-                if queue_item.get('executable'):
-                    return queue_item['executable']['number']
-                time.sleep(2)
+            return self.wait_for_queue(queue_id), False
         except Exception as e:
             logger.error(f"Failed to trigger build: {str(e)}")
             raise
 
-    def get_build_logs(self, build_number: int, start_line: int = 0) -> Optional[str]:
-        """Get incremental build logs."""
+    def _trigger_deduplicated(self, jenkins_params: Dict[str, Any]) -> Tuple[int, bool]:
+        """
+        Attach to a queued, running or successful build with the same parameters, or queue a new one.
+
+        The indexed build is checked in Jenkins outside the index lock. A new
+        build is then claimed under the lock, only if the entry did not change
+        in the meantime, so concurrent identical requests queue a single
+        build; the others wait for the claim to get its queue item.
+        """
+        key = parameter_hash(self.jenkins_url, self.job_name, jenkins_params)
+        while True:
+            if self.cancel_event.is_set():
+                raise BuildCancelled("Cancelled before the build was triggered")
+            with self.build_index.locked() as entries:
+                entry = entries.get(key)
+
+            if entry and entry.get('queue_id') is None and time.time() - entry['triggered_at'] < DEDUP_CLAIM_TIMEOUT:
+                # Another request is queueing the build right now
+                self.cancel_event.wait(QUEUE_POLL_INTERVAL)
+                continue
+            reusable = self._reusable_build(entry) if entry and entry.get('queue_id') is not None else None
+            if reusable is not None:
+                break
+
+            claim = uuid.uuid4().hex
+            with self.build_index.locked() as entries:
+                if entries.get(key) != entry:
+                    # Another request recorded a build meanwhile, look again
+                    continue
+                entries[key] = {'job': self.job_name, 'queue_id': None, 'claim': claim, 'triggered_at': time.time()}
+            try:
+                queue_id = self.server.build_job(self.job_name, parameters=jenkins_params)
+            except Exception:
+                with self.build_index.locked() as entries:
+                    if entries.get(key, {}).get('claim') == claim:
+                        del entries[key]
+                raise
+            with self.build_index.locked() as entries:
+                if entries.get(key, {}).get('claim') == claim:
+                    entries[key]['queue_id'] = queue_id
+
+            build_number = self.wait_for_queue(queue_id)
+            with self.build_index.locked() as entries:
+                if entries.get(key, {}).get('claim') == claim:
+                    entries[key]['build_number'] = build_number
+            return build_number, False
+
+        queue_id, build_number = reusable
+        if build_number is None:
+            print(f"♻️ Identical build request is already queued (queue item {queue_id}), attaching to it")
+            build_number = self.wait_for_queue(queue_id, owned=False)
+        else:
+            print(f"♻️ Attaching to build #{build_number}, triggered with identical parameters "
+                  f"{time.time() - entry['triggered_at']:.0f}s ago")
+        return build_number, True
+
+    def _reusable_build(self, entry: Dict[str, Any]) -> Optional[Tuple[int, Optional[int]]]:
+        """
+        Return (queue id, build number) of an indexed build that can be attached to.
+
+        Queued and running builds, and builds that succeeded, can be reused.
+        Build number is None while the build is still waiting in the queue.
+        """
         try:
-            return self.server.get_build_console_output(self.job_name, build_number)
+            build_number = entry.get('build_number')
+            if build_number is None:
+                queue_item = self.server.get_queue_item(entry['queue_id'])
+                if queue_item.get('cancelled'):
+                    return None
+                if not queue_item.get('executable'):
+                    return entry['queue_id'], None
+                build_number = queue_item['executable']['number']
+            result = self.server.get_build_info(self.job_name, build_number).get('result')
+            if result in (None, 'SUCCESS'):
+                return entry['queue_id'], build_number
+        except Exception as e:
+            logger.debug(f"Indexed build is not reusable: {str(e)}")
+        return None
+
+    def wait_for_queue(self, queue_id: int, owned: bool = True) -> int:
+        """
+        Wait until a queued build starts and return its build number.
+
+        The queue is polled with a growing interval. When ``queue_timeout`` passes
+        or the runner is cancelled, the queue item is cancelled in Jenkins, unless
+        it was queued by another request (``owned`` is False).
+        """
+        deadline = time.monotonic() + self.queue_timeout
+        interval = QUEUE_POLL_INTERVAL
+        while True:
+            queue_item = self.server.get_queue_item(queue_id)
+            if queue_item.get('executable'):
+                return queue_item['executable']['number']
+            if queue_item.get('cancelled'):
+                raise BuildCancelled(f"Queue item {queue_id} was cancelled in Jenkins")
+
+            remaining = deadline - time.monotonic()
+            if self.cancel_event.is_set() or remaining <= 0:
+                if owned:
+                    self.server.cancel_queue(queue_id)
+                if self.cancel_event.is_set():
+                    raise BuildCancelled(f"Cancelled queued build {queue_id}" if owned else
+                                         f"Stopped waiting for queued build {queue_id}")
+                raise TimeoutError(
+                    f"Build did not start within {self.queue_timeout}s"
+                    f"{' and was removed from the queue' if owned else ''}: "
+                    f"{queue_item.get('why') or 'waiting in queue'}"
+                )
+
+            self.cancel_event.wait(min(interval, remaining))
+            interval = min(interval * POLL_BACKOFF, MAX_QUEUE_POLL_INTERVAL)
+
+    def get_expected_duration(self, build_info: Dict[str, Any], count: int = 10) -> Optional[float]:
+        """Median duration in seconds of the job's recent successful builds, or Jenkins' estimate."""
+        try:
+            builds = self.server.get_recent_builds(self.job_name, count)
+            durations = sorted(
+                build['duration'] for build in builds
+                if build.get('result') == 'SUCCESS' and build.get('duration')
+            )
+            if durations:
+                return durations[len(durations) // 2] / 1000
+        except Exception as e:
+            logger.debug(f"Failed to get recent build durations: {str(e)}")
+
+        estimated = build_info.get('estimatedDuration')
+        return estimated / 1000 if estimated and estimated > 0 else None
+
+    def open_build_log(self, build_number: int, output: Optional[Callable[[List[str]], None]] = None) -> BuildLog:
+        """Create the log sink of a build, archiving to ``log_archive_dir`` when configured."""
+        archive_path = None
+        if self.log_archive_dir:
+            archive_path = os.path.join(
+                self.log_archive_dir, f"{self.job_name.strip('/').replace('/', '_')}-{build_number}.log.gz"
+            )
+        return BuildLog(archive_path, self.line_filter, self.log_tail_lines, output)
+
+    def _stream_logs(self, build_number: int, offset: int, log: BuildLog) -> Tuple[int, bool, bool]:
+        """
+        Feed the console output written since byte ``offset`` to ``log``, chunk by chunk.
+
+        Returns:
+            Tuple of (next offset, more data expected, progressive output available)
+        """
+        received = 0
+        try:
+            with self.server.get_progressive_console(self.job_name, build_number, offset) as response:
+                next_offset = int(response.headers.get('X-Text-Size', offset))
+                more_data = response.headers.get('X-More-Data', '').lower() == 'true'
+                for chunk in response.iter_content(LOG_CHUNK_SIZE):
+                    log.write(chunk)
+                    received += len(chunk)
+        except Exception as e:
+            if received:
+                # Continue after the bytes already consumed on the next poll
+                logger.warning(f"Console output interrupted, resuming: {str(e)}")
+                return offset + received, True, True
+            logger.warning(f"Progressive console output unavailable, falling back to the full log: {str(e)}")
+            return offset, False, False
+        return next_offset, more_data, True
+
+    def _stream_full_log(self, build_number: int, offset: int, log: BuildLog) -> None:
+        """Feed the full console output to ``log``, skipping the first ``offset`` bytes already consumed."""
+        try:
+            with self.server.get_console_text(self.job_name, build_number) as response:
+                for chunk in response.iter_content(LOG_CHUNK_SIZE):
+                    if offset >= len(chunk):
+                        offset -= len(chunk)
+                        continue
+                    log.write(chunk[offset:])
+                    offset = 0
         except Exception as e:
             logger.warning(f"Failed to get build logs: {str(e)}")
-            return None
 
-    def monitor_build(self, build_number: int) -> Tuple[str, str]:
-        """Monitor build progress."""
+    def start_stage_progress(self, build_info: Dict[str, Any]) -> Optional[StageProgress]:
+        """Return a stage tracker for pipeline builds when stage progress is enabled."""
+        if self.stage_progress and build_info.get('_class') == PIPELINE_RUN_CLASS:
+            return StageProgress()
+        return None
+
+    def poll_stages(self, build_number: int, progress: StageProgress) -> List[str]:
+        """Return a line per stage whose status changed since the last poll."""
+        if not progress.available:
+            return []
+        try:
+            response = self.server.get_pipeline_description(self.job_name, build_number, progress.etag)
+            if response.status_code == 404:
+                raise JenkinsApiError("wfapi/describe not found, is the Pipeline Stage View plugin installed?", 404)
+            if response.status_code == 304:
+                return []
+            return progress.update(response.content, response.headers.get('ETag'))
+        except Exception as e:
+            logger.warning(f"Stage progress unavailable, continuing without it: {str(e)}")
+            progress.available = False
+            return []
+
+    def monitor_build(self, build_number: int, attached: bool = False) -> Tuple[str, str]:
+        """
+        Monitor build progress, streaming only new console output on each poll.
+
+        An ``attached`` build was started by another request and is not
+        stopped on cancellation.
+        """
+        log = self.open_build_log(build_number) if self.stream_logs else None
         try:
-            last_line = 0
+            offset = 0
+            progressive = self.stream_logs
+            scheduler = None
+            progress = None
+            stop_requested = False
+            started = time.monotonic()
             while True:
                 build_info = self.server.get_build_info(self.job_name, build_number)
                 status = build_info.get('result')
+                if scheduler is None:
+                    expected_duration = self.get_expected_duration(build_info)
+                    if expected_duration:
+                        logger.info(f"Expecting build to take about {expected_duration:.0f}s")
+                    scheduler = PollScheduler(expected_duration, max_interval=self.poll_interval)
+                    started = build_started_at(build_info)
+                    progress = self.start_stage_progress(build_info)
+
+                if progress:
+                    stage_lines = self.poll_stages(build_number, progress)
+                    if stage_lines:
+                        print_lines(stage_lines)
                 
-                # Stream logs if enabled
-                if self.stream_logs:
-                    logs = self.get_build_logs(build_number, last_line)
-                    if logs:
-                        print(logs, end='')
-                        last_line = len(logs.splitlines())
+                # Stream new log output if enabled
+                more_data = False
+                if progressive:
+                    offset, more_data, progressive = self._stream_logs(build_number, offset, log)
                 
                 if status:
+                    # Drain output written after the last poll until the server reports no more data
+                    while progressive and more_data:
+                        time.sleep(1)
+                        offset, more_data, progressive = self._stream_logs(build_number, offset, log)
+                    if log and not progressive:
+                        self._stream_full_log(build_number, offset, log)
+                    if log:
+                        log.close()
+                        for line in log.summary():
+                            print(line)
+                    if progress:
+                        for line in progress.summary():
+                            print(line)
                     return status, build_info.get('url', '')
-                
-                time.sleep(self.poll_interval)
+
+                if self.cancel_event.is_set() and not stop_requested:
+                    if attached:
+                        # Another request owns the build, leave it running
+                        raise BuildCancelled(f"Stopped following build #{build_number}")
+                    # Keep polling until Jenkins reports the aborted result
+                    print(f"🛑 Stopping build #{build_number}...")
+                    self.server.stop_build(self.job_name, build_number)
+                    stop_requested = True
+
+                delay = scheduler.next_interval(time.monotonic() - started)
+                if stop_requested:
+                    time.sleep(delay)
+                else:
+                    self.cancel_event.wait(delay)
         except Exception as e:
             logger.error(f"Failed to monitor build: {str(e)}")
             raise
+        finally:
+            if log:
+                log.close()
+
+class FanOutRunner:
+    """
+    Trigger and monitor several builds of one job concurrently.
+
+    All builds are polled from one event loop through the runner's Jenkins
+    connection, with blocking API calls run in a thread pool. At most
+    ``concurrency`` builds are queued or running at a time. Console output is
+    printed line by line, prefixed with the build's index, and archived per
+    build like a single run.
+    """
+
+    def __init__(self, runner: JenkinsJobRunner, concurrency: int = 4):
+        self.runner = runner
+        self.concurrency = max(1, concurrency)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def _call(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def _monitor(self, build_number: int, prefix: str, attached: bool = False) -> Dict[str, Any]:
+        """Poll a build until it finishes, streaming its prefixed console output."""
+        runner = self.runner
+        log = None
+        if runner.stream_logs:
+            log = runner.open_build_log(build_number, lambda lines: print_lines([f"{prefix} {line}" for line in lines]))
+        offset = 0
+        progressive = runner.stream_logs
+        scheduler = None
+        progress = None
+        stop_requested = False
+        try:
+            while True:
+                build_info = await self._call(runner.server.get_build_info, runner.job_name, build_number)
+                status = build_info.get('result')
+                if scheduler is None:
+                    expected_duration = await self._call(runner.get_expected_duration, build_info)
+                    scheduler = PollScheduler(expected_duration, max_interval=runner.poll_interval)
+                    started = build_started_at(build_info)
+                    progress = runner.start_stage_progress(build_info)
+
+                if progress:
+                    stage_lines = await self._call(runner.poll_stages, build_number, progress)
+                    if stage_lines:
+                        print_lines([f"{prefix} {line}" for line in stage_lines])
+
+                more_data = False
+                if progressive:
+                    offset, more_data, progressive = await self._call(runner._stream_logs, build_number, offset, log)
+
+                if status:
+                    while progressive and more_data:
+                        await asyncio.sleep(1)
+                        offset, more_data, progressive = await self._call(runner._stream_logs, build_number, offset, log)
+                    if log and not progressive:
+                        await self._call(runner._stream_full_log, build_number, offset, log)
+                    if log:
+                        log.close()
+                        for line in log.summary():
+                            print(f"{prefix} {line}", flush=True)
+                    if progress:
+                        for line in progress.summary():
+                            print(f"{prefix} {line}", flush=True)
+                    return {
+                        'build_number': build_number,
+                        'status': status,
+                        'duration': build_info.get('duration', 0) / 1000,
+                        'url': build_info.get('url', '')
+                    }
+
+                if runner.cancel_event.is_set() and not stop_requested:
+                    if attached:
+                        raise BuildCancelled(f"Stopped following build #{build_number}")
+                    print(f"{prefix} 🛑 Stopping build #{build_number}...", flush=True)
+                    await self._call(runner.server.stop_build, runner.job_name, build_number)
+                    stop_requested = True
+
+                await asyncio.sleep(scheduler.next_interval(time.monotonic() - started))
+        finally:
+            if log:
+                log.close()
+
+    async def _run_build(self, index: int, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        prefix = f"[{index + 1}]"
+        result = {'index': index + 1, 'parameters': parameters, 'build_number': None, 'status': None, 'duration': 0, 'url': ''}
+        async with self._semaphore:
+            try:
+                if self.runner.cancel_event.is_set():
+                    raise BuildCancelled("Cancelled before the build was triggered")
+                build_number, attached = await self._call(self.runner.trigger_build, parameters)
+                print(f"{prefix} 📋 Build #{build_number} started", flush=True)
+                result.update(await self._monitor(build_number, prefix, attached))
+            except Exception as e:
+                print(f"{prefix} ❌ {str(e)}", flush=True)
+                result.update(status='CANCELLED' if isinstance(e, BuildCancelled) else 'ERROR', error=str(e))
+        return result
+
+    async def run_async(self, parameter_sets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Trigger a build for every parameter set and return one result per set, in order."""
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        # Each build holds at most one blocking call at a time
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        try:
+            return await asyncio.gather(*(
+                self._run_build(index, parameters) for index, parameters in enumerate(parameter_sets)
+            ))
+        finally:
+            self._executor.shutdown(wait=False)
+
+    def run(self, parameter_sets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return asyncio.run(self.run_async(parameter_sets))
+
+def format_results(results: List[Dict[str, Any]]) -> str:
+    """Render fan-out build results as a plain text table."""
+    rows = [('#', 'Build', 'Status', 'Duration', 'Parameters', 'URL')]
+    for result in results:
+        parameters = ', '.join(f"{name}={value}" for name, value in result['parameters'].items())
+        rows.append((
+            str(result['index']),
+            f"#{result['build_number']}" if result['build_number'] else '-',
+            result['status'] or '-',
+            f"{result['duration']:.0f}s",
+            parameters if len(parameters) <= 60 else parameters[:57] + '...',
+            result['url'] or result.get('error', '')
+        ))
+    widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+    return '\n'.join('  '.join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() for row in rows)
+
+def get_parameter_sets_from_env() -> List[Dict[str, Any]]:
+    """
+    Get the parameter sets of a fan-out run, if the tool was given any.
+
+    Sets are keyed like the other tool arguments, by sanitized parameter
+    name; original Jenkins names are accepted and mapped to them, so a set
+    overrides the matching common parameter when both are merged.
+    """
+    value = os.environ.get(PARAMETER_SETS_ARG)
+    if not value:
+        return []
+    parameter_sets = json.loads(value)
+    if not isinstance(parameter_sets, list) or not all(isinstance(item, dict) for item in parameter_sets):
+        raise ValueError(f"{PARAMETER_SETS_ARG} must be a JSON list of objects mapping parameter names to values")
+
+    with open('/tmp/jenkins_config.json', 'r') as f:
+        config = json.load(f)
+    return [normalize_parameter_names(parameter_set, config.get('parameters', {})) for parameter_set in parameter_sets]
+
+def normalize_parameter_names(parameters: Dict[str, Any], param_types: Dict[str, Dict[str, str]]) -> Dict[str, Any]:
+    """Map original Jenkins parameter names to the sanitized names the tool arguments use."""
+    sanitized_names = {info.get('original_name', name): name for name, info in param_types.items()}
+    return {name if name in param_types else sanitized_names.get(name, name): value for name, value in parameters.items()}
 
 def get_parameters_from_env() -> Dict[str, Any]:
     """Get job parameters from environment variables and convert to appropriate types."""
@@ -203,29 +1157,56 @@ def main():
         
         # Get parameters from environment variables
         parameters = get_parameters_from_env()
+        parameter_sets = get_parameter_sets_from_env()
         
         # Initialize runner
         runner = JenkinsJobRunner(
-            jenkins_url=os.environ['JENKINS_URL'],
+            jenkins_url=config.get('jenkins_url') or os.environ['JENKINS_URL'],
             username=config['username'],
-            api_token=os.environ['JENKINS_API_TOKEN'],
+            api_token=os.environ[config.get('token_secret') or 'JENKINS_API_TOKEN'],
             job_name=config['job_name'],
             stream_logs=config.get('stream_logs', True),
-            poll_interval=config.get('poll_interval', 30)
+            poll_interval=config.get('poll_interval', 30),
+            queue_timeout=config.get('queue_timeout', 600),
+            verbose=config.get('verbose', False),
+            log_filter=config.get('log_filter'),
+            log_tail_lines=config.get('log_tail_lines', 50),
+            log_archive_dir=config.get('log_archive_dir'),
+            stage_progress=config.get('stage_progress', True),
+            dedup_window=config.get('dedup_window', 0),
+            dedup_index_path=config.get('dedup_index_path') or DEFAULT_DEDUP_INDEX_PATH
         )
+        if runner.verbose:
+            logging.basicConfig(level=logging.DEBUG)
+
+        # Cancel the queued or running build when the tool execution is stopped
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda *_: runner.cancel())
         
-        # Connect to Jenkins
+        # Connect to Jenkins, with one pooled connection per concurrent build
         print("🔌 Connecting to Jenkins...")
-        runner.connect()
+        runner.connect(pool_size=max(4, config.get('fanout_concurrency', 4)))
+
+        if parameter_sets:
+            # Fan out: one build per parameter set, on top of the common parameters
+            concurrency = config.get('fanout_concurrency', 4)
+            print(f"🚀 Triggering {len(parameter_sets)} builds, at most {concurrency} at a time...")
+            results = FanOutRunner(runner, concurrency=concurrency).run(
+                [{**parameters, **parameter_set} for parameter_set in parameter_sets]
+            )
+            print(format_results(results))
+            succeeded = sum(1 for result in results if result['status'] == 'SUCCESS')
+            print(f"{'✅' if succeeded == len(results) else '❌'} {succeeded}/{len(results)} builds succeeded")
+            sys.exit(0 if succeeded == len(results) else 1)
         
         # Trigger build
         print("🚀 Triggering build...")
-        build_number = runner.trigger_build(parameters)
+        build_number, attached = runner.trigger_build(parameters)
         print(f"📋 Build #{build_number} started")
         
         # Monitor build
         print("👀 Monitoring build progress...")
-        status, url = runner.monitor_build(build_number)
+        status, url = runner.monitor_build(build_number, attached)
         
         # Process result
         if status == 'SUCCESS':
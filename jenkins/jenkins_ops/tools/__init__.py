@@ -1,37 +1,134 @@
 import logging
 from kubiya_sdk.tools.registry import tool_registry
-from .jenkins_job_tool import JenkinsJobTool
+from .jenkins_job_tool import JenkinsJobTool, tool_config_hash
 from .parser import JenkinsJobParser
+from .async_parser import AsyncJenkinsJobParser
+from .cache import DiscoveryCache, DEFAULT_CACHE_PATH
+from .sharding import run_shards
+from .controllers import controller_name_for, controller_path, sync_controllers
+from .registry_diff import RegistryChanges, registered_tools, remove_stale_tools, registered_hash
+from .descriptions import DescriptionCompiler
+from .details_tool import DETAILS_TOOL_NAME, JenkinsJobDetailsTool, details_config_hash, details_tool_config
 from .config import DEFAULT_JENKINS_CONFIG
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 import json
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Controllers are synced in parallel threads that all register into one registry
+_register_lock = threading.Lock()
+
 # Default configuration values
 DEFAULT_CONFIG = {
     "stream_logs": True,
-    "poll_interval": 10,  # seconds
+    "poll_interval": 10,  # seconds, upper bound of the adaptive build poll interval
+    "queue_timeout": 600,  # seconds a build may wait in the queue
+    "fanout_concurrency": 4,  # builds in flight when a tool runs several parameter sets
+    "runner_environment": "pip",  # "pip", "wheelhouse" or "zipapp", see scripts/build_runner_env.py
+    "runner_volume": "jenkins-runner",  # shared volume with the pre-built wheelhouse
+    "verbose": False,  # runner logs debug output and checks the Jenkins user and version first
+    "log_filter": None,  # regex, only matching console lines are printed
+    "log_tail_lines": 50,  # console lines kept for the summary when lines are filtered
+    "log_archive_dir": "/tmp/jenkins-logs",  # full console logs are written here gzip-compressed
+    "stage_progress": True,  # report stage status and duration of pipeline builds from wfapi/describe
+    "dedup_window": 0,  # seconds an identical build request attaches to the earlier build, 0 disables
     "sync_all": True,
     "include": [],
     "exclude": [],
+    "discovery_mode": "per_job",  # "per_job" or "tree"
+    "tree_depth": 3,  # folder levels fetched per tree request
+    "tree_page_size": 500,  # items fetched per folder level and request
+    "engine": "threaded",  # "threaded" or "async"
+    "concurrency": 16,  # requests in flight with the async engine
+    "max_workers": 4,  # job processing threads with the threaded engine
+    "max_retries": 3,  # retries for throttled (429/503) and transient failures
+    "backoff_factor": 0.5,  # seconds, doubled per retry with jitter
+    "adaptive_concurrency": True,  # adjust concurrency from latency and throttling
+    "latency_target": 2.0,  # seconds; slower responses reduce concurrency
+    "cache_enabled": False,
+    "cache_path": DEFAULT_CACHE_PATH,
+    "cache_max_entries": 20000,
+    "cache_ttl": 86400,  # seconds
+    "force_refresh": False,  # ignore cached entries and rediscover every job
+    "streaming": False,  # register each tool as soon as its job is processed
+    "shards": 1,  # discovery processes, each owning a hash-based share of the top-level folders
+    "resync_interval": 3600,  # seconds between full rediscoveries when syncing from job events
+    "metrics_json_path": None,  # write discovery metrics as JSON after each sync
+    "metrics_prometheus_path": None,  # write discovery metrics in Prometheus text format after each sync
+    "slowest_jobs": 10,  # number of slowest jobs reported in the metrics
+    "token_secret": "JENKINS_API_TOKEN",  # Kubiya secret holding the API token used by the job tools
+    "description_unit": "chars",  # "chars" or "tokens" (about 4 characters each) for the budgets below
+    "tool_description_budget": 1000,  # size of a job tool's description, 0 for no limit
+    "parameter_description_budget": 300,  # size of a parameter's description, 0 for no limit
+    "max_choices": 10,  # choices listed in a choice parameter's description
+    "details_tool": True,  # register jenkins_job_details, which returns the full job details on demand
 }
 
 def get_jenkins_config() -> Dict[str, Any]:
     """Get Jenkins configuration from dynamic config."""
     EXAMPLE_CONFIG = """{
         "jenkins": {
-            "url": "http://jenkins.example.com:8080",  # Required: Jenkins server URL
+            "url": "http://jenkins.example.com:8080",  # Required unless controllers are listed: Jenkins server URL
             "username": "admin",  # Required: Jenkins username
             "password": "your-jenkins-api-token",  # Required: Jenkins API token or password
+            "controllers": [  # Optional: several controllers, discovered concurrently into one registry
+                {"name": "ci-east", "url": "http://jenkins-east.example.com:8080"},
+                {"name": "ci-west", "url": "http://jenkins-west.example.com:8080",  # settings below can be overridden per controller
+                 "username": "deployer", "password": "west-api-token", "token_secret": "JENKINS_WEST_API_TOKEN"}
+            ],
             "jobs": {
                 "sync_all": True,  # Optional: set to False to use include/exclude lists
-                "include": ["job1", "job2"],  # Optional: list of jobs to include if sync_all is False
+                "include": ["job1", "team-a/*", "re:-nightly$"],  # Optional: full names, globs or re: regexes to include if sync_all is False
                 "exclude": ["test-job"] # Optional: list of jobs to exclude
             },
             "defaults": {  # Optional: default settings for all jobs
                 "stream_logs": True,
-                "poll_interval": 10
+                "poll_interval": 10,
+                "queue_timeout": 600,
+                "fanout_concurrency": 4,
+                "runner_environment": "wheelhouse",  # "pip" (default), "wheelhouse" or "zipapp"
+                "runner_volume": "jenkins-runner",
+                "verbose": False,
+                "log_filter": "ERROR|WARN|FAIL|Finished:",  # Optional: print only matching console lines
+                "log_tail_lines": 50,
+                "log_archive_dir": "/tmp/jenkins-logs",
+                "stage_progress": True,  # Optional: report pipeline stages as they start and finish
+                "dedup_window": 600  # Optional: attach identical requests to a build from the last 10 minutes
+            },
+            "descriptions": {  # Optional: size limits of the generated tool descriptions
+                "unit": "tokens",  # "chars" (default) or "tokens", about 4 characters each
+                "tool_budget": 250,
+                "parameter_budget": 75,
+                "max_choices": 10,  # longer choice lists show their first choices and a count
+                "details_tool": True  # full descriptions and choices via the jenkins_job_details tool
+            },
+            "discovery": {  # Optional: job discovery settings
+                "mode": "tree",  # "per_job" (default) or "tree" for nested single-request fetches
+                "tree_depth": 3,
+                "tree_page_size": 500,
+                "engine": "async",  # "threaded" (default) or "async" for concurrent folder traversal
+                "concurrency": 16,
+                "max_workers": 4,
+                "max_retries": 3,
+                "backoff_factor": 0.5,
+                "adaptive_concurrency": True,
+                "latency_target": 2.0,
+                "streaming": True,  # register tools as jobs are discovered
+                "shards": 1,  # split discovery across local processes by top-level folder
+                "resync_interval": 3600,  # full rediscovery interval when syncing from job events
+                "metrics": {  # Optional: export request, phase and per-job timings after each sync
+                    "json_path": "/var/lib/jenkins_ops/discovery_metrics.json",
+                    "prometheus_path": "/var/lib/node_exporter/jenkins_discovery.prom",
+                    "slowest_jobs": 10
+                },
+                "cache": {  # Optional: reuse results for unchanged jobs across syncs
+                    "enabled": True,
+                    "path": "~/.cache/jenkins_ops/discovery_cache.json",
+                    "max_entries": 20000,
+                    "ttl": 86400,
+                    "force_refresh": False
+                }
             }
         }
     }"""
@@ -55,6 +152,38 @@ def get_jenkins_config() -> Dict[str, Any]:
             "No Jenkins configuration found in dynamic config. Expected configuration structure:\n" + EXAMPLE_CONFIG
         )
 
+    controllers = jenkins_config.get('controllers')
+    if not controllers:
+        ret = build_controller_config(jenkins_config, EXAMPLE_CONFIG)
+        print("used_config=", ret)
+        return ret
+
+    # Every controller inherits the top-level settings and may override them
+    shared = {key: value for key, value in jenkins_config.items() if key not in ('controllers', 'url', 'name')}
+    controller_configs = [
+        build_controller_config({**shared, **controller}, EXAMPLE_CONFIG, controller=controller_name_for(controller))
+        for controller in controllers
+    ]
+    names = [controller['controller'] for controller in controller_configs]
+    if not all(names):
+        raise ValueError("Every Jenkins controller needs a name or a url with a host name")
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Jenkins controller names must be unique, found duplicates: {', '.join(duplicates)}")
+    for controller in controller_configs:
+        discovery = controller['discovery']
+        discovery['cache']['path'] = controller_path(discovery['cache']['path'], controller['controller'])
+        for key in ('json_path', 'prometheus_path'):
+            discovery['metrics'][key] = controller_path(discovery['metrics'][key], controller['controller'])
+
+    return {"controllers": controller_configs}
+
+def build_controller_config(
+    jenkins_config: Dict[str, Any],
+    example_config: str,
+    controller: Optional[str] = None
+) -> Dict[str, Any]:
+    """Build the configuration of one controller from its ``jenkins`` section, with defaults."""
     # Required fields
     required_fields = ['url', 'username', 'password']
     missing_fields = [field for field in required_fields if not jenkins_config.get(field)]
@@ -62,15 +191,22 @@ def get_jenkins_config() -> Dict[str, Any]:
         raise ValueError(
             f"Missing required Jenkins configuration fields: {', '.join(missing_fields)}\n"
             "Example of a valid configuration:\n"
-            f"{json.dumps(EXAMPLE_CONFIG, indent=2)}"
+            f"{json.dumps(example_config, indent=2)}"
         )
 
     # Build configuration with defaults
-    ret = {
+    discovery_config = jenkins_config.get('discovery', {})
+    cache_config = discovery_config.get('cache', {})
+    metrics_config = discovery_config.get('metrics', {})
+    descriptions_config = jenkins_config.get('descriptions', {})
+    return {
         "jenkins_url": jenkins_config['url'],
+        # Namespace of the controller's tool names, None for a single controller
+        "controller": controller,
         "auth": {
             "username": jenkins_config['username'],
-            "password": jenkins_config['password']
+            "password": jenkins_config['password'],
+            "token_secret": jenkins_config.get('token_secret', DEFAULT_CONFIG['token_secret'])
         },
         "jobs": {
             "sync_all": jenkins_config.get('jobs', {}).get('sync_all', True),
@@ -79,11 +215,53 @@ def get_jenkins_config() -> Dict[str, Any]:
         },
         "defaults": {
             "stream_logs": jenkins_config.get('defaults', {}).get('stream_logs', DEFAULT_CONFIG['stream_logs']),
-            "poll_interval": jenkins_config.get('defaults', {}).get('poll_interval', DEFAULT_CONFIG['poll_interval'])
+            "poll_interval": jenkins_config.get('defaults', {}).get('poll_interval', DEFAULT_CONFIG['poll_interval']),
+            "queue_timeout": jenkins_config.get('defaults', {}).get('queue_timeout', DEFAULT_CONFIG['queue_timeout']),
+            "fanout_concurrency": jenkins_config.get('defaults', {}).get('fanout_concurrency', DEFAULT_CONFIG['fanout_concurrency']),
+            "runner_environment": jenkins_config.get('defaults', {}).get('runner_environment', DEFAULT_CONFIG['runner_environment']),
+            "runner_volume": jenkins_config.get('defaults', {}).get('runner_volume', DEFAULT_CONFIG['runner_volume']),
+            "verbose": jenkins_config.get('defaults', {}).get('verbose', DEFAULT_CONFIG['verbose']),
+            "log_filter": jenkins_config.get('defaults', {}).get('log_filter', DEFAULT_CONFIG['log_filter']),
+            "log_tail_lines": jenkins_config.get('defaults', {}).get('log_tail_lines', DEFAULT_CONFIG['log_tail_lines']),
+            "log_archive_dir": jenkins_config.get('defaults', {}).get('log_archive_dir', DEFAULT_CONFIG['log_archive_dir']),
+            "stage_progress": jenkins_config.get('defaults', {}).get('stage_progress', DEFAULT_CONFIG['stage_progress']),
+            "dedup_window": jenkins_config.get('defaults', {}).get('dedup_window', DEFAULT_CONFIG['dedup_window'])
+        },
+        "descriptions": {
+            "unit": descriptions_config.get('unit', DEFAULT_CONFIG['description_unit']),
+            "tool_budget": descriptions_config.get('tool_budget', DEFAULT_CONFIG['tool_description_budget']),
+            "parameter_budget": descriptions_config.get('parameter_budget', DEFAULT_CONFIG['parameter_description_budget']),
+            "max_choices": descriptions_config.get('max_choices', DEFAULT_CONFIG['max_choices']),
+            "details_tool": descriptions_config.get('details_tool', DEFAULT_CONFIG['details_tool'])
+        },
+        "discovery": {
+            "mode": discovery_config.get('mode', DEFAULT_CONFIG['discovery_mode']),
+            "tree_depth": discovery_config.get('tree_depth', DEFAULT_CONFIG['tree_depth']),
+            "tree_page_size": discovery_config.get('tree_page_size', DEFAULT_CONFIG['tree_page_size']),
+            "engine": discovery_config.get('engine', DEFAULT_CONFIG['engine']),
+            "concurrency": discovery_config.get('concurrency', DEFAULT_CONFIG['concurrency']),
+            "max_workers": discovery_config.get('max_workers', DEFAULT_CONFIG['max_workers']),
+            "max_retries": discovery_config.get('max_retries', DEFAULT_CONFIG['max_retries']),
+            "backoff_factor": discovery_config.get('backoff_factor', DEFAULT_CONFIG['backoff_factor']),
+            "adaptive_concurrency": discovery_config.get('adaptive_concurrency', DEFAULT_CONFIG['adaptive_concurrency']),
+            "latency_target": discovery_config.get('latency_target', DEFAULT_CONFIG['latency_target']),
+            "streaming": discovery_config.get('streaming', DEFAULT_CONFIG['streaming']),
+            "shards": discovery_config.get('shards', DEFAULT_CONFIG['shards']),
+            "resync_interval": discovery_config.get('resync_interval', DEFAULT_CONFIG['resync_interval']),
+            "metrics": {
+                "json_path": metrics_config.get('json_path', DEFAULT_CONFIG['metrics_json_path']),
+                "prometheus_path": metrics_config.get('prometheus_path', DEFAULT_CONFIG['metrics_prometheus_path']),
+                "slowest_jobs": metrics_config.get('slowest_jobs', DEFAULT_CONFIG['slowest_jobs'])
+            },
+            "cache": {
+                "enabled": cache_config.get('enabled', DEFAULT_CONFIG['cache_enabled']),
+                "path": cache_config.get('path', DEFAULT_CONFIG['cache_path']),
+                "max_entries": cache_config.get('max_entries', DEFAULT_CONFIG['cache_max_entries']),
+                "ttl": cache_config.get('ttl', DEFAULT_CONFIG['cache_ttl']),
+                "force_refresh": cache_config.get('force_refresh', DEFAULT_CONFIG['force_refresh'])
+            }
         }
     }
-    print("used_config=", ret)
-    return ret
 
 def initialize_tools():
     """Initialize and register Jenkins tools."""
@@ -95,123 +273,319 @@ def initialize_tools():
             config = get_jenkins_config()
         except ValueError as config_error:
             raise ValueError(f"Failed to get Jenkins configuration: {str(config_error)}")
+
+        # Only added, changed and removed tools touch the registry
+        changes = RegistryChanges()
+        if config.get('controllers'):
+            # Discover every controller concurrently into one registry
+            tools, failed_jobs, controller_errors = sync_controllers(
+                config['controllers'], lambda controller_config: sync_controller(controller_config, changes)
+            )
+            if controller_errors:
+                error_msg = "\n- ".join(controller_errors)
+                if not tools:
+                    raise ValueError(f"Failed to sync any Jenkins controller:\n- {error_msg}")
+                logger.warning(f"Some Jenkins controllers failed, their tools are missing:\n- {error_msg}")
+        else:
+            tools, failed_jobs = sync_controller(config, changes)
+        logger.info(changes.summary())
+
+        if failed_jobs:
+            logger.warning(f"Successfully created {len(tools)} tools, but {len(failed_jobs)} jobs failed")
+        else:
+            logger.info(f"Successfully initialized all {len(tools)} Jenkins tools")
             
-        logger.info(f"Using Jenkins server at {config['jenkins_url']}")
-        
-        # Validate auth configuration
-        if not config['auth'].get('password'):
-            example_config = {
-                "jenkins": {
-                    "url": "http://jenkins.example.com:8080",
-                    "username": "admin",
-                    "password": "your-jenkins-api-token"
-                }
+        return tools
+
+    except Exception as e:
+        logger.error(f"Failed to initialize Jenkins tools: {str(e)}")
+        raise ValueError(f"Jenkins tools initialization failed: {str(e)}")
+
+def sync_controller(
+    config: Dict[str, Any],
+    changes: Optional[RegistryChanges] = None
+) -> Tuple[List[JenkinsJobTool], List[Dict[str, str]]]:
+    """
+    Discover the jobs of one controller and register their tools.
+
+    Tools of jobs that are no longer discovered are unregistered, unless
+    discovery reported errors and may have missed jobs.
+
+    Returns:
+        Tuple of (registered tools, jobs whose tool could not be created)
+    """
+    logger.info(f"Using Jenkins server at {config['jenkins_url']}")
+    
+    # Validate auth configuration
+    if not config['auth'].get('password'):
+        example_config = {
+            "jenkins": {
+                "url": "http://jenkins.example.com:8080",
+                "username": "admin",
+                "password": "your-jenkins-api-token"
             }
-            raise ValueError(
-                "Jenkins authentication password is required but not provided in configuration.\n"
-                "Example of a valid configuration:\n"
-                f"{json.dumps(example_config, indent=2)}"
-            )
-        
-        # Create parser
+        }
+        raise ValueError(
+            "Jenkins authentication password is required but not provided in configuration.\n"
+            "Example of a valid configuration:\n"
+            f"{json.dumps(example_config, indent=2)}"
+        )
+    
+    # Create parser; sharded discovery creates one per shard process instead
+    sharded = config['discovery'].get('shards', 1) > 1
+    if not sharded:
         try:
-            parser = JenkinsJobParser(
-                jenkins_url=config['jenkins_url'],
-                username=config['auth']['username'],
-                api_token=config['auth']['password']
-            )
+            parser = create_parser(config)
         except Exception as parser_error:
             raise ValueError(f"Failed to create Jenkins parser: {str(parser_error)}")
 
-        # Get jobs from Jenkins server
-        logger.info("Fetching Jenkins jobs...")
-        try:
-            job_include_filter = config['jobs'].get('include') if not config['jobs'].get('sync_all') else None
-            job_exclude_filter = config['jobs'].get('exclude') if not config['jobs'].get('sync_all') else None
+    # Get jobs from Jenkins server
+    logger.info("Fetching Jenkins jobs...")
+    tools = []
+    failed_jobs = []
+    try:
+        job_include_filter = config['jobs'].get('include') if not config['jobs'].get('sync_all') else None
+        job_exclude_filter = config['jobs'].get('exclude') if not config['jobs'].get('sync_all') else None
+        if sharded:
+            # Discover each shard in its own process and merge the partial results
+            jobs_info, warnings, errors = run_shards(
+                config, config['discovery']['shards'],
+                job_include_filter=job_include_filter, job_exclude_filter=job_exclude_filter
+            )
+            jobs_found = len(jobs_info)
+        elif config['discovery'].get('streaming'):
+            # Register each tool as soon as its job has been processed
+            jobs_found = 0
+            for job_name, job_info in parser.iter_jobs(job_include_filter=job_include_filter, job_exclude_filter=job_exclude_filter):
+                jobs_found += 1
+                register_jenkins_tool(job_name, job_info, config, tools, failed_jobs, changes)
+            warnings, errors = parser.warnings, parser.errors
+        else:
             jobs_info, warnings, errors = parser.get_jobs(job_include_filter=job_include_filter, job_exclude_filter=job_exclude_filter)
-        except Exception as jobs_error:
-            example_config = {
-                "jenkins": {
-                    "url": "http://jenkins.example.com:8080",
-                    "username": "admin",
-                    "password": "your-jenkins-api-token",
-                    "sync_all": False,  # Set to false to use include/exclude lists
-                    "include": ["job1", "job2"],  # List of jobs to include
-                    "exclude": ["test-job"],  # List of jobs to exclude
-                    "defaults": {  # Optional: default settings for all jobs
-                        "stream_logs": True,
-                        "poll_interval": 10
-                    }
+            jobs_found = len(jobs_info)
+    except Exception as jobs_error:
+        example_config = {
+            "jenkins": {
+                "url": "http://jenkins.example.com:8080",
+                "username": "admin",
+                "password": "your-jenkins-api-token",
+                "sync_all": False,  # Set to false to use include/exclude lists
+                "include": ["job1", "job2"],  # List of jobs to include
+                "exclude": ["test-job"],  # List of jobs to exclude
+                "defaults": {  # Optional: default settings for all jobs
+                    "stream_logs": True,
+                    "poll_interval": 10
                 }
             }
-            raise ValueError(
-                f"Failed to fetch Jenkins jobs: {str(jobs_error)}\n"
-                "If you're trying to filter specific jobs, ensure your configuration includes job filters like this:\n"
-                f"{json.dumps(example_config, indent=2)}"
-            )
+        }
+        raise ValueError(
+            f"Failed to fetch Jenkins jobs: {str(jobs_error)}\n"
+            "If you're trying to filter specific jobs, ensure your configuration includes job filters like this:\n"
+            f"{json.dumps(example_config, indent=2)}"
+        )
 
-        # Handle errors and warnings
-        if errors:
-            error_msg = "\n- ".join(errors)
-            logger.error(f"Errors during job discovery:\n- {error_msg}")
-            if not jobs_info:
-                raise ValueError(f"Failed to fetch any jobs from Jenkins server. Errors encountered:\n- {error_msg}")
+    # Handle errors and warnings
+    if errors:
+        error_msg = "\n- ".join(errors)
+        logger.error(f"Errors during job discovery:\n- {error_msg}")
+        if not jobs_found:
+            raise ValueError(f"Failed to fetch any jobs from Jenkins server. Errors encountered:\n- {error_msg}")
 
-        if warnings:
-            warning_msg = "\n- ".join(warnings)
-            logger.warning(f"Warnings during job fetching:\n- {warning_msg}")
+    if warnings:
+        warning_msg = "\n- ".join(warnings)
+        logger.warning(f"Warnings during job fetching:\n- {warning_msg}")
 
-        # Create and register tools
-        tools = []
-        failed_jobs = []
+    # Create and register tools
+    if sharded or not config['discovery'].get('streaming'):
         for job_name, job_info in jobs_info.items():
-            try:
-                tool = create_jenkins_tool(job_name, job_info, config)
-                if tool:
-                    tool_registry.register("jenkins", tool)
-                    tools.append(tool)
-                    logger.info(f"Registered tool for job: {job_name}")
-            except Exception as e:
-                error_msg = f"Failed to create tool for job {job_name}: {str(e)}"
-                logger.error(error_msg)
-                failed_jobs.append({"job": job_name, "error": str(e)})
-
-        if not tools:
-            if failed_jobs:
-                error_details = "\n- ".join([f"{job['job']}: {job['error']}" for job in failed_jobs])
-                raise ValueError(f"Failed to create any Jenkins tools. Errors for each job:\n- {error_details}")
-            else:
-                raise ValueError("No Jenkins jobs were found to create tools from")
+            register_jenkins_tool(job_name, job_info, config, tools, failed_jobs, changes)
 
+    if not tools:
         if failed_jobs:
-            logger.warning(f"Successfully created {len(tools)} tools, but {len(failed_jobs)} jobs failed")
+            error_details = "\n- ".join([f"{job['job']}: {job['error']}" for job in failed_jobs])
+            raise ValueError(f"Failed to create any Jenkins tools. Errors for each job:\n- {error_details}")
         else:
-            logger.info(f"Successfully initialized all {len(tools)} Jenkins tools")
-            
-        return tools
+            raise ValueError("No Jenkins jobs were found to create tools from")
+
+    if config.get('descriptions', {}).get('details_tool', DEFAULT_CONFIG['details_tool']):
+        register_details_tool(config, tools, changes)
+
+    if errors:
+        logger.warning("Discovery reported errors, keeping the tools of jobs that were not found")
+    else:
+        # Jobs whose tool failed to build keep their previous tool
+        current = [tool.name for tool in tools]
+        current.extend(tool_name_for(job['job'], config.get('controller')) for job in failed_jobs)
+        prefix = tool_name_for('', config['controller']) if config.get('controller') else ''
+        with _register_lock:
+            remove_stale_tools(registered_tools(tool_registry), current, prefix, changes)
+
+    return tools, failed_jobs
+
+def register_jenkins_tool(
+    job_name: str,
+    job_info: Dict[str, Any],
+    config: Dict[str, Any],
+    tools: List[JenkinsJobTool],
+    failed_jobs: List[Dict[str, str]],
+    changes: Optional[RegistryChanges] = None
+) -> None:
+    """
+    Create and register the tool for a job, recording it in ``tools`` or ``failed_jobs``.
 
+    A registered tool with the same content hash is kept as is, without
+    building or registering the tool again.
+    """
+    try:
+        tool_config = jenkins_tool_config(job_name, job_info, config)
+        config_hash = tool_config_hash(tool_config)
+        with _register_lock:
+            existing = registered_tools(tool_registry).get(tool_config['name'])
+        if existing is not None and registered_hash(existing) == config_hash:
+            tools.append(existing)
+            if changes is not None:
+                changes.record('unchanged')
+            logger.debug(f"Tool {existing.name} is unchanged for job: {job_name}")
+            return
+
+        tool = JenkinsJobTool(**tool_config, metadata={'config_sha256': config_hash})
+        with _register_lock:
+            tool_registry.register("jenkins", tool)
+        tools.append(tool)
+        if changes is not None:
+            changes.record('added' if existing is None else 'changed')
+        logger.info(f"Registered tool {tool.name} for job: {job_name}")
     except Exception as e:
-        logger.error(f"Failed to initialize Jenkins tools: {str(e)}")
-        raise ValueError(f"Jenkins tools initialization failed: {str(e)}")
+        error_msg = f"Failed to create tool for job {job_name}: {str(e)}"
+        logger.error(error_msg)
+        failed_jobs.append({"job": job_name, "error": str(e)})
+
+def register_details_tool(
+    config: Dict[str, Any],
+    tools: List[Any],
+    changes: Optional[RegistryChanges] = None
+) -> None:
+    """Register the controller's jenkins_job_details tool, keeping a registered one with the same content hash."""
+    tool_config = details_tool_config(
+        details_tool_name_for(config.get('controller')),
+        config['jenkins_url'],
+        config['auth']['username'],
+        config['auth'].get('token_secret')
+    )
+    config_hash = details_config_hash(tool_config)
+    with _register_lock:
+        existing = registered_tools(tool_registry).get(tool_config['name'])
+    if existing is not None and registered_hash(existing) == config_hash:
+        tools.append(existing)
+        if changes is not None:
+            changes.record('unchanged')
+        return
+
+    tool = JenkinsJobDetailsTool(**tool_config, metadata={'config_sha256': config_hash})
+    with _register_lock:
+        tool_registry.register("jenkins", tool)
+    tools.append(tool)
+    if changes is not None:
+        changes.record('added' if existing is None else 'changed')
+    logger.info(f"Registered tool {tool.name}")
+
+def create_parser(config: Dict[str, Any], shard_index: int = 0, shard_count: int = 1) -> JenkinsJobParser:
+    """Create the job parser for the discovery engine selected in configuration."""
+    discovery = config['discovery']
+    parser_args = {
+        "jenkins_url": config['jenkins_url'],
+        "username": config['auth']['username'],
+        "api_token": config['auth']['password'],
+        "discovery_mode": discovery['mode'],
+        "tree_depth": discovery['tree_depth'],
+        "tree_page_size": discovery['tree_page_size'],
+        "cache": create_discovery_cache(config),
+        "max_retries": discovery['max_retries'],
+        "backoff_factor": discovery['backoff_factor'],
+        "adaptive_concurrency": discovery['adaptive_concurrency'],
+        "latency_target": discovery['latency_target'],
+        "description_compiler": create_description_compiler(config),
+        "shard_index": shard_index,
+        "shard_count": shard_count,
+        "slowest_jobs": discovery['metrics']['slowest_jobs'],
+        "metrics_json_path": discovery['metrics']['json_path'],
+        "metrics_prometheus_path": discovery['metrics']['prometheus_path']
+    }
+    if discovery.get('engine') == 'async':
+        return AsyncJenkinsJobParser(concurrency=discovery['concurrency'], **parser_args)
+    return JenkinsJobParser(max_workers=discovery['max_workers'], **parser_args)
+
+def create_discovery_cache(config: Dict[str, Any]) -> Optional[DiscoveryCache]:
+    """Create the persistent discovery cache if enabled in configuration."""
+    cache_config = config.get('discovery', {}).get('cache', {})
+    if not cache_config.get('enabled'):
+        return None
+    return DiscoveryCache(
+        path=cache_config.get('path', DEFAULT_CONFIG['cache_path']),
+        max_entries=cache_config.get('max_entries', DEFAULT_CONFIG['cache_max_entries']),
+        ttl=cache_config.get('ttl', DEFAULT_CONFIG['cache_ttl']),
+        force_refresh=cache_config.get('force_refresh', DEFAULT_CONFIG['force_refresh'])
+    )
+
+def create_description_compiler(config: Dict[str, Any]) -> DescriptionCompiler:
+    """Create the description compiler with the budgets in configuration."""
+    descriptions = config.get('descriptions', {})
+    details_tool = descriptions.get('details_tool', DEFAULT_CONFIG['details_tool'])
+    return DescriptionCompiler(
+        tool_budget=descriptions.get('tool_budget', DEFAULT_CONFIG['tool_description_budget']),
+        parameter_budget=descriptions.get('parameter_budget', DEFAULT_CONFIG['parameter_description_budget']),
+        max_choices=descriptions.get('max_choices', DEFAULT_CONFIG['max_choices']),
+        unit=descriptions.get('unit', DEFAULT_CONFIG['description_unit']),
+        details_tool=details_tool_name_for(config.get('controller')) if details_tool else None
+    )
+
+def details_tool_name_for(controller: Optional[str] = None) -> str:
+    """Return the registry name of a controller's jenkins_job_details tool."""
+    return tool_name_for(DETAILS_TOOL_NAME, controller)
+
+def tool_name_for(job_name: str, controller: Optional[str] = None) -> str:
+    """Return the registry name of the tool for a Jenkins job, prefixed with its controller if given."""
+    if controller:
+        job_name = f"{controller}/{job_name}"
+    return job_name.lower().replace('-', '_').replace(' ', '_')
 
 def create_jenkins_tool(job_name: str, job_info: Dict[str, Any], config: Dict[str, Any]) -> JenkinsJobTool:
     """Create a Jenkins tool for a specific job."""
-    tool_config = {
-        "name": job_name.lower().replace('-', '_').replace(' ', '_'),
-        "description": job_info.get('description', f"Execute Jenkins job: {job_name}"),
-        "job_config": {
-            "name": job_name,
-            "parameters": job_info.get('parameters', {}),
-            "auth": config['auth']
-        },
+    tool_config = jenkins_tool_config(job_name, job_info, config)
+
+    return JenkinsJobTool(**tool_config, metadata={'config_sha256': tool_config_hash(tool_config)})
+
+def jenkins_tool_config(job_name: str, job_info: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the JenkinsJobTool arguments for a job."""
+    job_config = {
+        "name": job_name,
+        "parameters": job_info.get('parameters', {}),
+        "auth": config['auth']
+    }
+    if config.get('controller'):
+        # Tools of one controller among several carry its URL; single-controller
+        # tools keep reading JENKINS_URL from the environment
+        job_config["jenkins_url"] = config['jenkins_url']
+    return {
+        "name": tool_name_for(job_name, config.get('controller')),
+        "description": create_description_compiler(config).tool_description(
+            job_info.get('description', f"Execute Jenkins job: {job_name}"), job_name
+        ),
+        "job_config": job_config,
         "long_running": True,
         "stream_logs": config.get('defaults', DEFAULT_CONFIG)['stream_logs'],
-        "poll_interval": config.get('defaults', DEFAULT_CONFIG)['poll_interval']
+        "poll_interval": config.get('defaults', DEFAULT_CONFIG)['poll_interval'],
+        "queue_timeout": config.get('defaults', DEFAULT_CONFIG).get('queue_timeout', DEFAULT_CONFIG['queue_timeout']),
+        "fanout_concurrency": config.get('defaults', DEFAULT_CONFIG).get('fanout_concurrency', DEFAULT_CONFIG['fanout_concurrency']),
+        "runner_environment": config.get('defaults', DEFAULT_CONFIG).get('runner_environment', DEFAULT_CONFIG['runner_environment']),
+        "runner_volume": config.get('defaults', DEFAULT_CONFIG).get('runner_volume', DEFAULT_CONFIG['runner_volume']),
+        "verbose": config.get('defaults', DEFAULT_CONFIG).get('verbose', DEFAULT_CONFIG['verbose']),
+        "log_filter": config.get('defaults', DEFAULT_CONFIG).get('log_filter', DEFAULT_CONFIG['log_filter']),
+        "log_tail_lines": config.get('defaults', DEFAULT_CONFIG).get('log_tail_lines', DEFAULT_CONFIG['log_tail_lines']),
+        "log_archive_dir": config.get('defaults', DEFAULT_CONFIG).get('log_archive_dir', DEFAULT_CONFIG['log_archive_dir']),
+        "stage_progress": config.get('defaults', DEFAULT_CONFIG).get('stage_progress', DEFAULT_CONFIG['stage_progress']),
+        "dedup_window": config.get('defaults', DEFAULT_CONFIG).get('dedup_window', DEFAULT_CONFIG['dedup_window'])
     }
 
-    tool = JenkinsJobTool(**tool_config)
-    tool.prepare()
-    return tool
-
 # Initialize tools dictionary
 tools = {}
@@ -0,0 +1,246 @@
+import asyncio
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
+from .filters import JobFilter
+from .metrics import DiscoveryMetrics
+from .parser import JenkinsJobParser
+
+logger = logging.getLogger(__name__)
+
+# Jobs iter_jobs buffers ahead of its consumer before discovery waits for it
+ITER_JOBS_BUFFER = 64
+
+class AsyncJenkinsJobParser(JenkinsJobParser):
+    """
+    Asyncio variant of JenkinsJobParser.
+
+    Folders are listed concurrently and every job is processed as soon as the
+    folder containing it has been listed, instead of after the whole tree was
+    walked. All requests go through one session whose connection pool is sized
+    to ``concurrency``, which also bounds the number of requests in flight.
+    """
+
+    def __init__(self, *args, concurrency: int = 16, **kwargs):
+        self.concurrency = max(1, concurrency)
+        # Size the shared connection pool and the adaptive limiter to the concurrency limit
+        kwargs['max_workers'] = self.concurrency
+        super().__init__(*args, **kwargs)
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._tasks: set = set()
+        self._on_job: Optional[Callable[[str, Dict[str, Any]], None]] = None
+
+    async def _run(self, func, *args):
+        """Run a blocking parser call in the shared executor within the concurrency limit."""
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+
+    def _schedule(self, coro) -> None:
+        self._tasks.add(asyncio.ensure_future(coro))
+
+    async def _walk_folder(self, url: str, folder_name: str, jobs_info: Dict[str, Any]) -> None:
+        """List a folder, then schedule its jobs and sub-folders without waiting for them."""
+        jobs, folders = await self._run(self._list_folder, url, folder_name)
+        self._discovered += len(jobs)
+
+        for job in self._select_jobs(jobs):
+            self._schedule(self._process_job(job, jobs_info))
+
+        for folder_url, sub_folder_name in folders:
+            self._schedule(self._walk_folder(folder_url, sub_folder_name, jobs_info))
+
+    async def _walk_shard_root(self, jobs_info: Dict[str, Any]) -> None:
+        """List the top-level items owned by this shard, then walk its folders."""
+        jobs, folders = await self._run(self._list_shard_root)
+        self._discovered += len(jobs)
+
+        for job in self._select_jobs(jobs):
+            self._schedule(self._process_job(job, jobs_info))
+
+        for folder_url, folder_name in folders:
+            if self.discovery_mode == 'tree':
+                self._schedule(self._walk_tree(folder_url[:-len('api/json')], 0, jobs_info))
+            else:
+                self._schedule(self._walk_folder(folder_url, folder_name, jobs_info))
+
+    async def _walk_tree(self, url: Optional[str], start: int, jobs_info: Dict[str, Any]) -> None:
+        """Fetch one page of the job tree, then schedule its jobs and truncated subtrees."""
+        jobs, subtrees = await self._run(self._list_tree, url, start)
+        self._discovered += len(jobs)
+
+        for job in self._select_jobs(jobs):
+            self._schedule(self._process_job(job, jobs_info))
+
+        for subtree_url, subtree_start in subtrees:
+            self._schedule(self._walk_tree(subtree_url, subtree_start, jobs_info))
+
+    async def _process_job(self, job: Dict[str, Any], jobs_info: Dict[str, Any]) -> None:
+        """Process a single job, serving it from the discovery cache when unchanged."""
+        self._matched += 1
+        job_info = self._get_cached_job(job)
+        if job_info is None:
+            job_info = await self._run(self._process_single_job, job['full_name'], job['url'], job.get('data'))
+            if job_info:
+                self._store_cached_job(job, job_info)
+
+        if job_info:
+            self._processed += 1
+            if self._on_job is not None:
+                self._on_job(job['full_name'], job_info)
+            else:
+                jobs_info[job['full_name']] = job_info
+            logger.info(f"Successfully processed job: {job['full_name']}")
+
+    async def get_jobs_async(
+        self,
+        job_include_filter: Optional[List[str]] = None,
+        job_exclude_filter: Optional[List[str]] = None,
+        on_job: Optional[Callable[[str, Dict[str, Any]], None]] = None
+    ) -> Tuple[Dict[str, Any], List[str], List[str]]:
+        """
+        Get all Jenkins jobs and their parameters, walking folders concurrently.
+
+        When ``on_job`` is given it is called with ``(job_name, job_info)`` as each
+        job completes, and processed jobs are not collected in the returned dict.
+        """
+        job_include_filter = job_include_filter or []
+        job_exclude_filter = job_exclude_filter or []
+        jobs_info = {}
+        self._discovered = 0
+        self._matched = 0
+        self._processed = 0
+        self._on_job = on_job
+        self.metrics = DiscoveryMetrics(self.slowest_jobs, labels=self.metric_labels)
+        self.job_filter = JobFilter(job_include_filter, job_exclude_filter)
+        self.pruned_folders = 0
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        self._tasks = set()
+
+        try:
+            logger.info(f"Starting async Jenkins job discovery (concurrency: {self.concurrency})...")
+            if self.shard_count > 1:
+                self._schedule(self._walk_shard_root(jobs_info))
+            elif self.discovery_mode == 'tree':
+                self._schedule(self._walk_tree(None, 0, jobs_info))
+            else:
+                self._schedule(self._walk_folder(f"{self.jenkins_url}/api/json", '', jobs_info))
+
+            # Tasks schedule further tasks, so wait until no work is left
+            while self._tasks:
+                done, _ = await asyncio.wait(set(self._tasks), return_when=asyncio.FIRST_COMPLETED)
+                self._tasks -= done
+                for task in done:
+                    try:
+                        task.result()
+                    except Exception as e:
+                        error_msg = f"Failed to get jobs: {str(e)}"
+                        logger.error(error_msg)
+                        self.errors.append(error_msg)
+        except BaseException:
+            # Export what was measured when discovery is cancelled or fails
+            self._export_metrics()
+            raise
+        finally:
+            self._executor.shutdown(wait=True)
+        self._log_pruning()
+
+        if not self._discovered:
+            logger.warning("No jobs found in Jenkins")
+            self.warnings.append("No jobs were found in Jenkins server")
+        elif job_include_filter and not self._matched:
+            warning_msg = f"No jobs matched the filter: {job_include_filter}"
+            logger.warning(warning_msg)
+            self.warnings.append(warning_msg)
+
+        if self.cache is not None:
+            logger.info(f"Discovery cache: {self.cache.hits} unchanged, {self.cache.misses} fetched")
+            self.cache.save()
+
+        logger.info(self.schema_cache.summary())
+        self._export_metrics()
+
+        if not self._processed and not self.errors and self._matched:
+            self.errors.append("No jobs were found or all jobs failed to process")
+
+        logger.info(f"Completed job discovery. Found {self._processed} valid jobs")
+        return jobs_info, self.warnings, self.errors
+
+    def get_jobs(
+        self,
+        job_include_filter: Optional[List[str]] = None,
+        job_exclude_filter: Optional[List[str]] = None
+    ) -> Tuple[Dict[str, Any], List[str], List[str]]:
+        """Synchronous entry point with the same signature and result as JenkinsJobParser.get_jobs."""
+        return asyncio.run(self.get_jobs_async(job_include_filter, job_exclude_filter))
+
+    def iter_jobs(
+        self,
+        job_include_filter: Optional[List[str]] = None,
+        job_exclude_filter: Optional[List[str]] = None
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Yield ``(job_name, job_info)`` as jobs complete, running the event loop in a background thread.
+
+        At most ``ITER_JOBS_BUFFER`` jobs are buffered: discovery waits while
+        the consumer is behind. Discovery is cancelled when the generator is
+        closed before all jobs were yielded.
+        """
+        results: queue.Queue = queue.Queue(maxsize=ITER_JOBS_BUFFER)
+        finished = object()
+        stopped = threading.Event()
+        running: Dict[str, Any] = {}
+
+        def put(item: Any) -> None:
+            # Block while the buffer is full, unless the consumer went away
+            while not stopped.is_set():
+                try:
+                    results.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        async def discover() -> None:
+            running['loop'] = asyncio.get_running_loop()
+            running['task'] = asyncio.current_task()
+            if stopped.is_set():
+                return
+            await self.get_jobs_async(
+                job_include_filter, job_exclude_filter,
+                on_job=lambda job_name, job_info: put((job_name, job_info))
+            )
+
+        def run() -> None:
+            try:
+                asyncio.run(discover())
+            except asyncio.CancelledError:
+                logger.info("Job discovery stopped before all jobs were consumed")
+            except Exception as e:
+                error_msg = f"Failed to get jobs: {str(e)}"
+                logger.error(error_msg)
+                self.errors.append(error_msg)
+            finally:
+                put(finished)
+
+        thread = threading.Thread(target=run, name="jenkins-discovery", daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = results.get()
+                if item is finished:
+                    break
+                yield item
+        finally:
+            stopped.set()
+            if 'task' in running:
+                try:
+                    running['loop'].call_soon_threadsafe(running['task'].cancel)
+                except RuntimeError:
+                    # The loop already finished
+                    pass
+            thread.join()
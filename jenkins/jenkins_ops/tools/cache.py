@@ -0,0 +1,128 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Any, Optional
+from .jobinfo import job_info_json
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_PATH = os.path.join('~', '.cache', 'jenkins_ops', 'discovery_cache.json')
+
+def job_fingerprint(job: Dict[str, Any], settings: str = '') -> str:
+    """
+    Compute the fingerprint of a discovered job entry.
+
+    The fingerprint covers the job class, the parameter definitions and description
+    fetched by tree discovery or listed with the cache in per_job mode, and the last
+    build marker from the listing.
+    ``settings`` covers parser settings that change the processed job info, such
+    as the description budgets. A job whose fingerprint is unchanged does not
+    need to be fetched again.
+    """
+    data = job.get('data') or {}
+    definitions = [
+        source['parameterDefinitions']
+        for source in data.get('property', []) + data.get('actions', [])
+        if isinstance(source, dict) and 'parameterDefinitions' in source
+    ]
+    payload = {
+        'class': job.get('class'),
+        'definitions': definitions,
+        'description': data.get('description'),
+        'buildable': data.get('buildable'),
+        'last_build': job.get('last_build'),
+        'color': job.get('color'),
+        'settings': settings,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+class DiscoveryCache:
+    """Persistent cache of processed job info keyed by job URL."""
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        max_entries: int = 20000,
+        ttl: int = 86400,
+        force_refresh: bool = False
+    ):
+        self.path = os.path.expanduser(path)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.force_refresh = force_refresh
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Load cache entries from disk, ignoring missing or incompatible files."""
+        if self.force_refresh or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            if data.get('version') != CACHE_VERSION:
+                logger.info(f"Ignoring discovery cache with version {data.get('version')}")
+                return {}
+            return data.get('entries', {})
+        except Exception as e:
+            logger.warning(f"Failed to load discovery cache from {self.path}: {str(e)}")
+            return {}
+
+    def _is_expired(self, entry: Dict[str, Any], now: float) -> bool:
+        return bool(self.ttl) and now - entry.get('stored_at', 0) > self.ttl
+
+    def get(self, url: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Return the cached job info for ``url`` if its fingerprint is unchanged and not expired."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry and entry.get('fingerprint') == fingerprint and not self._is_expired(entry, time.time()):
+                self.hits += 1
+                return entry['job_info']
+            self.misses += 1
+            return None
+
+    def put(self, url: str, fingerprint: str, job_info: Dict[str, Any]) -> None:
+        """Store processed job info for ``url``."""
+        with self._lock:
+            self._entries[url] = {
+                'fingerprint': fingerprint,
+                'stored_at': time.time(),
+                'job_info': job_info
+            }
+
+    def evict(self) -> int:
+        """Drop expired entries and the oldest entries beyond ``max_entries``."""
+        with self._lock:
+            now = time.time()
+            before = len(self._entries)
+            entries = {url: entry for url, entry in self._entries.items() if not self._is_expired(entry, now)}
+            if self.max_entries and len(entries) > self.max_entries:
+                newest = sorted(entries.items(), key=lambda item: item[1].get('stored_at', 0), reverse=True)
+                entries = dict(newest[:self.max_entries])
+            self._entries = entries
+            return before - len(entries)
+
+    def save(self) -> None:
+        """Evict stale entries and atomically write the cache to disk."""
+        evicted = self.evict()
+        if evicted:
+            logger.info(f"Evicted {evicted} discovery cache entries")
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with self._lock:
+                data = {'version': CACHE_VERSION, 'entries': self._entries}
+                with open(tmp_path, 'w') as f:
+                    json.dump(data, f, default=job_info_json)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Failed to save discovery cache to {self.path}: {str(e)}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,84 @@
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Result of syncing one controller: registered tools and the jobs whose tool failed
+ControllerResult = Tuple[List[Any], List[Dict[str, str]]]
+
+def controller_name_for(controller: Dict[str, Any]) -> str:
+    """Return the configured name of a controller, or one derived from its host name."""
+    name = controller.get('name') or urlparse(controller.get('url', '')).hostname or ''
+    return re.sub(r'[^a-z0-9_-]+', '_', name.lower()).strip('_')
+
+def controller_path(path: Optional[str], name: str) -> Optional[str]:
+    """Give each controller its own cache and metrics files so controllers never overwrite each other."""
+    if not path:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}.{name}{ext}"
+
+def select_controller(config: Dict[str, Any], name: Optional[str]) -> Dict[str, Any]:
+    """
+    Return the config of one controller for single-controller commands.
+
+    Configs without ``controllers`` are returned unchanged; federated configs
+    require ``name``.
+    """
+    controllers = config.get('controllers')
+    if not controllers:
+        return config
+    names = [controller['controller'] for controller in controllers]
+    if name not in names:
+        raise ValueError(f"Select a controller with --controller, one of: {', '.join(names)}")
+    return controllers[names.index(name)]
+
+def sync_controllers(
+    configs: List[Dict[str, Any]],
+    sync: Callable[[Dict[str, Any]], ControllerResult],
+    max_workers: Optional[int] = None
+) -> Tuple[List[Any], List[Dict[str, str]], List[str]]:
+    """
+    Run ``sync`` for every controller concurrently and merge the results.
+
+    Every controller is synced in its own thread and registers its tools as
+    soon as its own discovery is done, so a slow or unreachable controller
+    does not hold back the others. A failing controller is logged and
+    reported in the returned errors instead of failing the whole sync.
+
+    Returns:
+        Tuple of (tools, failed jobs, controller errors)
+    """
+    tools: List[Any] = []
+    failed_jobs: List[Dict[str, str]] = []
+    errors: List[str] = []
+    lock = threading.Lock()
+
+    def run(config: Dict[str, Any]) -> None:
+        name = config['controller']
+        started = time.monotonic()
+        try:
+            controller_tools, controller_failed = sync(config)
+        except Exception as e:
+            error_msg = f"Controller {name} ({config['jenkins_url']}) failed after {time.monotonic() - started:.1f}s: {str(e)}"
+            logger.error(error_msg)
+            with lock:
+                errors.append(error_msg)
+            return
+        logger.info(
+            f"Controller {name}: {len(controller_tools)} tools registered, "
+            f"{len(controller_failed)} failed, in {time.monotonic() - started:.1f}s"
+        )
+        with lock:
+            tools.extend(controller_tools)
+            failed_jobs.extend({**job, 'controller': name} for job in controller_failed)
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(configs), thread_name_prefix='controller') as executor:
+        list(executor.map(run, configs))
+    return tools, failed_jobs, errors
@@ -0,0 +1,158 @@
+import html
+import re
+from typing import Any, List, Optional
+from .jobinfo import JOB_URL_LABEL
+
+# Rough number of characters per token of English text, used for token budgets
+CHARS_PER_TOKEN = 4
+DESCRIPTION_UNITS = ('chars', 'tokens')
+
+# Marks text cut to fit a budget
+ELLIPSIS = '...'
+
+HTML_TAG_PATTERN = re.compile(r'</?[a-zA-Z][a-zA-Z0-9]*(\s[^<>]*)?/?>')
+HTML_BREAK_PATTERN = re.compile(r'<\s*(br|/p|/div|/li|/h[1-6])\s*/?\s*>', re.IGNORECASE)
+SPACE_PATTERN = re.compile(r'[ \t\r\f\v]+')
+
+class DescriptionCompiler:
+    """
+    Compile the descriptions of generated tools and their parameters within budgets.
+
+    Jenkins descriptions are often long HTML with repeated lines, and choice
+    lists can have hundreds of entries, which inflates every tool manifest.
+    The compiler strips HTML and duplicate lines, shows at most
+    ``max_choices`` choices and cuts descriptions to ``tool_budget`` and
+    ``parameter_budget``. Budgets are counted in characters, or in tokens of
+    about ``CHARS_PER_TOKEN`` characters; 0 disables a budget. When
+    ``details_tool`` is set, cut descriptions point to that tool, which
+    returns the full job details on demand.
+    """
+
+    def __init__(
+        self,
+        tool_budget: int = 1000,
+        parameter_budget: int = 300,
+        max_choices: int = 10,
+        unit: str = 'chars',
+        details_tool: Optional[str] = None
+    ):
+        if unit not in DESCRIPTION_UNITS:
+            raise ValueError(f"Unknown description budget unit {unit!r}, expected one of {', '.join(DESCRIPTION_UNITS)}")
+        scale = CHARS_PER_TOKEN if unit == 'tokens' else 1
+        self.tool_budget = max(0, tool_budget) * scale
+        self.parameter_budget = max(0, parameter_budget) * scale
+        self.max_choices = max(1, max_choices)
+        self.details_tool = details_tool
+
+    @property
+    def signature(self) -> str:
+        """Settings that change compiled descriptions, so cached job info compiled with others is not reused."""
+        return f"{self.tool_budget}:{self.parameter_budget}:{self.max_choices}:{self.details_tool or ''}"
+
+    @staticmethod
+    def clean(text: Any) -> str:
+        """Strip HTML, collapse whitespace and drop repeated lines and blank runs."""
+        text = HTML_BREAK_PATTERN.sub('\n', str(text or ''))
+        text = html.unescape(HTML_TAG_PATTERN.sub('', text))
+        lines: List[str] = []
+        seen = set()
+        for line in text.split('\n'):
+            line = SPACE_PATTERN.sub(' ', line).strip()
+            key = line.lower()
+            if line and key in seen:
+                continue
+            if line:
+                seen.add(key)
+            elif not lines or not lines[-1]:
+                continue
+            lines.append(line)
+        return '\n'.join(lines).strip()
+
+    @staticmethod
+    def truncate(text: str, budget: int, suffix: str = '') -> str:
+        """Cut ``text`` to ``budget`` characters at a word boundary, ending with ``suffix``."""
+        if not budget or len(text) <= budget:
+            return text
+        marker = f"{ELLIPSIS}{suffix}"
+        limit = max(0, budget - len(marker))
+        cut = text[:limit]
+        # Prefer a word boundary unless that drops most of the text
+        boundary = max(cut.rfind(' '), cut.rfind('\n'))
+        if boundary > limit * 0.8:
+            cut = cut[:boundary]
+        return f"{cut.rstrip()}{marker}"
+
+    def details_hint(self, job_name: Optional[str] = None) -> str:
+        if not self.details_tool:
+            return ''
+        target = f" with job={job_name}" if job_name else ''
+        return f"\nFull details: {self.details_tool}{target}"
+
+    def format_choices(self, choices: List[Any]) -> str:
+        """
+        Format the allowed values of a choice parameter.
+
+        Long lists show their first choices, which include the Jenkins default,
+        and the number of choices left out. The shown choices also stop at half
+        the parameter budget so the parameter's own description keeps its room.
+        """
+        budget = self.parameter_budget // 2 if self.parameter_budget else 0
+        shown: List[str] = []
+        length = 0
+        for choice in choices[:self.max_choices]:
+            item = f'"{choice}"'
+            if shown and budget and length + len(item) + 2 > budget:
+                break
+            shown.append(item)
+            length += len(item) + 2
+        rest = len(choices) - len(shown)
+        more = ''
+        if rest:
+            more = f", ... {rest} more, see {self.details_tool}" if self.details_tool else f", ... {rest} more"
+        return f"Allowed values: [{', '.join(shown)}{more}]"
+
+    def parameter_description(self, name: str, description: Any, details: List[str]) -> str:
+        """
+        Join and budget the description of a parameter.
+
+        ``description`` is the Jenkins description; it is dropped when it only
+        repeats the parameter name. The type, choice and default ``details``
+        that follow are kept whole and the Jenkins description is cut instead.
+        """
+        description = self.clean(description)
+        if description.lower().replace(' ', '_') == name.lower():
+            description = ''
+        details_text = '\n'.join(detail.strip() for detail in details if detail.strip())
+        text = '\n'.join(part for part in (description, details_text) if part)
+        if not self.parameter_budget or len(text) <= self.parameter_budget:
+            return text
+
+        if not details_text:
+            return self.truncate(description, self.parameter_budget)
+        room = self.parameter_budget - len(details_text) - 1
+        if not description or room <= len(ELLIPSIS):
+            return self.truncate(text, self.parameter_budget)
+        return f"{self.truncate(description, room)}\n{details_text}"
+
+    def tool_description(self, description: str, job_name: Optional[str] = None) -> str:
+        """
+        Clean and budget the description of a job tool.
+
+        The trailing Jenkins job URL line is always kept and counts against
+        the budget. A cut description ends with a pointer to the details
+        tool, unless the pointer would take more room than the description
+        left before it.
+        """
+        text = self.clean(description)
+        url_line = ''
+        last_line_start = text.rfind('\n') + 1
+        if text[last_line_start:].startswith(JOB_URL_LABEL):
+            text, url_line = text[:last_line_start].strip(), text[last_line_start:]
+        if self.tool_budget:
+            room = self.tool_budget - (len(url_line) + 2 if url_line else 0)
+            if len(text) > room:
+                hint = self.details_hint(job_name)
+                if room - len(ELLIPSIS) - len(hint) < len(hint):
+                    hint = ''
+                text = self.truncate(text, room, hint) if room > len(ELLIPSIS) else ''
+        return '\n\n'.join(part for part in (text, url_line) if part)
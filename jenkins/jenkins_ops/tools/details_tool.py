@@ -0,0 +1,79 @@
+import hashlib
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+from kubiya_sdk.tools import Tool, Arg
+from kubiya_sdk.tools.models import FileSpec
+from .jenkins_job_tool import DEFAULT_TOKEN_SECRET
+
+DETAILS_TOOL_NAME = "jenkins_job_details"
+DETAILS_SCRIPT_PATH = Path(__file__).parent.parent / 'scripts' / 'jenkins_job_details.py'
+DETAILS_DESTINATION = "/opt/scripts/jenkins_job_details.py"
+DETAILS_CONFIG_DESTINATION = "/tmp/jenkins_details_config.json"
+
+@lru_cache(maxsize=None)
+def load_details_payload() -> Tuple[str, FileSpec]:
+    """Load the details script once; returns its sha256 digest and a shared FileSpec."""
+    content = DETAILS_SCRIPT_PATH.read_text()
+    return hashlib.sha256(content.encode()).hexdigest(), FileSpec(destination=DETAILS_DESTINATION, content=content)
+
+def details_tool_config(name: str, jenkins_url: str, username: str, token_secret: Optional[str] = None) -> Dict[str, Any]:
+    """Return the JenkinsJobDetailsTool arguments for one controller."""
+    return {
+        "name": name,
+        "jenkins_url": jenkins_url,
+        "username": username,
+        "token_secret": token_secret or DEFAULT_TOKEN_SECRET
+    }
+
+def details_config_hash(tool_config: Dict[str, Any]) -> str:
+    """Content hash of a details tool's configuration and script, see tool_config_hash."""
+    script_digest, _ = load_details_payload()
+    payload = json.dumps(tool_config, sort_keys=True)
+    return hashlib.sha256(f"{script_digest}:{payload}".encode()).hexdigest()
+
+class JenkinsJobDetailsTool(Tool):
+    """
+    Tool returning the full description and parameter details of a Jenkins job.
+
+    Job tool descriptions are compiled to a budget, see DescriptionCompiler;
+    cut descriptions point to this tool, which fetches the complete job
+    description, parameter descriptions, defaults and choices on demand.
+    """
+
+    jenkins_url: str
+    username: str
+    token_secret: str = DEFAULT_TOKEN_SECRET
+
+    def __init__(self, **data):
+        data.setdefault('description', (
+            "Show the full description and parameter details of a Jenkins job, including every allowed "
+            "value of choice parameters. Use it when a Jenkins job tool's description was shortened."
+        ))
+        super().__init__(**data)
+        _, script_file = load_details_payload()
+        self.args = [Arg(name='job', type='str', description="Full name of the Jenkins job, e.g. team-a/deploy", required=True)]
+        self.secrets = (self.secrets or []) + [self.token_secret]
+        self.image = "python:3.12"
+        self.content = f"""#!/bin/sh
+set -e
+
+if [ -z "${self.token_secret}" ]; then
+    echo "❌ {self.token_secret} environment variable is required"
+    exit 1
+fi
+
+python3 {DETAILS_DESTINATION}
+"""
+        self.with_files = [
+            script_file,
+            FileSpec(
+                destination=DETAILS_CONFIG_DESTINATION,
+                content=json.dumps({
+                    'jenkins_url': self.jenkins_url,
+                    'username': self.username,
+                    'token_secret': self.token_secret
+                })
+            )
+        ]
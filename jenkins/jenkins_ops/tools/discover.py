@@ -1,56 +1,63 @@
 import logging
-import os
-from typing import Dict, Any
-from . import initialize_tools, tools
-from . import DEFAULT_JENKINS_CONFIG
+import threading
+from typing import List, Optional
+from . import initialize_tools
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class JenkinsOpsError(Exception):
     """Base exception for Jenkins Operations module."""
     pass
 
-def discover():
-    """Entry point for tool discovery."""
+# Tools of the last successful discovery, shared by every caller of get_tools
+_tools: Optional[List] = None
+_lock = threading.Lock()
+
+def discover() -> List:
+    """Run tool discovery against the Jenkins server and register the tools."""
     logger.info("Starting Jenkins Operations tool discovery...")
-    
+
     try:
-        def setup_default_environment():
-            if not os.environ.get('JENKINS_URL'):
-                os.environ['JENKINS_URL'] = DEFAULT_JENKINS_CONFIG['jenkins_url']
-                logger.info(f"Using default Jenkins URL: {DEFAULT_JENKINS_CONFIG['jenkins_url']}")
-            
-            if not os.environ.get('JENKINS_API_TOKEN'):
-                os.environ['JENKINS_API_TOKEN'] = "KYlJppNVnJQP5K1r"
-                logger.info("Using default Jenkins API token")
-
-        # Setup environment
-        setup_default_environment()
-        
-        try:
-            # Initialize tools
-            discovered_tools = initialize_tools()
-        except Exception as e:
-            error_msg = f"Failed to initialize Jenkins tools: {str(e)}"
-            logger.error(error_msg)
-            raise JenkinsOpsError(error_msg) from e
-        
-        if not discovered_tools:
-            error_msg = "No Jenkins tools were discovered. Check Jenkins connection and configuration."
-            logger.error(error_msg)
-            raise JenkinsOpsError(error_msg)
-        
-        logger.info(f"Successfully discovered {len(discovered_tools)} Jenkins tools")
-        return discovered_tools
-        
+        discovered_tools = initialize_tools()
     except Exception as e:
         error_msg = f"Failed to initialize Jenkins tools: {str(e)}"
         logger.error(error_msg)
+        raise JenkinsOpsError(error_msg) from e
+
+    if not discovered_tools:
+        error_msg = (
+            "No Jenkins tools were discovered.\n"
+            "This could be due to:\n"
+            "1. Jenkins server not accessible at the configured jenkins_url\n"
+            "2. Invalid authentication credentials\n"
+            "3. No jobs available or accessible\n"
+            "4. Errors during tool creation\n\n"
+            "Please check the logs above for specific error messages."
+        )
+        logger.error(error_msg)
         raise JenkinsOpsError(error_msg)
 
-# Export the tools
-__all__ = ['tools', 'discover']
+    logger.info(f"Successfully discovered {len(discovered_tools)} Jenkins tools")
+    return discovered_tools
+
+def get_tools() -> List:
+    """
+    Return the Jenkins tools, discovering them on the first call.
+
+    Later calls return the same tools without contacting Jenkins. A failed
+    discovery is not remembered, so the next call tries again.
+    """
+    global _tools
+    with _lock:
+        if _tools is None:
+            _tools = discover()
+        return _tools
+
+def refresh() -> List:
+    """Discover the tools again and replace the memoized ones."""
+    global _tools
+    with _lock:
+        _tools = discover()
+        return _tools
 
-discover()
\ No newline at end of file
+__all__ = ['JenkinsOpsError', 'discover', 'get_tools', 'refresh']
@@ -0,0 +1,199 @@
+import argparse
+import json
+import logging
+import sys
+import time
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+from urllib.parse import quote
+from kubiya_sdk.tools.registry import tool_registry
+from . import create_jenkins_tool, create_parser, get_jenkins_config, tool_name_for
+from .controllers import select_controller
+from .discover import get_tools, refresh
+from .filters import JobFilter
+
+logger = logging.getLogger(__name__)
+
+EVENT_ACTIONS = ('created', 'updated', 'deleted')
+
+class JobEvent:
+    """
+    A change to a single Jenkins job.
+
+    Events are small JSON objects such as
+    ``{"event": "updated", "job": "folder/my-job", "url": "https://jenkins/job/folder/job/my-job/"}``.
+    The ``url`` is optional and derived from the job's full name when missing.
+    Notification style names like ``item.updated`` are accepted as well.
+    """
+
+    def __init__(self, action: str, job: str, url: Optional[str] = None):
+        self.action = action
+        self.job = job
+        self.url = url
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'JobEvent':
+        action = str(data.get('event', '')).lower()
+        if action.startswith('item.'):
+            action = action[len('item.'):]
+        if action not in EVENT_ACTIONS:
+            raise ValueError(f"Unknown event type: {data.get('event')!r}, expected one of {', '.join(EVENT_ACTIONS)}")
+        job = data.get('job')
+        if not job:
+            raise ValueError("Event is missing the 'job' full name")
+        return cls(action, job.strip('/'), data.get('url'))
+
+    def __repr__(self) -> str:
+        return f"JobEvent({self.action!r}, {self.job!r})"
+
+def job_url_for(jenkins_url: str, job_name: str) -> str:
+    """Build the URL of a job from its full name, e.g. ``folder/my-job``."""
+    path = ''.join(f"/job/{quote(part)}" for part in job_name.split('/'))
+    return f"{jenkins_url.rstrip('/')}{path}/"
+
+class JsonLinesEventSource:
+    """
+    Stub event source reading one JSON event per line from a file.
+
+    With ``follow`` the file is tailed like ``tail -f``, so events can be
+    appended with ``echo '{"event": "updated", "job": "my-job"}' >> events.jsonl``.
+    While no events arrive, ``None`` is yielded every ``poll_interval`` seconds
+    so the consumer can run periodic work.
+    """
+
+    def __init__(self, path: str, follow: bool = False, poll_interval: float = 1.0):
+        self.path = path
+        self.follow = follow
+        self.poll_interval = poll_interval
+
+    def __iter__(self) -> Iterator[Optional[JobEvent]]:
+        with open(self.path) as f:
+            pending = ''
+            while True:
+                line = f.readline()
+                if not line.endswith('\n') and self.follow:
+                    # Keep partially written lines until the writer finishes them
+                    pending += line
+                    time.sleep(self.poll_interval)
+                    yield None
+                    continue
+                if not line and not pending:
+                    return
+
+                line, pending = (pending + line).strip(), ''
+                if not line:
+                    continue
+                try:
+                    yield JobEvent.from_dict(json.loads(line))
+                except ValueError as e:
+                    logger.warning(f"Ignoring invalid event {line!r}: {str(e)}")
+
+class EventSync:
+    """
+    Keep the registered Jenkins tools in sync from job-change events.
+
+    Each event updates or removes only the tool of the affected job. A full
+    rediscovery runs every ``resync_interval`` seconds as a safety net for
+    missed events.
+    """
+
+    def __init__(self, config: Dict[str, Any], resync_interval: Optional[float] = None):
+        self.config = config
+        self.resync_interval = config['discovery']['resync_interval'] if resync_interval is None else resync_interval
+        self.parser = create_parser(config)
+        jobs = config['jobs']
+        self.job_filter = JobFilter(
+            jobs.get('include', []) if not jobs.get('sync_all') else None,
+            jobs.get('exclude', []) if not jobs.get('sync_all') else None
+        )
+        self.last_resync = time.monotonic()
+        self.applied = 0
+        self.failed = 0
+
+    @property
+    def registered_tools(self) -> Dict[str, Any]:
+        return tool_registry.tools.setdefault("jenkins", {})
+
+    def _is_selected(self, job_name: str) -> bool:
+        """Apply the include and exclude job filters from configuration."""
+        return self.job_filter.matches(job_name)
+
+    def apply(self, event: JobEvent) -> bool:
+        """Apply a single event to the tool registry. Returns whether the registry changed."""
+        if not self._is_selected(event.job):
+            logger.debug(f"Ignoring event for unselected job: {event.job}")
+            return False
+
+        job_url = event.url or job_url_for(self.config['jenkins_url'], event.job)
+
+        if event.action == 'deleted':
+            removed = self.registered_tools.pop(tool_name_for(event.job, self.config.get('controller')), None)
+            if removed is not None:
+                logger.info(f"Unregistered tool for deleted job: {event.job}")
+            return removed is not None
+
+        job_info = self.parser._process_single_job(event.job, job_url)
+        if not job_info:
+            logger.error(f"Failed to process {event.action} job: {event.job}")
+            return False
+
+        tool_registry.register("jenkins", create_jenkins_tool(event.job, job_info, self.config))
+        logger.info(f"Registered tool for {event.action} job: {event.job}")
+        return True
+
+    def resync_due(self) -> bool:
+        return bool(self.resync_interval) and time.monotonic() - self.last_resync >= self.resync_interval
+
+    def full_resync(self) -> None:
+        """Rediscover every job; the sync re-registers changed tools and drops tools of jobs that no longer exist."""
+        logger.info("Running periodic full Jenkins resync...")
+        self.last_resync = time.monotonic()
+        try:
+            tools = refresh()
+        except Exception as e:
+            logger.error(f"Full resync failed, keeping the current tools: {str(e)}")
+            return
+        logger.info(f"Full resync done, {len(tools)} tools registered")
+
+    def run(self, events: Iterable[Optional[JobEvent]]) -> None:
+        """Apply events until the source is exhausted. ``None`` items only trigger the resync check."""
+        for event in events:
+            if event is not None:
+                try:
+                    if self.apply(event):
+                        self.applied += 1
+                except Exception as e:
+                    self.failed += 1
+                    logger.error(f"Failed to apply {event}: {str(e)}")
+
+            if self.resync_due():
+                self.full_resync()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Register the Jenkins tools, then keep them in sync from a JSON-lines event file.
+
+    Usage:
+        python -m jenkins_ops.tools.events --config jenkins.json --events events.jsonl --follow
+
+    With several controllers configured, ``--controller`` names the one the events come from.
+    """
+    arg_parser = argparse.ArgumentParser(description="Event-driven Jenkins tool sync")
+    arg_parser.add_argument('--config', required=True, help="Dynamic configuration JSON with a 'jenkins' section")
+    arg_parser.add_argument('--events', required=True, help="File with one JSON event per line")
+    arg_parser.add_argument('--follow', action='store_true', help="Keep waiting for new events")
+    arg_parser.add_argument('--poll-interval', type=float, default=1.0)
+    arg_parser.add_argument('--controller', help="Controller the events come from, when several are configured")
+    args = arg_parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    with open(args.config) as f:
+        tool_registry.dynamic_config = json.load(f)
+    get_tools()
+
+    sync = EventSync(select_controller(get_jenkins_config(), args.controller))
+    sync.run(JsonLinesEventSource(args.events, follow=args.follow, poll_interval=args.poll_interval))
+    logger.info(f"Applied {sync.applied} events, {sync.failed} failed")
+    return 1 if sync.failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
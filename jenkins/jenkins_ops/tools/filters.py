@@ -0,0 +1,110 @@
+import fnmatch
+import re
+from typing import Iterable, List, Optional, Pattern, Set
+
+# Characters that turn a filter entry into a glob pattern
+GLOB_CHARS = frozenset('*?[')
+REGEX_PREFIX = 're:'
+
+def _literal_prefix(pattern: str) -> str:
+    """Return the part of a glob pattern before its first wildcard."""
+    for index, char in enumerate(pattern):
+        if char in GLOB_CHARS:
+            return pattern[:index]
+    return pattern
+
+class _Patterns:
+    """One side (include or exclude) of a job filter, compiled once."""
+
+    def __init__(self, entries: Iterable[str]):
+        self.names: Set[str] = set()
+        self.globs: List[Pattern] = []
+        self.glob_patterns: List[str] = []
+        self.glob_prefixes: List[str] = []
+        self.regexes: List[Pattern] = []
+        # Folders holding at least one exactly named job, e.g. {'a', 'a/b'} for 'a/b/job'
+        self.name_folders: Set[str] = set()
+
+        for entry in entries:
+            if not entry.startswith(REGEX_PREFIX):
+                entry = entry.strip('/')
+            if not entry:
+                continue
+            if entry.startswith(REGEX_PREFIX):
+                self.regexes.append(re.compile(entry[len(REGEX_PREFIX):]))
+            elif GLOB_CHARS.intersection(entry):
+                self.globs.append(re.compile(fnmatch.translate(entry)))
+                self.glob_patterns.append(entry)
+                self.glob_prefixes.append(_literal_prefix(entry))
+            else:
+                self.names.add(entry)
+                parts = entry.split('/')
+                self.name_folders.update('/'.join(parts[:depth]) for depth in range(1, len(parts)))
+
+    def __bool__(self) -> bool:
+        return bool(self.names or self.globs or self.regexes)
+
+    def matches(self, full_name: str) -> bool:
+        return (
+            full_name in self.names
+            or any(glob.match(full_name) for glob in self.globs)
+            or any(regex.search(full_name) for regex in self.regexes)
+        )
+
+class JobFilter:
+    """
+    Include and exclude job filters, compiled once and applied during traversal.
+
+    Entries are matched against a job's full name, e.g. ``folder/my-job``:
+
+    - plain names match exactly (``team-a/deploy``)
+    - entries with ``*``, ``?`` or ``[...]`` are globs; ``*`` also matches ``/``,
+      so ``team-a/*`` selects everything below ``team-a``
+    - entries starting with ``re:`` are regular expressions searched in the name
+
+    ``may_contain`` and ``excludes_folder`` tell the traversal which folders can
+    be skipped without listing them. Regular expressions cannot be reasoned
+    about per folder, so an include regex disables include-based pruning.
+    """
+
+    def __init__(self, include: Optional[Iterable[str]] = None, exclude: Optional[Iterable[str]] = None):
+        self.include = _Patterns(include or [])
+        self.exclude = _Patterns(exclude or [])
+        # Exclude globs like 'legacy/*' drop every job whose name starts with 'legacy/'
+        self._excluded_prefixes = [
+            prefix for prefix, pattern in zip(self.exclude.glob_prefixes, self.exclude.glob_patterns)
+            if pattern == prefix + '*'
+        ]
+
+    @property
+    def active(self) -> bool:
+        return bool(self.include or self.exclude)
+
+    def matches(self, full_name: str) -> bool:
+        """Return whether a job is selected by the filters."""
+        if self.include and not self.include.matches(full_name):
+            return False
+        return not (self.exclude and self.exclude.matches(full_name))
+
+    def may_contain(self, folder: str) -> bool:
+        """Return whether any job below ``folder`` (a folder full name) can be included."""
+        include = self.include
+        if not include or include.regexes:
+            return True
+        if folder in include.name_folders:
+            return True
+        folder_path = f"{folder}/"
+        # A glob can only match below the folder if its literal prefix is compatible with the folder path
+        return any(
+            prefix.startswith(folder_path) or folder_path.startswith(prefix)
+            for prefix in include.glob_prefixes
+        )
+
+    def excludes_folder(self, folder: str) -> bool:
+        """Return whether every job below ``folder`` is excluded, e.g. by ``legacy/*``."""
+        folder_path = f"{folder}/"
+        return any(folder_path.startswith(prefix) for prefix in self._excluded_prefixes)
+
+    def prunes(self, folder: str) -> bool:
+        """Return whether the traversal can skip ``folder`` entirely."""
+        return not self.may_contain(folder) or self.excludes_folder(folder)
@@ -1,28 +1,85 @@
+import hashlib
 import logging
 import time
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 from kubiya_sdk.tools import Tool, Arg
-from kubiya_sdk.tools.models import FileSpec
+from kubiya_sdk.tools.models import FileSpec, Volume
 from pydantic import Field
 from pathlib import Path
 import json
 
 logger = logging.getLogger(__name__)
 
+RUNNER_SCRIPT_PATH = Path(__file__).parent.parent / 'scripts' / 'jenkins_job_runner.py'
+RUNNER_DESTINATION = "/opt/scripts/jenkins_job_runner.py"
+# Secret holding the API token, unless the job config names another one (e.g. one per controller)
+DEFAULT_TOKEN_SECRET = "JENKINS_API_TOKEN"
+
+# Where the runner's dependencies come from, see scripts/build_runner_env.py:
+#   pip        - install from PyPI on every run
+#   wheelhouse - install offline from pinned wheels on a shared volume
+#   zipapp     - run from a zipapp shipped next to the runner, nothing is installed
+RUNNER_ENVIRONMENTS = ('pip', 'wheelhouse', 'zipapp')
+RUNNER_VOLUME_PATH = "/opt/jenkins-runner"
+RUNNER_ZIPAPP_PATH = RUNNER_SCRIPT_PATH.parent / 'jenkins_runner_deps.pyz'
+RUNNER_ZIPAPP_DESTINATION = "/opt/scripts/jenkins_runner_deps.pyz"
+# Build index shared by all executions through the runner volume, see dedup_window
+DEDUP_INDEX_PATH = f"{RUNNER_VOLUME_PATH}/dedup/builds.json"
+
+# Tool argument read by the runner for concurrent multi-build runs
+PARAMETER_SETS_ARG = 'jenkins_parameter_sets'
+
+@lru_cache(maxsize=None)
+def load_runner_payload() -> Tuple[str, FileSpec]:
+    """
+    Load the job runner script once.
+
+    Returns the sha256 digest of the script and a single FileSpec that is
+    shared by every JenkinsJobTool, instead of one copy of the script per tool.
+    """
+    content = RUNNER_SCRIPT_PATH.read_text()
+    digest = hashlib.sha256(content.encode()).hexdigest()
+    logger.debug(f"Loaded runner payload {digest[:12]} ({len(content)} bytes)")
+    return digest, FileSpec(destination=RUNNER_DESTINATION, content=content)
+
+def tool_config_hash(tool_config: Dict[str, Any]) -> str:
+    """
+    Content hash of a tool's configuration and of the runner script it ships.
+
+    Tools with the same hash prepare to the same args, files and script, so a
+    registered tool can be kept when its hash did not change.
+    """
+    runner_digest, _ = load_runner_payload()
+    payload = json.dumps(tool_config, sort_keys=True, default=str)
+    return hashlib.sha256(f"{runner_digest}:{payload}".encode()).hexdigest()
+
 class JenkinsJobTool(Tool):
     """Tool for executing and monitoring Jenkins jobs."""
     
     job_config: Dict[str, Any]
     poll_interval: int = Field(default=30, description="Interval in seconds to poll job status")
     stream_logs: bool = Field(default=True, description="Stream job logs while running")
-    
+    queue_timeout: int = Field(default=600, description="Seconds a build may wait in the queue before it is cancelled")
+    fanout_concurrency: int = Field(default=4, description="Builds queued or running at a time when fanning out parameter sets")
+    runner_environment: str = Field(default='pip', description="Where the runner's dependencies come from: pip, wheelhouse or zipapp")
+    runner_volume: str = Field(default='jenkins-runner', description="Shared volume holding the pre-built wheelhouse")
+    verbose: bool = Field(default=False, description="Log debug output and check the Jenkins user and version before running")
+    log_filter: Optional[str] = Field(default=None, description="Regex selecting the console lines printed to the user")
+    log_tail_lines: int = Field(default=50, description="Console lines kept for the summary when lines are filtered")
+    log_archive_dir: Optional[str] = Field(default="/tmp/jenkins-logs", description="Directory for gzip-compressed full console logs")
+    stage_progress: bool = Field(default=True, description="Report stage progress of pipeline builds from the workflow API")
+    dedup_window: int = Field(default=0, description="Seconds within which an identical build request attaches to the earlier build, 0 to disable")
+
     def __init__(self, **data):
         """Initialize the Jenkins job tool with configuration."""
         super().__init__(**data)
         
-        # Add standard environment variables and secrets
-        self.env = (self.env or []) + ["JENKINS_URL"]
-        self.secrets = (self.secrets or []) + ["JENKINS_API_TOKEN"]
+        # Add standard environment variables and secrets; a job config with its
+        # controller's URL does not need JENKINS_URL
+        if not self.job_config.get('jenkins_url'):
+            self.env = (self.env or []) + ["JENKINS_URL"]
+        self.secrets = (self.secrets or []) + [self.token_secret]
         
         # Set default icon
         if not self.icon_url:
@@ -31,6 +88,14 @@ class JenkinsJobTool(Tool):
         # Generate mermaid diagram for job flow
         self.mermaid = self._generate_mermaid_diagram()
 
+        # Build args, script and files now: the SDK bundler serializes tools
+        # nested in its own models, without calling any method of the tool
+        self.prepare()
+
+    @property
+    def token_secret(self) -> str:
+        return self.job_config.get('auth', {}).get('token_secret') or DEFAULT_TOKEN_SECRET
+
     def _generate_mermaid_diagram(self) -> str:
         """Generate a mermaid diagram showing the job execution flow."""
         return """
@@ -56,30 +121,49 @@ class JenkinsJobTool(Tool):
 
     def _generate_script_content(self) -> str:
         """Generate the script content for job execution."""
-        return """#!/bin/sh
-set -e
+        if self.runner_environment == 'wheelhouse':
+            wheelhouse = f"{RUNNER_VOLUME_PATH}/wheels"
+            run_steps = f"""# Install pinned dependencies from the shared wheelhouse, without network access
+pip install -q --disable-pip-version-check --no-index --find-links {wheelhouse} -r {wheelhouse}/requirements.txt
 
-# Validate environment
-if [ -z "$JENKINS_URL" ]; then
+# Run job
+python3 {RUNNER_DESTINATION}"""
+        elif self.runner_environment == 'zipapp':
+            run_steps = f"""# Run job with the dependencies bundled in the zipapp, nothing is installed
+python3 {RUNNER_ZIPAPP_DESTINATION} {RUNNER_DESTINATION}"""
+        else:
+            run_steps = f"""# Install dependencies
+pip install -q requests
+
+# Run job
+python3 {RUNNER_DESTINATION}"""
+
+        url_check = "" if self.job_config.get('jenkins_url') else """if [ -z "$JENKINS_URL" ]; then
     echo "❌ JENKINS_URL environment variable is required"
     exit 1
 fi
 
-if [ -z "$JENKINS_API_TOKEN" ]; then
-    echo "❌ JENKINS_API_TOKEN environment variable is required"
+"""
+        return f"""#!/bin/sh
+set -e
+
+# Validate environment
+{url_check}if [ -z "${self.token_secret}" ]; then
+    echo "❌ {self.token_secret} environment variable is required"
     exit 1
 fi
 
-# Install dependencies
-pip install -q python-jenkins requests
-
-# Run job
-python3 /opt/scripts/jenkins_job_runner.py
+{run_steps}
 """
 
     def prepare(self) -> None:
-        """Prepare the tool for execution."""
+        """Prepare the tool for execution: build its args, script and files."""
         try:
+            if self.runner_environment not in RUNNER_ENVIRONMENTS:
+                raise ValueError(
+                    f"Unknown runner environment {self.runner_environment!r}, expected one of {', '.join(RUNNER_ENVIRONMENTS)}"
+                )
+
             logger.debug(f"Preparing tool with config: {self.job_config}")
             
             # Convert job parameters to Kubiya args
@@ -117,6 +201,16 @@ python3 /opt/scripts/jenkins_job_runner.py
                 logger.debug(f"Created argument: {arg}")
                 self.args.append(arg)
 
+            # Optional fan-out: trigger one build per parameter set concurrently
+            self.args.append(Arg(
+                name=PARAMETER_SETS_ARG,
+                type='str',
+                description='Optional JSON list of parameter sets keyed by the argument names of this tool, '
+                            'e.g. [{"environment": "dev"}, {"environment": "prod"}]. '
+                            'Triggers one build per set concurrently, on top of the other parameters.',
+                required=False
+            ))
+
             logger.debug(f"Created {len(self.args)} arguments")
 
             # Set up script content
@@ -124,34 +218,52 @@ python3 /opt/scripts/jenkins_job_runner.py
 
             self.image = "python:3.12"
 
-            # Read the script content from the file
-            script_path = Path(__file__).parent.parent / 'scripts' / 'jenkins_job_runner.py'
-            with open(script_path, 'r') as file:
-                jenkins_runner_script = file.read()
+            # The runner script is loaded once and shared by all tools
+            runner_digest, runner_file = load_runner_payload()
+            self.metadata = {**(self.metadata or {}), 'runner_sha256': runner_digest}
             
             # Add required files
             self.with_files = [
-                FileSpec(
-                    destination="/opt/scripts/jenkins_job_runner.py",
-                    content=jenkins_runner_script
-                ),
+                runner_file,
                 FileSpec(
                     destination="/tmp/jenkins_config.json",
                     content=json.dumps({
                         'username': self.job_config['auth']['username'],
                         'job_name': self.job_config['name'],
+                        'jenkins_url': self.job_config.get('jenkins_url'),
+                        'token_secret': self.token_secret,
                         'stream_logs': self.stream_logs,
                         'poll_interval': self.poll_interval,
+                        'queue_timeout': self.queue_timeout,
+                        'fanout_concurrency': self.fanout_concurrency,
+                        'verbose': self.verbose,
+                        'log_filter': self.log_filter,
+                        'log_tail_lines': self.log_tail_lines,
+                        'log_archive_dir': self.log_archive_dir,
+                        'stage_progress': self.stage_progress,
+                        'dedup_window': self.dedup_window,
+                        'dedup_index_path': DEDUP_INDEX_PATH if self.dedup_window > 0 else None,
                         'parameters': {
                             name: {
                                 'type': parameters[name].get('type', 'str'),
-                                'name': name
+                                'name': name,
+                                'original_name': parameters[name].get('original_name', name)
                             }
                             for name in parameters
                         }
                     })
                 )
             ]
+
+            # The wheelhouse and the deduplication index both live on the runner volume
+            if self.runner_environment == 'wheelhouse' or self.dedup_window > 0:
+                self.with_volumes = [Volume(name=self.runner_volume, path=RUNNER_VOLUME_PATH)]
+            if self.runner_environment == 'zipapp':
+                if not RUNNER_ZIPAPP_PATH.exists():
+                    raise FileNotFoundError(
+                        f"{RUNNER_ZIPAPP_PATH} not found, build it with: python scripts/build_runner_env.py zipapp"
+                    )
+                self.with_files.append(FileSpec(source=str(RUNNER_ZIPAPP_PATH), destination=RUNNER_ZIPAPP_DESTINATION))
             
             logger.debug("Tool preparation completed successfully")
             
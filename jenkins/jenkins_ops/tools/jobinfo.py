@@ -0,0 +1,132 @@
+import sys
+from collections.abc import Mapping
+from typing import Dict, Any, Iterator, Optional
+
+# Keys of a job info mapping, in the order of the plain dict layout
+JOB_INFO_KEYS = ('name', 'description', 'parameters', 'url', 'buildable', 'type', 'health', 'auth')
+
+# Label of the job URL line appended to job descriptions
+JOB_URL_LABEL = 'Jenkins Job URL: '
+
+def shared_string(value: Any) -> Any:
+    """Return the interned copy of a string so repeated values are stored once."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+def job_url_line(jenkins_url: str, job_name: str) -> str:
+    return f"{JOB_URL_LABEL}{jenkins_url}/job/{job_name}"
+
+class SharedValues:
+    """
+    Values shared by every job discovered by one parser.
+
+    All jobs reference a single ``auth`` dict, and identical health reports
+    are stored once. Like the compiled parameter schemas, the shared dicts
+    must be treated as read-only.
+    """
+
+    def __init__(self, username: str):
+        self.auth = {"username": username}
+        self._health: Dict[Any, Dict[str, Any]] = {}
+
+    def health(self, score: Any, description: str) -> Dict[str, Any]:
+        # dict.setdefault is atomic, so concurrent workers end up sharing one report
+        return self._health.setdefault(
+            (score, description), {"score": score, "description": shared_string(description)}
+        )
+
+class JobInfo(Mapping):
+    """
+    Compact, read-only metadata of a discovered job.
+
+    Reads like the plain job info dict (``job_info.get('description')``,
+    ``job_info['parameters']``) but stores its fields in slots. The
+    description with the job URL appended is built on access instead of
+    being stored per job, ``parameters`` is the dict of the shared compiled
+    schema, and ``health`` and ``auth`` reference the parser's shared values.
+    ``to_dict`` returns the plain dict layout, e.g. for JSON output.
+    """
+
+    __slots__ = ('name', 'raw_description', 'parameters', 'url', 'buildable', 'type', 'health', 'auth', 'jenkins_url')
+
+    def __init__(
+        self,
+        name: str,
+        raw_description: str,
+        parameters: Dict[str, Any],
+        url: str,
+        buildable: bool,
+        type: str,
+        health: Optional[Dict[str, Any]],
+        auth: Dict[str, Any],
+        jenkins_url: str
+    ):
+        self.name = name
+        self.raw_description = shared_string(raw_description or '')
+        self.parameters = parameters
+        self.url = url
+        self.buildable = buildable
+        self.type = shared_string(type)
+        self.health = health
+        self.auth = auth
+        self.jenkins_url = shared_string(jenkins_url)
+
+    @property
+    def description(self) -> str:
+        url_line = job_url_line(self.jenkins_url, self.name)
+        return f"{self.raw_description}\n\n{url_line}" if self.raw_description else url_line
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], jenkins_url: str, shared: SharedValues) -> 'JobInfo':
+        """Build a job info from the plain dict layout, e.g. an entry loaded from the discovery cache."""
+        name = data.get('name', '')
+        description = data.get('description') or ''
+        url_line = job_url_line(jenkins_url, name)
+        if description == url_line:
+            description = ''
+        elif description.endswith(f"\n\n{url_line}"):
+            description = description[:-len(url_line) - 2]
+        health = data.get('health')
+        return cls(
+            name=name,
+            raw_description=description,
+            parameters=data.get('parameters', {}),
+            url=data.get('url', ''),
+            buildable=data.get('buildable', True),
+            type=data.get('type', ''),
+            health=shared.health(health.get('score', 0), health.get('description', '')) if health else None,
+            auth=shared.auth,
+            jenkins_url=jenkins_url
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the plain dict layout with copies of the shared containers."""
+        return {
+            "name": self.name,
+            "description": self.description,
+            "parameters": dict(self.parameters),
+            "url": self.url,
+            "buildable": self.buildable,
+            "type": self.type,
+            "health": dict(self.health) if self.health is not None else None,
+            "auth": dict(self.auth)
+        }
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in JOB_INFO_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(JOB_INFO_KEYS)
+
+    def __len__(self) -> int:
+        return len(JOB_INFO_KEYS)
+
+    def __repr__(self) -> str:
+        return f"JobInfo(name={self.name!r}, url={self.url!r}, parameters={len(self.parameters)})"
+
+def job_info_json(value: Any) -> Any:
+    """``default`` hook for json.dump that writes job infos in the plain dict layout."""
+    if isinstance(value, JobInfo):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
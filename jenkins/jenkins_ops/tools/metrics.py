@@ -0,0 +1,204 @@
+import heapq
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def _label(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class Histogram:
+    """Cumulative latency histogram with Prometheus-style buckets."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'buckets': {str(bound): count for bound, count in zip(self.buckets, self.counts)},
+        }
+
+class DiscoveryMetrics:
+    """
+    Hot-path metrics recorded during job discovery.
+
+    Requests are grouped by endpoint kind (``folder``, ``tree``, ``job``, ...)
+    to keep label cardinality bounded. Phase times are cumulative worker
+    seconds, so with concurrent discovery they can exceed the wall time.
+    ``labels`` are added to every exported series, e.g. the shard index of
+    a sharded run, so per-shard files can be told apart once collected.
+    """
+
+    def __init__(self, slowest_jobs: int = 10, labels: Optional[Dict[str, str]] = None):
+        self.slowest_jobs = slowest_jobs
+        self.labels = dict(labels or {})
+        self.latency: Dict[str, Histogram] = {}
+        self.response_bytes: Dict[str, int] = {}
+        self.retries: Dict[str, int] = {}
+        self.phases: Dict[str, float] = {}
+        self.jobs_processed = 0
+        self._slowest: List[Tuple[float, str]] = []
+        self._started = time.monotonic()
+        self._finished: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def observe_request(self, endpoint: str, latency: float, size: int) -> None:
+        with self._lock:
+            self.latency.setdefault(endpoint, Histogram()).observe(latency)
+            self.response_bytes[endpoint] = self.response_bytes.get(endpoint, 0) + size
+
+    def record_retry(self, endpoint: str, reason: str) -> None:
+        key = f"{endpoint}:{reason}"
+        with self._lock:
+            self.retries[key] = self.retries.get(key, 0) + 1
+
+    def record_job(self, job_name: str, seconds: float) -> None:
+        """Record the processing time of a job, keeping only the slowest ones."""
+        with self._lock:
+            self.jobs_processed += 1
+            if len(self._slowest) < self.slowest_jobs:
+                heapq.heappush(self._slowest, (seconds, job_name))
+            elif self._slowest and seconds > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, (seconds, job_name))
+
+    def add_phase(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, phase: str) -> Iterator[None]:
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add_phase(phase, time.monotonic() - started)
+
+    def finish(self) -> None:
+        self._finished = time.monotonic()
+
+    @property
+    def wall_time(self) -> float:
+        return (self._finished or time.monotonic()) - self._started
+
+    def slowest(self) -> List[Tuple[str, float]]:
+        with self._lock:
+            return [(job_name, seconds) for seconds, job_name in sorted(self._slowest, reverse=True)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        slowest = self.slowest()
+        with self._lock:
+            return {
+                'labels': dict(self.labels),
+                'wall_time_seconds': round(self.wall_time, 6),
+                'jobs_processed': self.jobs_processed,
+                'phases_seconds': {phase: round(seconds, 6) for phase, seconds in self.phases.items()},
+                'requests': {endpoint: histogram.to_dict() for endpoint, histogram in self.latency.items()},
+                'response_bytes': dict(self.response_bytes),
+                'retries': dict(self.retries),
+                'slowest_jobs': [{'job': job_name, 'seconds': round(seconds, 6)} for job_name, seconds in slowest],
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self, prefix: str = 'jenkins_discovery') -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        data = self.to_dict()
+        common = ''.join(f',{name}="{_label(value)}"' for name, value in self.labels.items())
+
+        def labels(**series: str) -> str:
+            text = ','.join(f'{name}="{value}"' for name, value in series.items()) + common
+            return f"{{{text.lstrip(',')}}}" if text else ''
+
+        lines = [
+            f"# HELP {prefix}_wall_time_seconds Wall time of the last discovery run.",
+            f"# TYPE {prefix}_wall_time_seconds gauge",
+            f"{prefix}_wall_time_seconds{labels()} {data['wall_time_seconds']}",
+            f"# HELP {prefix}_jobs_processed Jobs processed in the last discovery run.",
+            f"# TYPE {prefix}_jobs_processed gauge",
+            f"{prefix}_jobs_processed{labels()} {data['jobs_processed']}",
+            f"# HELP {prefix}_phase_seconds Cumulative worker seconds per discovery phase.",
+            f"# TYPE {prefix}_phase_seconds gauge",
+        ]
+        lines += [f'{prefix}_phase_seconds{labels(phase=phase)} {seconds}' for phase, seconds in data['phases_seconds'].items()]
+
+        lines += [
+            f"# HELP {prefix}_request_duration_seconds Jenkins API request latency by endpoint.",
+            f"# TYPE {prefix}_request_duration_seconds histogram",
+        ]
+        for endpoint, histogram in data['requests'].items():
+            for bound, count in histogram['buckets'].items():
+                lines.append(f'{prefix}_request_duration_seconds_bucket{labels(endpoint=endpoint, le=bound)} {count}')
+            lines.append(f'{prefix}_request_duration_seconds_bucket{labels(endpoint=endpoint, le="+Inf")} {histogram["count"]}')
+            lines.append(f'{prefix}_request_duration_seconds_sum{labels(endpoint=endpoint)} {histogram["sum"]}')
+            lines.append(f'{prefix}_request_duration_seconds_count{labels(endpoint=endpoint)} {histogram["count"]}')
+
+        lines += [
+            f"# HELP {prefix}_response_bytes_total Response body bytes received by endpoint, before decompression.",
+            f"# TYPE {prefix}_response_bytes_total counter",
+        ]
+        lines += [f'{prefix}_response_bytes_total{labels(endpoint=endpoint)} {size}' for endpoint, size in data['response_bytes'].items()]
+
+        lines += [
+            f"# HELP {prefix}_retries_total Retried requests by endpoint and reason.",
+            f"# TYPE {prefix}_retries_total counter",
+        ]
+        for key, count in data['retries'].items():
+            endpoint, reason = key.split(':', 1)
+            lines.append(f'{prefix}_retries_total{labels(endpoint=endpoint, reason=reason)} {count}')
+
+        lines += [
+            f"# HELP {prefix}_slow_job_seconds Processing time of the slowest jobs.",
+            f"# TYPE {prefix}_slow_job_seconds gauge",
+        ]
+        lines += [
+            f'{prefix}_slow_job_seconds{labels(job=_label(entry["job"]))} {entry["seconds"]}'
+            for entry in data['slowest_jobs']
+        ]
+        return '\n'.join(lines) + '\n'
+
+    def summary(self) -> str:
+        requests = sum(histogram.count for histogram in self.latency.values())
+        retries = sum(self.retries.values())
+        phases = ', '.join(f"{phase} {seconds:.2f}s" for phase, seconds in self.phases.items())
+        slowest = ', '.join(f"{job_name} ({seconds:.2f}s)" for job_name, seconds in self.slowest()[:3])
+        return (
+            f"Discovery metrics: {requests} requests, {sum(self.response_bytes.values())} bytes, "
+            f"{retries} retries in {self.wall_time:.2f}s ({phases}); slowest jobs: {slowest or 'none'}"
+        )
+
+    def export(self, json_path: Optional[str] = None, prometheus_path: Optional[str] = None) -> None:
+        """Write the metrics as JSON and/or Prometheus text, e.g. for the node exporter textfile collector."""
+        for path, content in ((json_path, self.to_json), (prometheus_path, self.to_prometheus)):
+            if not path:
+                continue
+            path = os.path.expanduser(path)
+            try:
+                os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, 'w') as f:
+                    f.write(content())
+                os.replace(tmp_path, path)
+            except Exception as e:
+                logger.warning(f"Failed to write discovery metrics to {path}: {str(e)}")
@@ -1,15 +1,80 @@
 import logging
 import json
-from typing import Dict, Any, List, Optional, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 import requests
 from urllib.parse import urljoin
-import base64
-import os
 import re
+import time
+from .cache import DiscoveryCache, job_fingerprint
+from .descriptions import DescriptionCompiler
+from .filters import JobFilter
+from .jobinfo import JobInfo, SharedValues, shared_string
+from .schema import SchemaCache
+from .metrics import DiscoveryMetrics
+from .sharding import shard_for
+from .transport import AdaptiveLimiter, RETRY_STATUS_CODES, THROTTLE_STATUS_CODES, backoff_delay, create_session, wire_size
 logger = logging.getLogger(__name__)
 
-os.environ['JENKINS_API_TOKEN'] = "KYlJppNVnJQP5K1r"
+# Item classes treated as buildable jobs and as containers of other jobs
+JOB_CLASSES = ['WorkflowJob', 'FreeStyleProject', 'Pipeline']
+FOLDER_CLASSES = ['Folder', 'WorkflowMultiBranch', 'OrganizationFolder']
+
+# Job fields requested per job; shared by per-job and tree discovery
+JOB_INFO_FIELDS = 'description,url,buildable,property[parameterDefinitions[*]],actions[parameterDefinitions[*]]'
+
+# Change markers requested while listing jobs when a discovery cache is used
+JOB_MARKER_FIELDS = 'color,lastBuild[number,timestamp]'
+
+# Definition fields also listed in per_job mode with a cache, so edits to a job's
+# parameters or description are noticed even when the job was not built since.
+# Together with the listed url they hold everything JOB_INFO_FIELDS requests.
+JOB_DEFINITION_FIELDS = 'description,buildable,property[parameterDefinitions[*]],actions[parameterDefinitions[*]]'
+
+# Map Jenkins parameter types to Kubiya types
+PARAMETER_TYPE_MAPPING = {
+    'boolean': 'bool',
+    'string': 'str',
+    'text': 'str',
+    'choice': 'str',
+    'password': 'str',
+    'file': 'str',
+}
+
+# Type and default information added to parameter descriptions
+PARAMETER_TYPE_INFO = {
+    'boolean': {
+        'display': 'Boolean value (true/false)',
+        'default': 'false',
+        'needs_type_info': True
+    },
+    'choice': {
+        'display': 'Selection from predefined values',
+        'default': None,
+        'needs_type_info': True
+    },
+    'password': {
+        'display': 'Secure text value',
+        'default': None,
+        'needs_type_info': True
+    },
+    'text': {
+        'display': 'Multi-line text',
+        'default': '',
+        'needs_type_info': True
+    },
+    'string': {
+        'display': 'Text value',
+        'default': '',
+        'needs_type_info': False
+    },
+    'file': {
+        'display': 'File content',
+        'default': None,
+        'needs_type_info': True
+    }
+}
+DEFAULT_PARAMETER_TYPE_INFO = {'display': '', 'default': '', 'needs_type_info': False}
 
 class JenkinsJobParser:
     """Parser for Jenkins jobs using direct HTTP requests and JSON API."""
@@ -19,40 +84,101 @@ class JenkinsJobParser:
         jenkins_url: str,
         username: str,
         api_token: str,
-        max_workers: int = 4
+        max_workers: int = 4,
+        discovery_mode: str = 'per_job',
+        tree_depth: int = 3,
+        tree_page_size: int = 500,
+        cache: Optional[DiscoveryCache] = None,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        adaptive_concurrency: bool = True,
+        latency_target: float = 2.0,
+        schema_cache: Optional[SchemaCache] = None,
+        description_compiler: Optional[DescriptionCompiler] = None,
+        shard_index: int = 0,
+        shard_count: int = 1,
+        slowest_jobs: int = 10,
+        metrics_json_path: Optional[str] = None,
+        metrics_prometheus_path: Optional[str] = None
     ):
         self.jenkins_url = jenkins_url.rstrip('/')
         self.username = username
         self.api_token = api_token
         self.max_workers = max_workers
+        self.discovery_mode = discovery_mode
+        self.tree_depth = max(1, tree_depth)
+        self.tree_page_size = max(1, tree_page_size)
+        self.cache = cache
+        self.schema_cache = schema_cache if schema_cache is not None else SchemaCache()
+        self.shared = SharedValues(username)
+        self.descriptions = description_compiler if description_compiler is not None else DescriptionCompiler()
+        self.shard_index = shard_index
+        self.shard_count = max(1, shard_count)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.limiter = AdaptiveLimiter(
+            max_limit=max_workers,
+            latency_target=latency_target,
+            enabled=adaptive_concurrency
+        )
+        self.slowest_jobs = slowest_jobs
+        self.metrics_json_path = metrics_json_path
+        self.metrics_prometheus_path = metrics_prometheus_path
+        self.metrics = DiscoveryMetrics(slowest_jobs, labels=self.metric_labels)
+        self.job_filter = JobFilter()
+        self.pruned_folders = 0
         self.warnings = []
         self.errors = []
         self.session = self._create_session()
 
     def _create_session(self) -> requests.Session:
         """Create and configure requests session with authentication."""
-        session = requests.Session()
-        auth = base64.b64encode(f"{self.username}:{self.api_token}".encode()).decode()
-        session.headers.update({
-            'Authorization': f'Basic {auth}',
-            'Content-Type': 'application/json',
-        })
-        return session
-
-    def _make_request(self, endpoint: str, method: str = 'GET', **kwargs) -> Optional[Dict[str, Any]]:
-        """Make HTTP request to Jenkins API."""
+        return create_session(self.username, self.api_token, pool_size=self.max_workers)
+
+    def _make_request(self, endpoint: str, method: str = 'GET', metric: str = 'other', **kwargs) -> Optional[Dict[str, Any]]:
+        """
+        Make HTTP request to Jenkins API, retrying throttled and transient failures.
+
+        Args:
+            endpoint: API endpoint, absolute or relative to the Jenkins URL
+            method: HTTP method
+            metric: Endpoint kind the request is recorded under in ``self.metrics``
+        """
         url = urljoin(self.jenkins_url, endpoint.lstrip('/'))
-        try:
-            response = self.session.request(
-                method=method,
-                url=url,
-                **kwargs
-            )
-            response.raise_for_status()
-            return response.json() if response.content else None
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Request failed for {url}: {str(e)}")
-            raise
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            started = time.monotonic()
+            throttled = False
+            try:
+                response = self.session.request(
+                    method=method,
+                    url=url,
+                    **kwargs
+                )
+                self.metrics.observe_request(metric, time.monotonic() - started, wire_size(response))
+                throttled = response.status_code in THROTTLE_STATUS_CODES
+                if response.status_code in RETRY_STATUS_CODES and attempt < self.max_retries:
+                    delay = backoff_delay(attempt, self.backoff_factor, retry_after=response.headers.get('Retry-After'))
+                    self.metrics.record_retry(metric, str(response.status_code))
+                else:
+                    response.raise_for_status()
+                    return response.json() if response.content else None
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt >= self.max_retries:
+                    logger.error(f"Request failed for {url}: {str(e)}")
+                    raise
+                delay = backoff_delay(attempt, self.backoff_factor)
+                self.metrics.record_retry(metric, type(e).__name__)
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Request failed for {url}: {str(e)}")
+                raise
+            finally:
+                self.limiter.release(time.monotonic() - started, throttled)
+
+            attempt += 1
+            logger.warning(f"Retrying {url} in {delay:.2f}s (attempt {attempt}/{self.max_retries})")
+            time.sleep(delay)
 
     def _sanitize_name(self, name: str, max_length: int = 50) -> str:
         """
@@ -98,7 +224,7 @@ class JenkinsJobParser:
         try:
             # Use the JSON API to get job config
             config_endpoint = f'job/{job_name}/config'
-            response = self._make_request(config_endpoint)
+            response = self._make_request(config_endpoint, metric='config')
             
             if not response:
                 logger.warning(f"No config found for job {job_name}")
@@ -146,27 +272,25 @@ class JenkinsJobParser:
             logger.warning(f"Error extracting default value: {str(e)}")
             return None
 
-    def _process_single_job(self, job_name: str, job_url: str) -> Optional[Dict[str, Any]]:
-        """Process a single Jenkins job."""
+    def _process_single_job(self, job_name: str, job_url: str, job_info: Optional[Dict[str, Any]] = None) -> Optional[JobInfo]:
+        """
+        Process a single Jenkins job.
+
+        Args:
+            job_name: Full name of the job
+            job_url: Job URL, used to fetch the job info when not provided
+            job_info: Job payload already fetched during tree discovery (optional)
+        """
+        started = time.monotonic()
         try:
-            # Get job info from API
-            info_endpoint = f'{job_url}/api/json?tree=description,url,buildable,property[parameterDefinitions[*]],actions[parameterDefinitions[*]]'
-            job_info = self._make_request(info_endpoint)
+            # Get job info from API unless tree discovery already fetched it
+            if job_info is None:
+                info_endpoint = f'{job_url}/api/json?tree={JOB_INFO_FIELDS}'
+                job_info = self._make_request(info_endpoint, metric='job')
             
             if not job_info:
                 raise Exception("Failed to get job information")
 
-            # Extract parameters from job properties
-            parameters = {}
-            param_count = {
-                'boolean': 0,
-                'string': 0,
-                'text': 0,
-                'choice': 0,
-                'password': 0,
-                'file': 0
-            }
-
             # Look for parameters in both properties and actions
             param_sources = []
             
@@ -180,144 +304,25 @@ class JenkinsJobParser:
                 if 'parameterDefinitions' in action:
                     param_sources.extend(action['parameterDefinitions'])
 
-            # Process parameters
-            for param in param_sources:
-                param_class = param.get('_class', '')
-                param_type = param_class.split('.')[-1].replace('ParameterDefinition', '').lower()
-                param_count[param_type] = param_count.get(param_type, 0) + 1
-                
-                # Get parameter name
-                param_name = (
-                    param.get('name') or 
-                    param.get('defaultParameterValue', {}).get('name') or
-                    f"param_{param_type}_{param_count[param_type]}"
+            # Identical definition lists (e.g. jobs from one template) share a compiled schema
+            with self.metrics.phase('parameters'):
+                schema = self.schema_cache.get_or_compile(
+                    param_sources, lambda definitions: self._compile_parameters(definitions, job_name)
                 )
-                
-                if param_name.startswith('param_'):
-                    logger.warning(f"Using generated name {param_name} for parameter in job {job_name}")
-
-                # Map Jenkins parameter types to Kubiya types
-                type_mapping = {
-                    'boolean': 'bool',
-                    'string': 'str',
-                    'text': 'str',
-                    'choice': 'str',
-                    'password': 'str',
-                    'file': 'str',
-                }
-
-                # Build description parts list
-                description_parts = []
-                
-                # Add main description first, if available
-                if param.get('description'):
-                    description_parts.append(str(param.get('description')))
-
-                # Get default value
-                default_value = self._extract_default_value(param)
-                logger.debug(f"Extracted default value for {param_name}: {default_value}")
-
-                # Add type and default information
-                type_info = {
-                    'boolean': {
-                        'display': 'Boolean value (true/false)',
-                        'default': 'false',
-                        'needs_type_info': True
-                    },
-                    'choice': {
-                        'display': 'Selection from predefined values',
-                        'default': None,
-                        'needs_type_info': True
-                    },
-                    'password': {
-                        'display': 'Secure text value',
-                        'default': None,
-                        'needs_type_info': True
-                    },
-                    'text': {
-                        'display': 'Multi-line text',
-                        'default': '',
-                        'needs_type_info': True
-                    },
-                    'string': {
-                        'display': 'Text value',
-                        'default': '',
-                        'needs_type_info': False
-                    },
-                    'file': {
-                        'display': 'File content',
-                        'default': None,
-                        'needs_type_info': True
-                    }
-                }
-
-                # Only add type information for complex parameters
-                param_type_info = type_info.get(param_type, {'display': '', 'default': '', 'needs_type_info': False})
-                if param_type_info['needs_type_info']:
-                    description_parts.append(f"Type: {param_type_info['display']}")
-
-                # Add choices if available
-                if 'choices' in param:
-                    choices_str = ', '.join(f'"{choice}"' for choice in param['choices'])
-                    description_parts.append(f"Allowed values: [{choices_str}]")
-
-                # Add default value to description only if it's meaningful
-                if default_value is not None and str(default_value).strip():
-                    if param_type == 'boolean':
-                        default_str = 'true' if str(default_value).lower() == 'true' else 'false'
-                        description_parts.append(f"Default: {default_str}")
-                    elif isinstance(default_value, (dict, list)):
-                        default_str = json.dumps(default_value)
-                        description_parts.append(f"Default: {default_str}")
-                    elif param_type_info['needs_type_info']:
-                        description_parts.append(f"Default: {str(default_value)}")
-
-                # Join description parts with newlines
-                description = '\n'.join(part.strip() for part in description_parts if part.strip())
-
-                param_config = {
-                    "name": self._sanitize_name(param_name),
-                    "original_name": param_name,
-                    "type": type_mapping.get(param_type, 'str'),
-                    "description": description,
-                    "required": default_value is None or not str(default_value).strip(),
-                }
-
-                # Add default value to parameter config
-                if default_value is not None and str(default_value).strip():
-                    if param_type == 'boolean':
-                        param_config['default'] = str(default_value).lower() == 'true'
-                    elif isinstance(default_value, (dict, list)):
-                        param_config['default'] = json.dumps(default_value)
-                    else:
-                        param_config['default'] = str(default_value)
-
-                # Add choices if available
-                if 'choices' in param:
-                    param_config['choices'] = param['choices']
-
-                parameters[param_config['name']] = param_config
-                logger.debug(f"Added parameter config: {param_config}")
-
-            # Add job URL to description
-            job_description = job_info.get('description', '')
-            if job_description:
-                job_description += f"\n\nJenkins Job URL: {self.jenkins_url}/job/{job_name}"
-            else:
-                job_description = f"Jenkins Job URL: {self.jenkins_url}/job/{job_name}"
-
-            result = {
-                "name": job_name,
-                "description": job_description,
-                "parameters": parameters,
-                "url": job_info.get('url', ''),
-                "buildable": job_info.get('buildable', True),
-                "type": self._determine_job_type(job_info),
-                "health": self._get_job_health(job_info),
-                "auth": {
-                    "username": self.username
-                }
-            }
+            parameters = schema.parameters
+
+            # The job URL is appended to the description when it is read, see JobInfo
+            result = JobInfo(
+                name=job_name,
+                raw_description=job_info.get('description', ''),
+                parameters=parameters,
+                url=job_info.get('url', ''),
+                buildable=job_info.get('buildable', True),
+                type=self._determine_job_type(job_info),
+                health=self._get_job_health(job_info),
+                auth=self.shared.auth,
+                jenkins_url=self.jenkins_url
+            )
             
             logger.debug(f"Processed job {job_name} with parameters: {parameters}")
             return result
@@ -326,108 +331,101 @@ class JenkinsJobParser:
             logger.error(f"Failed to process job {job_name}: {str(e)}")
             return None
 
-    def _extract_parameters_from_properties(self, properties: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Extract parameters from job properties using JSON API."""
-        parameters = {}
-        
-        for prop in properties:
-            # Handle ParametersDefinitionProperty
-            if 'parameterDefinitions' in prop:
-                for param in prop['parameterDefinitions']:
-                    param_type = param.get('_class', '').split('.')[-1]
-                    param_name = param.get('name', '')
-                    
-                    param_config = {
-                        "type": "str",  # All parameters are strings in Kubiya
-                        "name": param_name,
-                        "description": self._enhance_parameter_description(
-                            param.get('description', ''),
-                            param_type,
-                            param.get('defaultValue'),
-                            param.get('choices', []) if 'choices' in param else None
-                        ),
-                        "required": True,  # Jenkins parameters are typically required
-                        "default": param.get('defaultValue')
-                    }
-                    
-                    parameters[param_name] = param_config
-        
-        return parameters
+        finally:
+            elapsed = time.monotonic() - started
+            self.metrics.add_phase('processing', elapsed)
+            self.metrics.record_job(job_name, elapsed)
 
-    def _enhance_parameter_description(
-        self, description: str, param_type: str, default_value: Any, choices: Optional[List[str]] = None
-    ) -> str:
-        """Enhance parameter description with type information and examples."""
-        enhanced_desc = description or "No description provided"
-        
-        # Add type-specific information
-        type_info = {
-            "StringParameterDefinition": {
-                "info": "Text input",
-                "example": "example-value"
-            },
-            "TextParameterDefinition": {
-                "info": "Multi-line text input",
-                "format": "Use JSON string format for multi-line text, e.g., \"line1\\nline2\"",
-                "example": '{"content": "line1\\nline2"}'
-            },
-            "BooleanParameterDefinition": {
-                "info": "Boolean value",
-                "format": "Use 'true' or 'false' (case-insensitive)",
-                "example": "true"
-            },
-            "ChoiceParameterDefinition": {
-                "info": "Select from predefined choices",
-                "format": "Provide one of the allowed values",
-                "example": "choice1"
-            },
-            "CredentialsParameterDefinition": {
-                "info": "Jenkins credentials ID",
-                "format": "Provide the credentials ID string",
-                "example": "jenkins-cred-id"
-            },
-            "GitParameterDefinition": {
-                "info": "Git reference",
-                "format": "Provide branch name, tag, or commit hash",
-                "example": "main"
-            },
-            "FileParameterDefinition": {
-                "info": "File content",
-                "format": "Provide file content as JSON string",
-                "example": '{"content": "file contents here"}'
-            },
-            "ListParameterDefinition": {
-                "info": "List of values",
-                "format": "Provide as JSON array string",
-                "example": '["item1", "item2"]'
-            },
-            "MapParameterDefinition": {
-                "info": "Key-value pairs",
-                "format": "Provide as JSON object string",
-                "example": '{"key1": "value1", "key2": "value2"}'
-            }
+    def _compile_parameters(self, param_sources: List[Dict[str, Any]], job_name: str) -> Dict[str, Any]:
+        """
+        Compile parameter definitions into the Kubiya ``parameters`` dict.
+
+        Args:
+            param_sources: Parameter definitions from job properties and actions
+            job_name: Name of the first job using these definitions, for logging
+        """
+        parameters = {}
+        param_count = {
+            'boolean': 0,
+            'string': 0,
+            'text': 0,
+            'choice': 0,
+            'password': 0,
+            'file': 0
         }
-        
-        if param_type in type_info:
-            info = type_info[param_type]
-            enhanced_desc += f"\n\nType: {info['info']}"
-            if 'format' in info:
-                enhanced_desc += f"\nFormat: {info['format']}"
-            enhanced_desc += f"\nExample: {info['example']}"
-            
-            # Add choices if available
-            if choices:
-                choices_str = ', '.join(f'"{choice}"' for choice in choices)
-                enhanced_desc += f"\nAllowed values: [{choices_str}]"
-            
-            if default_value:
-                if isinstance(default_value, (dict, list)):
+
+        # Process parameters
+        for param in param_sources:
+            param_class = param.get('_class', '')
+            param_type = param_class.split('.')[-1].replace('ParameterDefinition', '').lower()
+            param_count[param_type] = param_count.get(param_type, 0) + 1
+
+            # Get parameter name
+            param_name = (
+                param.get('name') or 
+                param.get('defaultParameterValue', {}).get('name') or
+                f"param_{param_type}_{param_count[param_type]}"
+            )
+
+            if param_name.startswith('param_'):
+                logger.warning(f"Using generated name {param_name} for parameter in job {job_name}")
+
+            # Type, choice and default lines follow the Jenkins description
+            description_details = []
+
+            # Get default value
+            default_value = self._extract_default_value(param)
+            logger.debug(f"Extracted default value for {param_name}: {default_value}")
+
+            # Only add type information for complex parameters; the allowed
+            # values already describe a choice parameter
+            param_type_info = PARAMETER_TYPE_INFO.get(param_type, DEFAULT_PARAMETER_TYPE_INFO)
+            if param_type_info['needs_type_info'] and 'choices' not in param:
+                description_details.append(f"Type: {param_type_info['display']}")
+
+            # Add choices if available, long lists are shortened
+            if 'choices' in param:
+                description_details.append(self.descriptions.format_choices(param['choices']))
+
+            # Add default value to description only if it's meaningful
+            if default_value is not None and str(default_value).strip():
+                if param_type == 'boolean':
+                    default_str = 'true' if str(default_value).lower() == 'true' else 'false'
+                    description_details.append(f"Default: {default_str}")
+                elif isinstance(default_value, (dict, list)):
                     default_str = json.dumps(default_value)
+                    description_details.append(f"Default: {default_str}")
+                elif param_type_info['needs_type_info']:
+                    description_details.append(f"Default: {str(default_value)}")
+
+            # Clean the description and fit it to the parameter description budget
+            description = self.descriptions.parameter_description(param_name, param.get('description'), description_details)
+
+            param_config = {
+                "name": shared_string(self._sanitize_name(param_name)),
+                "original_name": shared_string(param_name),
+                "type": PARAMETER_TYPE_MAPPING.get(param_type, 'str'),
+                "description": description,
+                "required": default_value is None or not str(default_value).strip(),
+            }
+
+            # Add default value to parameter config
+            if default_value is not None and str(default_value).strip():
+                if param_type == 'boolean':
+                    param_config['default'] = str(default_value).lower() == 'true'
+                elif isinstance(default_value, (dict, list)):
+                    param_config['default'] = json.dumps(default_value)
                 else:
-                    default_str = str(default_value)
-                enhanced_desc += f"\nDefault: {default_str}"
+                    param_config['default'] = str(default_value)
+
+            # Add choices if available
+            if 'choices' in param:
+                param_config['choices'] = [shared_string(choice) for choice in param['choices']]
+
+            parameters[param_config['name']] = param_config
+            logger.debug(f"Added parameter config: {param_config}")
 
-        return enhanced_desc
+        return parameters
 
     def _determine_job_type(self, job_info: Dict[str, Any]) -> str:
         """Determine the type of Jenkins job."""
@@ -447,52 +445,94 @@ class JenkinsJobParser:
         try:
             health_report = job_info.get('healthReport', [])
             if health_report:
-                return {
-                    "score": health_report[0].get('score', 0),
-                    "description": health_report[0].get('description', '')
-                }
+                return self.shared.health(
+                    health_report[0].get('score', 0),
+                    health_report[0].get('description', '')
+                )
             return None
         except Exception:
             return None
 
-    def _get_all_jobs_recursive(self, url: str = None) -> List[Dict[str, str]]:
-        """Recursively get all jobs from Jenkins, including those in folders."""
+    def _get_all_jobs_recursive(self, url: str = None, folder_name: str = '') -> List[Dict[str, str]]:
+        """Recursively get all jobs from Jenkins, including those in folders the job filter can match."""
+        if url is None:
+            jobs, folders = self._list_shard_root()
+        else:
+            jobs, folders = self._list_folder(url, folder_name)
+        for folder_url, sub_folder_name in folders:
+            jobs.extend(self._get_all_jobs_recursive(folder_url, sub_folder_name))
+        return jobs
+
+    def _keep_folder(self, folder_name: str) -> bool:
+        """Return whether a folder can hold selected jobs, counting the folders pruned from traversal."""
+        if self.job_filter.prunes(folder_name):
+            logger.debug(f"Skipping folder that cannot match the job filter: {folder_name}")
+            self.pruned_folders += 1
+            return False
+        return True
+
+    def _list_folder(self, url: str, folder_name: str = '') -> Tuple[List[Dict[str, str]], List[Tuple[str, str]]]:
+        """
+        List the jobs and the sub-folders directly inside a folder.
+
+        Args:
+            url: API URL of the folder
+            folder_name: Full name of the folder, '' for the root. Folder listings do not
+                include ``fullName``, so job and sub-folder full names are derived from it.
+
+        Returns:
+            Tuple of (jobs, folders) where folders lists ``(api_url, full_name)`` of the
+            sub-folders that can hold jobs selected by the job filter
+        """
+        started = time.monotonic()
         try:
-            if url is None:
-                url = f"{self.jenkins_url}/api/json"
-            
             logger.debug(f"Fetching jobs from: {url}")
-            response = self._make_request(url)
+            if self.cache is not None:
+                # Request change markers so unchanged jobs can be served from the cache
+                response = self._make_request(
+                    f"{url}?tree=jobs[_class,name,url,{JOB_MARKER_FIELDS},{JOB_DEFINITION_FIELDS}]", metric='folder'
+                )
+            else:
+                response = self._make_request(url, metric='folder')
             
             if not response:
                 logger.warning(f"No response from {url}")
-                return []
+                return [], []
 
             jobs = []
+            folders = []
             for item in response.get('jobs', []):
                 try:
                     item_class = item.get('_class', '')
                     item_name = item.get('name', '')
                     item_url = item.get('url', '')
+                    full_name = item.get('fullName') or (f"{folder_name}/{item_name}" if folder_name else item_name)
                     
                     logger.debug(f"Processing item: {item_name} ({item_class})")
                     
                     # Handle different job types
-                    if any(job_type in item_class for job_type in ['WorkflowJob', 'FreeStyleProject', 'Pipeline']):
+                    if any(job_type in item_class for job_type in JOB_CLASSES):
                         # Regular job
-                        jobs.append({
+                        job = {
                             'name': item_name,
-                            'full_name': item.get('fullName', item_name),
+                            'full_name': full_name,
                             'url': item_url,
-                            'class': item_class
-                        })
+                            'class': item_class,
+                            'color': item.get('color'),
+                            'last_build': item.get('lastBuild')
+                        }
+                        # With the cache the listing holds the job definition, so a changed
+                        # job is processed without a request of its own
+                        if self.cache is not None:
+                            job['data'] = item
+                        jobs.append(job)
                         logger.debug(f"Added job: {item_name}")
                         
-                    elif any(folder_type in item_class for folder_type in ['Folder', 'WorkflowMultiBranch', 'OrganizationFolder']):
-                        # Folder or similar container - recurse into it
-                        logger.info(f"Recursing into folder: {item_name}")
-                        sub_jobs = self._get_all_jobs_recursive(f"{item_url}api/json")
-                        jobs.extend(sub_jobs)
+                    elif any(folder_type in item_class for folder_type in FOLDER_CLASSES):
+                        # Folder or similar container - recurse into it unless the filter rules it out
+                        if self._keep_folder(full_name):
+                            logger.info(f"Recursing into folder: {item_name}")
+                            folders.append((f"{item_url}api/json", full_name))
                         
                 except Exception as e:
                     error_msg = f"Error processing job {item_name}: {str(e)}"
@@ -500,85 +540,286 @@ class JenkinsJobParser:
                     self.errors.append(error_msg)
                     continue
 
-            return jobs
+            return jobs, folders
 
         except Exception as e:
             error_msg = f"Failed to get jobs from {url}: {str(e)}"
             logger.error(error_msg)
             self.errors.append(error_msg)
-            return []
+            return [], []
+
+        finally:
+            self.metrics.add_phase('traversal', time.monotonic() - started)
+
+    def _list_shard_root(self) -> Tuple[List[Dict[str, str]], List[Tuple[str, str]]]:
+        """List the top-level jobs and folders, keeping those assigned to this parser's shard."""
+        jobs, folders = self._list_folder(f"{self.jenkins_url}/api/json")
+        if self.shard_count > 1:
+            jobs = [job for job in jobs if shard_for(job['url'], self.shard_count) == self.shard_index]
+            folders = [
+                (folder_url, folder_name) for folder_url, folder_name in folders
+                if shard_for(folder_url[:-len('api/json')], self.shard_count) == self.shard_index
+            ]
+            logger.info(
+                f"Shard {self.shard_index + 1}/{self.shard_count} owns {len(jobs)} top-level jobs "
+                f"and {len(folders)} top-level folders"
+            )
+        return jobs, folders
 
-    def get_jobs(self, job_include_filter: Optional[List[str]] = None, job_exclude_filter: Optional[List[str]] = None) -> Tuple[Dict[str, Any], List[str], List[str]]:
+    def _build_tree_query(self, start: int = 0) -> str:
+        """
+        Build a nested ``jobs[...]`` tree expression reaching ``tree_depth`` levels.
 
-        if job_include_filter is None:
-            job_include_filter = []
-        if job_exclude_filter is None:
-            job_exclude_filter = []
+        Args:
+            start: Offset of the first item requested at the outermost level
+        """
+        fields = f"_class,name,fullName,{JOB_INFO_FIELDS}"
+        if self.cache is not None:
+            fields += f",{JOB_MARKER_FIELDS}"
+        query = f"jobs[{fields}]{{0,{self.tree_page_size}}}"
+        for _ in range(self.tree_depth - 1):
+            query = f"jobs[{fields},{query}]{{0,{self.tree_page_size}}}"
+        # Re-range the outermost level for pagination
+        return query[:query.rindex('{')] + f"{{{start},{start + self.tree_page_size}}}"
+
+    def _get_all_jobs_tree(self, url: str = None, start: int = 0) -> List[Dict[str, Any]]:
+        """
+        Get all jobs and their definitions using nested tree queries.
+
+        A single request returns names, classes, URLs, descriptions and parameter
+        definitions for ``tree_depth`` levels of folders. Only folders deeper than
+        that, or holding more than ``tree_page_size`` items, need extra requests.
+        """
+        if url is None and self.shard_count > 1:
+            # Walk only the top-level folders owned by this shard
+            jobs, folders = self._list_shard_root()
+            for folder_url, _ in folders:
+                jobs.extend(self._get_all_jobs_tree(folder_url[:-len('api/json')]))
+            return jobs
+
+        jobs, subtrees = self._list_tree(url, start)
+        for subtree_url, subtree_start in subtrees:
+            jobs.extend(self._get_all_jobs_tree(subtree_url, subtree_start))
+        return jobs
+
+    def _list_tree(self, url: str = None, start: int = 0) -> Tuple[List[Dict[str, Any]], List[Tuple[str, int]]]:
+        """
+        Fetch one page of the job tree.
+
+        Returns:
+            Tuple of (jobs, subtrees) where subtrees lists the ``(folder_url, start)``
+            pages that were truncated and still need to be fetched
+        """
+        if url is None:
+            url = f"{self.jenkins_url}/"
+
+        endpoint = f"{url}api/json?tree={self._build_tree_query(start)}"
+        with self.metrics.phase('traversal'):
+            try:
+                logger.debug(f"Fetching job tree from: {endpoint}")
+                response = self._make_request(endpoint, metric='tree')
+            except Exception as e:
+                error_msg = f"Failed to get jobs from {url}: {str(e)}"
+                logger.error(error_msg)
+                self.errors.append(error_msg)
+                return [], []
+
+            items = response.get('jobs', []) if response else []
+            jobs = []
+            subtrees = []
+            self._collect_tree_items(items, jobs, subtrees)
+
+        # A full page means the server may hold more items at this level
+        if len(items) >= self.tree_page_size:
+            subtrees.append((url, start + self.tree_page_size))
+        return jobs, subtrees
+
+    def _collect_tree_items(
+        self, items: List[Dict[str, Any]], jobs: List[Dict[str, Any]], subtrees: List[Tuple[str, int]]
+    ) -> None:
+        """Flatten the items of a tree response into job entries and truncated subtrees."""
+        for item in items:
+            item_class = item.get('_class', '')
+            item_name = item.get('name', '')
+            item_url = item.get('url', '')
+            try:
+                if any(job_type in item_class for job_type in JOB_CLASSES):
+                    job = {
+                        'name': item_name,
+                        'full_name': item.get('fullName', item_name),
+                        'url': item_url,
+                        'class': item_class,
+                        'color': item.get('color'),
+                        'last_build': item.get('lastBuild')
+                    }
+                    # Entries without definitions are processed with a per-job request
+                    if 'property' in item or 'actions' in item:
+                        job['data'] = item
+                    jobs.append(job)
+
+                elif any(folder_type in item_class for folder_type in FOLDER_CLASSES):
+                    if not self._keep_folder(item.get('fullName', item_name)):
+                        continue
+                    sub_items = item.get('jobs')
+                    if sub_items is None:
+                        # Deeper than tree_depth - query the subtree from this folder
+                        logger.info(f"Found truncated subtree: {item_name}")
+                        subtrees.append((item_url, 0))
+                        continue
+
+                    self._collect_tree_items(sub_items, jobs, subtrees)
+                    if len(sub_items) >= self.tree_page_size:
+                        # Folder holds more than one page - fetch the remaining pages
+                        logger.info(f"Paginating folder: {item_name}")
+                        subtrees.append((item_url, self.tree_page_size))
+
+            except Exception as e:
+                error_msg = f"Error processing job {item_name}: {str(e)}"
+                logger.error(error_msg)
+                self.errors.append(error_msg)
+
+    def _select_jobs(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Apply the include and exclude filters to discovered jobs."""
+        if not self.job_filter.active:
+            return jobs
+        return [job for job in jobs if self.job_filter.matches(job['full_name'])]
+
+    def _log_pruning(self) -> None:
+        if self.pruned_folders:
+            logger.info(f"Skipped {self.pruned_folders} folders that cannot hold jobs selected by the job filter")
+
+    def _get_cached_job(self, job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return cached job info if the job is unchanged since it was cached."""
+        if self.cache is None:
+            return None
+        job['fingerprint'] = job_fingerprint(job, self.descriptions.signature)
+        cached = self.cache.get(job['url'], job['fingerprint'])
+        if cached is not None:
+            # Unchanged jobs are not processed, so their listed definition is not needed
+            job.pop('data', None)
+        # Entries loaded from disk use the plain dict layout
+        if cached is not None and not isinstance(cached, JobInfo):
+            cached = JobInfo.from_dict(cached, self.jenkins_url, self.shared)
+        return cached
+
+    def _store_cached_job(self, job: Dict[str, Any], job_info: Dict[str, Any]) -> None:
+        """Store processed job info in the discovery cache."""
+        if self.cache is not None:
+            self.cache.put(job['url'], job.get('fingerprint') or job_fingerprint(job, self.descriptions.signature), job_info)
+            job.pop('data', None)
+
+    @property
+    def metric_labels(self) -> Dict[str, str]:
+        """Labels of the exported metrics; shards label their metrics with their index."""
+        return {'shard': str(self.shard_index)} if self.shard_count > 1 else {}
+
+    def _export_metrics(self) -> None:
+        """Log the discovery metrics and write them to the configured export paths."""
+        self.metrics.finish()
+        logger.info(self.metrics.summary())
+        self.metrics.export(json_path=self.metrics_json_path, prometheus_path=self.metrics_prometheus_path)
+
+    def iter_jobs(self, job_include_filter: Optional[List[str]] = None, job_exclude_filter: Optional[List[str]] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Yield ``(job_name, job_info)`` for each Jenkins job as soon as it has been processed.
+
+        At most ``2 * max_workers`` jobs are in flight, so results do not pile up when
+        the consumer is slower than discovery. Warnings and errors are collected in
+        ``self.warnings`` and ``self.errors``.
+        """
+        job_include_filter = job_include_filter or []
+        job_exclude_filter = job_exclude_filter or []
+        processed = 0
+        self.metrics = DiscoveryMetrics(self.slowest_jobs, labels=self.metric_labels)
+        self.job_filter = JobFilter(job_include_filter, job_exclude_filter)
+        self.pruned_folders = 0
 
-        """Get all Jenkins jobs and their parameters."""
-        jobs_info = {}
-        
         try:
             # Get all jobs recursively
             logger.info("Starting Jenkins job discovery...")
-            all_jobs = self._get_all_jobs_recursive()
+            if self.discovery_mode == 'tree':
+                all_jobs = self._get_all_jobs_tree()
+            else:
+                all_jobs = self._get_all_jobs_recursive()
             
             if not all_jobs:
                 logger.warning("No jobs found in Jenkins")
                 self.warnings.append("No jobs were found in Jenkins server")
-                return {}, self.warnings, self.errors
+                return
 
-            logger.info(f"Found {len(all_jobs)} total jobs: {all_jobs}")
+            logger.info(f"Found {len(all_jobs)} total jobs: {[job['full_name'] for job in all_jobs]}")
+            self._log_pruning()
             
             # Filter jobs if needed
-            jobs_to_process = all_jobs
-
-            if job_include_filter:
-                jobs_to_process = [
-                job for job in all_jobs
-                if job['full_name'] in job_include_filter
-            ]
-
-            if job_exclude_filter:
-                jobs_to_process = [
-                    job for job in jobs_to_process
-                    if job['full_name'] not in job_exclude_filter
-                ]
+            jobs_to_process = self._select_jobs(all_jobs)
 
             if job_include_filter and not jobs_to_process:
                 warning_msg = f"No jobs matched the filter: {job_include_filter}"
                 logger.warning(warning_msg)
                 self.warnings.append(warning_msg)
-                return {}, self.warnings, self.errors
+                return
 
             logger.info(f"Processing {len(jobs_to_process)} jobs after filtering")
 
-            # Process jobs in parallel
+            # Serve unchanged jobs from the discovery cache
+            if self.cache is not None:
+                pending_jobs = []
+                for job in jobs_to_process:
+                    cached_info = self._get_cached_job(job)
+                    if cached_info is not None:
+                        processed += 1
+                        yield job['full_name'], cached_info
+                    else:
+                        pending_jobs.append(job)
+                logger.info(f"Discovery cache: {self.cache.hits} unchanged, {self.cache.misses} to fetch")
+                jobs_to_process = pending_jobs
+
+            # Process jobs in parallel, keeping a bounded number of jobs in flight
             with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                future_to_job = {
-                    executor.submit(self._process_single_job, job['full_name'], job['url']): job
-                    for job in jobs_to_process
-                }
-
-                for future in as_completed(future_to_job):
-                    job = future_to_job[future]
-                    try:
-                        job_info = future.result()
+                remaining_jobs = iter(jobs_to_process)
+                future_to_job = {}
+                while True:
+                    for job in remaining_jobs:
+                        future_to_job[executor.submit(self._process_single_job, job['full_name'], job['url'], job.get('data'))] = job
+                        if len(future_to_job) >= self.max_workers * 2:
+                            break
+                    if not future_to_job:
+                        break
+
+                    done, _ = wait(future_to_job, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        job = future_to_job.pop(future)
+                        try:
+                            job_info = future.result()
+                        except Exception as e:
+                            error_msg = f"Failed to process job {job['full_name']}: {str(e)}"
+                            logger.error(error_msg)
+                            self.errors.append(error_msg)
+                            continue
                         if job_info:
-                            jobs_info[job['full_name']] = job_info
+                            self._store_cached_job(job, job_info)
                             logger.info(f"Successfully processed job: {job['full_name']}")
-                    except Exception as e:
-                        error_msg = f"Failed to process job {job['full_name']}: {str(e)}"
-                        logger.error(error_msg)
-                        self.errors.append(error_msg)
+                            processed += 1
+                            yield job['full_name'], job_info
 
         except Exception as e:
             error_msg = f"Failed to get jobs: {str(e)}"
             logger.error(error_msg)
             self.errors.append(error_msg)
 
-        if not jobs_info and not self.errors:
+        finally:
+            if self.cache is not None:
+                self.cache.save()
+            # Also export when discovery stops early, e.g. no jobs or no filter match
+            logger.info(self.schema_cache.summary())
+            self._export_metrics()
+
+        if not processed and not self.errors:
             self.errors.append("No jobs were found or all jobs failed to process")
 
-        logger.info(f"Completed job discovery. Found {len(jobs_info)} valid jobs")
-        return jobs_info, self.warnings, self.errors
\ No newline at end of file
+        logger.info(f"Completed job discovery. Found {processed} valid jobs")
+
+    def get_jobs(self, job_include_filter: Optional[List[str]] = None, job_exclude_filter: Optional[List[str]] = None) -> Tuple[Dict[str, Any], List[str], List[str]]:
+        """Get all Jenkins jobs and their parameters."""
+        jobs_info = dict(self.iter_jobs(job_include_filter, job_exclude_filter))
+        return jobs_info, self.warnings, self.errors
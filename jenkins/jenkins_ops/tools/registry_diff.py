@@ -0,0 +1,64 @@
+import logging
+import threading
+from typing import Dict, Any, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Registry namespace holding the Jenkins job tools
+REGISTRY_NAMESPACE = "jenkins"
+
+def registered_tools(tool_registry) -> Dict[str, Any]:
+    """Return the live mapping of tool name to tool for the Jenkins namespace."""
+    return tool_registry.tools.setdefault(REGISTRY_NAMESPACE, {})
+
+def registered_hash(tool: Any) -> Optional[str]:
+    """Return the content hash a tool was created with, or None for tools created without one."""
+    return (getattr(tool, 'metadata', None) or {}).get('config_sha256')
+
+class RegistryChanges:
+    """
+    Counts of the registry changes made by one sync.
+
+    Tools whose content hash is unchanged are kept as registered; only
+    added and changed tools are registered again, and tools of jobs that
+    disappeared are unregistered. Thread safe, since controllers are
+    synced concurrently.
+    """
+
+    def __init__(self):
+        self.added = 0
+        self.changed = 0
+        self.unchanged = 0
+        self.removed = 0
+        self._lock = threading.Lock()
+
+    def record(self, change: str, count: int = 1) -> None:
+        with self._lock:
+            setattr(self, change, getattr(self, change) + count)
+
+    def summary(self) -> str:
+        return (
+            f"Tool registry sync: {self.added} added, {self.changed} changed, "
+            f"{self.unchanged} unchanged, {self.removed} removed"
+        )
+
+def remove_stale_tools(
+    registry: Dict[str, Any],
+    current: Iterable[str],
+    prefix: str = '',
+    changes: Optional[RegistryChanges] = None
+) -> int:
+    """
+    Unregister the tools under ``prefix`` whose names are not in ``current``.
+
+    ``prefix`` limits the removal to one controller's namespace, so the
+    tools of controllers that were not synced are left alone.
+    """
+    current = set(current)
+    stale = [name for name in registry if name.startswith(prefix) and name not in current]
+    for name in stale:
+        del registry[name]
+        logger.info(f"Unregistered tool of removed job: {name}")
+    if changes is not None and stale:
+        changes.record('removed', len(stale))
+    return len(stale)
@@ -0,0 +1,61 @@
+import hashlib
+import json
+import logging
+import threading
+from typing import Dict, Any, List, Callable
+
+logger = logging.getLogger(__name__)
+
+class ParameterSchema:
+    """
+    Compiled ``parameters`` dict shared by every job with identical parameter definitions.
+
+    Jobs reference ``parameters`` itself rather than a copy, so the dict and
+    its per-parameter configs must be treated as read-only.
+    """
+
+    def __init__(self, key: str, parameters: Dict[str, Any]):
+        self.key = key
+        self.parameters = parameters
+
+class SchemaCache:
+    """Cache of compiled parameter schemas keyed by a hash of their definitions."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._schemas: Dict[str, ParameterSchema] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def definitions_key(definitions: List[Dict[str, Any]]) -> str:
+        """Hash a parameter definition list independently of key order."""
+        return hashlib.sha1(json.dumps(definitions, sort_keys=True, default=str).encode()).hexdigest()
+
+    def get_or_compile(
+        self,
+        definitions: List[Dict[str, Any]],
+        compile_fn: Callable[[List[Dict[str, Any]]], Dict[str, Any]]
+    ) -> ParameterSchema:
+        """Return the schema for ``definitions``, compiling it with ``compile_fn`` on first use."""
+        key = self.definitions_key(definitions)
+        with self._lock:
+            schema = self._schemas.get(key)
+            if schema is not None:
+                self.hits += 1
+                return schema
+            self.misses += 1
+
+        # Compile outside the lock; a concurrent compile of the same key is harmless
+        schema = ParameterSchema(key, compile_fn(definitions))
+        with self._lock:
+            return self._schemas.setdefault(key, schema)
+
+    def summary(self) -> str:
+        return (
+            f"Parameter schema cache: {self.hits} hits, {self.misses} misses, "
+            f"{len(self._schemas)} compiled schemas"
+        )
+
+    def __len__(self) -> int:
+        return len(self._schemas)
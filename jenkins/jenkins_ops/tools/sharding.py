@@ -0,0 +1,171 @@
+import argparse
+import copy
+import json
+import logging
+import os
+import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+from .jobinfo import job_info_json
+
+logger = logging.getLogger(__name__)
+
+ShardResult = Tuple[Dict[str, Any], List[str], List[str]]
+
+def shard_key(item_url: str) -> str:
+    """Return the stable key of a top-level Jenkins item, independent of the controller host."""
+    return urlparse(item_url).path.rstrip('/')
+
+def shard_for(item_url: str, shard_count: int) -> int:
+    """Assign a top-level Jenkins item to one of ``shard_count`` shards."""
+    if shard_count <= 1:
+        return 0
+    return zlib.crc32(shard_key(item_url).encode()) % shard_count
+
+def shard_path(path: str, shard_index: int, shard_count: int) -> str:
+    """Give each shard its own cache and metrics files so shards never overwrite each other."""
+    root, ext = os.path.splitext(path)
+    return f"{root}.shard-{shard_index}-of-{shard_count}{ext}"
+
+def shard_config(config: Dict[str, Any], shard_index: int, shard_count: int) -> Dict[str, Any]:
+    """Return a copy of the Jenkins config for a single shard."""
+    config = copy.deepcopy(config)
+    cache_config = config.get('discovery', {}).get('cache')
+    if cache_config and cache_config.get('path'):
+        cache_config['path'] = shard_path(cache_config['path'], shard_index, shard_count)
+    metrics_config = config.get('discovery', {}).get('metrics') or {}
+    for key in ('json_path', 'prometheus_path'):
+        if metrics_config.get(key):
+            metrics_config[key] = shard_path(metrics_config[key], shard_index, shard_count)
+    return config
+
+def discover_shard(
+    config: Dict[str, Any],
+    shard_index: int,
+    shard_count: int,
+    job_include_filter: Optional[List[str]] = None,
+    job_exclude_filter: Optional[List[str]] = None
+) -> ShardResult:
+    """Discover the jobs of one shard. Runs in a worker process or in a shard pod."""
+    from . import create_parser
+
+    parser = create_parser(
+        shard_config(config, shard_index, shard_count), shard_index=shard_index, shard_count=shard_count
+    )
+    logger.info(f"Discovering shard {shard_index + 1}/{shard_count}")
+    return parser.get_jobs(job_include_filter=job_include_filter, job_exclude_filter=job_exclude_filter)
+
+def merge_results(results: Iterable[ShardResult]) -> ShardResult:
+    """
+    Merge the partial results of all shards into a single ``(jobs_info, warnings, errors)``.
+
+    Shards that found no jobs, or no jobs matching the filter, are expected
+    when there are more shards than top-level items, so their "no jobs"
+    messages are dropped once any shard found jobs.
+    """
+    jobs_info: Dict[str, Any] = {}
+    warnings: List[str] = []
+    errors: List[str] = []
+    for shard_jobs, shard_warnings, shard_errors in results:
+        for job_name, job_info in shard_jobs.items():
+            if job_name in jobs_info:
+                warnings.append(f"Job {job_name} was discovered by more than one shard")
+            jobs_info[job_name] = job_info
+        warnings.extend(warning for warning in shard_warnings if warning not in warnings)
+        errors.extend(error for error in shard_errors if error not in errors)
+
+    if jobs_info:
+        warnings = [
+            warning for warning in warnings
+            if warning != "No jobs were found in Jenkins server" and not warning.startswith("No jobs matched the filter: ")
+        ]
+        errors = [error for error in errors if error != "No jobs were found or all jobs failed to process"]
+    return jobs_info, warnings, errors
+
+def run_shards(
+    config: Dict[str, Any],
+    shard_count: int,
+    job_include_filter: Optional[List[str]] = None,
+    job_exclude_filter: Optional[List[str]] = None,
+    max_processes: Optional[int] = None
+) -> ShardResult:
+    """Discover all shards in local worker processes and merge their results."""
+    results = []
+    with ProcessPoolExecutor(max_workers=max_processes or shard_count) as executor:
+        futures = [
+            executor.submit(discover_shard, config, shard_index, shard_count, job_include_filter, job_exclude_filter)
+            for shard_index in range(shard_count)
+        ]
+        for shard_index, future in enumerate(futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                error_msg = f"Failed to discover shard {shard_index + 1}/{shard_count}: {str(e)}"
+                logger.error(error_msg)
+                results.append(({}, [], [error_msg]))
+    return merge_results(results)
+
+def load_result(path: str) -> ShardResult:
+    with open(path) as f:
+        data = json.load(f)
+    return data.get('jobs', {}), data.get('warnings', []), data.get('errors', [])
+
+def save_result(path: str, result: ShardResult) -> None:
+    jobs_info, warnings, errors = result
+    with open(path, 'w') as f:
+        json.dump({'jobs': jobs_info, 'warnings': warnings, 'errors': errors}, f, default=job_info_json)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run a single shard, e.g. from one pod of a Job, or merge shard outputs.
+
+    Usage:
+        python -m jenkins_ops.tools.sharding discover --config jenkins.json --shard-index 0 --shard-count 4 --output shard-0.json
+        python -m jenkins_ops.tools.sharding merge shard-*.json --output jobs.json
+    """
+    arg_parser = argparse.ArgumentParser(description="Sharded Jenkins job discovery")
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+
+    discover = commands.add_parser('discover', help="Discover the jobs of one shard")
+    discover.add_argument('--config', required=True, help="Dynamic configuration JSON with a 'jenkins' section")
+    discover.add_argument('--shard-index', type=int, required=True)
+    discover.add_argument('--shard-count', type=int, required=True)
+    discover.add_argument('--output', required=True)
+    discover.add_argument('--controller', help="Controller to discover, when several are configured")
+
+    merge = commands.add_parser('merge', help="Merge shard outputs into one result")
+    merge.add_argument('inputs', nargs='+')
+    merge.add_argument('--output', required=True)
+
+    args = arg_parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == 'discover':
+        if not 0 <= args.shard_index < args.shard_count:
+            arg_parser.error("--shard-index must be between 0 and --shard-count - 1")
+
+        from kubiya_sdk.tools.registry import tool_registry
+        from . import get_jenkins_config
+        from .controllers import select_controller
+
+        with open(args.config) as f:
+            tool_registry.dynamic_config = json.load(f)
+        config = select_controller(get_jenkins_config(), args.controller)
+        jobs = config['jobs']
+        result = discover_shard(
+            config, args.shard_index, args.shard_count,
+            job_include_filter=jobs['include'] if not jobs['sync_all'] else None,
+            job_exclude_filter=jobs['exclude'] if not jobs['sync_all'] else None
+        )
+    else:
+        result = merge_results(load_result(path) for path in args.inputs)
+
+    save_result(args.output, result)
+    jobs_info, warnings, errors = result
+    logger.info(f"Wrote {len(jobs_info)} jobs, {len(warnings)} warnings and {len(errors)} errors to {args.output}")
+    return 1 if errors and not jobs_info else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
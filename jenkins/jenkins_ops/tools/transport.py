@@ -0,0 +1,116 @@
+import base64
+import logging
+import random
+import threading
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying, and the subset that signals server-side throttling
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+THROTTLE_STATUS_CODES = {429, 503}
+
+def create_session(username: str, api_token: str, pool_size: int = 4) -> requests.Session:
+    """
+    Create an authenticated session whose connection pool matches the worker count.
+
+    Args:
+        username: Jenkins username
+        api_token: Jenkins API token or password
+        pool_size: Number of connections kept open per host
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    auth = base64.b64encode(f"{username}:{api_token}".encode()).decode()
+    session.headers.update({
+        'Authorization': f'Basic {auth}',
+        'Content-Type': 'application/json',
+        'Accept-Encoding': 'gzip, deflate',
+    })
+    return session
+
+def backoff_delay(attempt: int, backoff_factor: float, max_backoff: float = 30.0, retry_after: Optional[str] = None) -> float:
+    """
+    Compute the delay before retry number ``attempt`` (0-based).
+
+    Uses exponential backoff with full jitter, and honours a numeric
+    ``Retry-After`` header when the server sends one.
+    """
+    if retry_after:
+        try:
+            return min(max(float(retry_after), 0.0), max_backoff)
+        except ValueError:
+            pass
+    return random.uniform(0, min(max_backoff, backoff_factor * (2 ** attempt)))
+
+def wire_size(response: requests.Response) -> int:
+    """
+    Bytes of a response body as received, before gzip or deflate decoding.
+
+    urllib3 counts the bytes read from the connection; the Content-Length
+    header, then the decoded body, are used when that count is unavailable.
+    """
+    try:
+        size = response.raw.tell()
+        if size:
+            return size
+    except Exception:
+        pass
+    length = response.headers.get('Content-Length', '')
+    return int(length) if length.isdigit() else len(response.content)
+
+class AdaptiveLimiter:
+    """
+    Concurrency limiter that adapts to observed latency and throttling.
+
+    The limit grows by one after a full window of fast responses, shrinks by
+    one when responses are slower than ``latency_target`` and is halved when
+    the server throttles (HTTP 429/503).
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, latency_target: float = 2.0, enabled: bool = True):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.latency_target = latency_target
+        self.enabled = enabled
+        self.limit = self.max_limit
+        self.in_flight = 0
+        self._successes = 0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> None:
+        """Block until a request slot is available under the current limit."""
+        with self._condition:
+            while self.enabled and self.in_flight >= self.limit:
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self, latency: float, throttled: bool = False) -> None:
+        """Release a request slot and adjust the limit from the request outcome."""
+        with self._condition:
+            self.in_flight -= 1
+            if self.enabled:
+                self._adjust(latency, throttled)
+            self._condition.notify_all()
+
+    def _adjust(self, latency: float, throttled: bool) -> None:
+        previous = self.limit
+        if throttled:
+            self.limit = max(self.min_limit, self.limit // 2)
+            self._successes = 0
+        elif latency > self.latency_target:
+            self.limit = max(self.min_limit, self.limit - 1)
+            self._successes = 0
+        else:
+            self._successes += 1
+            if self._successes >= self.limit:
+                self.limit = min(self.max_limit, self.limit + 1)
+                self._successes = 0
+
+        if self.limit != previous:
+            logger.debug(f"Adjusted request concurrency from {previous} to {self.limit}")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Build a pre-baked environment for the Jenkins job runner.
+
+The runner's pinned dependencies (jenkins_ops/scripts/runner-requirements.txt)
+are packaged once, so job executions start without reaching PyPI:
+
+    # Wheel set for a shared volume, installed offline with --no-index
+    python scripts/build_runner_env.py wheelhouse /mnt/jenkins-runner/wheels
+
+    # Single zipapp that runs the runner with the bundled dependencies,
+    # written next to jenkins_job_runner.py by default
+    python scripts/build_runner_env.py zipapp
+
+Wheels are resolved for the runner image (CPython 3.12 on manylinux x86_64 by
+default), independent of the interpreter running this script.
+"""
+import argparse
+import shutil
+import subprocess
+import sys
+import tempfile
+import zipapp
+from pathlib import Path
+
+RUNNER_SCRIPTS = Path(__file__).resolve().parent.parent / 'jenkins_ops' / 'scripts'
+REQUIREMENTS = RUNNER_SCRIPTS / 'runner-requirements.txt'
+# Shipped next to jenkins_job_runner.py by tools with runner_environment "zipapp"
+DEFAULT_ZIPAPP = RUNNER_SCRIPTS / 'jenkins_runner_deps.pyz'
+
+# Runs the script given as first argument with the bundled dependencies importable:
+#   python3 jenkins_runner_deps.pyz jenkins_job_runner.py
+ZIPAPP_MAIN = '''import runpy
+import sys
+
+sys.argv = sys.argv[1:]
+runpy.run_path(sys.argv[0], run_name='__main__')
+'''
+
+def pip(*args: str) -> None:
+    subprocess.run([sys.executable, '-m', 'pip', *args], check=True)
+
+def platform_args(python_version: str, platform: str):
+    return ['--python-version', python_version, '--platform', platform]
+
+def build_wheelhouse(output: Path, python_version: str, platform: str) -> None:
+    """Download the pinned wheels and the requirements file into ``output``."""
+    output.mkdir(parents=True, exist_ok=True)
+    pip('download', '--quiet', '--no-deps', '--prefer-binary', '--dest', str(output), '-r', str(REQUIREMENTS),
+        *platform_args(python_version, platform))
+    # Pure Python packages published only as sdists are built
+    # into wheels here, so the offline install never needs setuptools
+    for sdist in [*output.glob('*.tar.gz'), *output.glob('*.zip')]:
+        pip('wheel', '--quiet', '--no-deps', '--wheel-dir', str(output), str(sdist))
+        sdist.unlink()
+    shutil.copy(REQUIREMENTS, output / 'requirements.txt')
+    print(f"Wrote {len(list(output.glob('*.whl')))} wheels to {output}")
+
+def build_zipapp(output: Path, python_version: str, platform: str) -> None:
+    """Install the pinned wheels into a temporary directory and zip it up."""
+    with tempfile.TemporaryDirectory() as tmp:
+        wheelhouse, target = Path(tmp) / 'wheels', Path(tmp) / 'deps'
+        build_wheelhouse(wheelhouse, python_version, platform)
+        pip('install', '--quiet', '--no-index', '--find-links', str(wheelhouse), '--no-deps', '--no-compile',
+            '--only-binary=:all:', '--target', str(target), '-r', str(REQUIREMENTS),
+            *platform_args(python_version, platform))
+        shutil.rmtree(target / 'bin', ignore_errors=True)
+        # Extension modules cannot be imported from a zip; their pure Python fallbacks are used instead
+        for extension in target.rglob('*.so'):
+            extension.unlink()
+        (target / '__main__.py').write_text(ZIPAPP_MAIN)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        zipapp.create_archive(target, output, compressed=True)
+    print(f"Wrote {output} ({output.stat().st_size // 1024} KiB)")
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build a pre-baked Jenkins runner environment")
+    parser.add_argument('mode', choices=['wheelhouse', 'zipapp'])
+    parser.add_argument('output', type=Path, nargs='?',
+                        help=f"Wheelhouse directory or .pyz file to write (zipapp default: {DEFAULT_ZIPAPP})")
+    parser.add_argument('--python-version', default='3.12', help="Python version of the runner image")
+    parser.add_argument('--platform', default='manylinux2014_x86_64', help="Platform tag of the runner image")
+    args = parser.parse_args()
+
+    if args.mode == 'wheelhouse':
+        if args.output is None:
+            parser.error("the wheelhouse directory is required")
+        build_wheelhouse(args.output, args.python_version, args.platform)
+    else:
+        build_zipapp(args.output or DEFAULT_ZIPAPP, args.python_version, args.platform)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+import pytest
+from jenkins_ops.tools.descriptions import CHARS_PER_TOKEN, DescriptionCompiler
+from jenkins_ops.tools.jobinfo import JOB_URL_LABEL
+
+URL_LINE = f"{JOB_URL_LABEL}http://jenkins.example.com/job/deploy"
+
+def test_unknown_unit_is_rejected():
+    with pytest.raises(ValueError):
+        DescriptionCompiler(unit='words')
+
+def test_token_budgets_are_scaled_to_characters():
+    compiler = DescriptionCompiler(tool_budget=100, parameter_budget=20, unit='tokens')
+    assert compiler.tool_budget == 100 * CHARS_PER_TOKEN
+    assert compiler.parameter_budget == 20 * CHARS_PER_TOKEN
+
+def test_signature_changes_with_settings():
+    assert DescriptionCompiler().signature != DescriptionCompiler(tool_budget=500).signature
+    assert DescriptionCompiler().signature != DescriptionCompiler(details_tool='jenkins_job_details').signature
+
+def test_clean_strips_html_and_repeated_lines():
+    text = '<p>Deploy the <b>service</b></p><br/>Deploy the service\n\n\n&lt;env&gt;   only'
+    assert DescriptionCompiler.clean(text) == 'Deploy the service\n\n<env> only'
+    assert DescriptionCompiler.clean(None) == ''
+
+def test_truncate_cuts_at_a_word_boundary():
+    text = 'deploy the service to the production cluster'
+    cut = DescriptionCompiler.truncate(text, 30, suffix=' [more]')
+    assert len(cut) <= 30
+    assert cut == 'deploy the service... [more]'
+    assert DescriptionCompiler.truncate(text, 0) == text
+    assert DescriptionCompiler.truncate(text, len(text)) == text
+
+def test_format_choices_limits_the_shown_choices():
+    compiler = DescriptionCompiler(max_choices=3, details_tool='jenkins_job_details')
+    assert compiler.format_choices(['dev', 'prod']) == 'Allowed values: ["dev", "prod"]'
+    assert compiler.format_choices(['a', 'b', 'c', 'd', 'e']) == (
+        'Allowed values: ["a", "b", "c", ... 2 more, see jenkins_job_details]'
+    )
+
+def test_format_choices_stops_at_half_the_parameter_budget():
+    compiler = DescriptionCompiler(parameter_budget=60, max_choices=100)
+    formatted = compiler.format_choices([f'choice-{index}' for index in range(50)])
+    assert formatted.startswith('Allowed values: ["choice-0", "choice-1", ...')
+    assert '... 48 more' in formatted
+
+def test_parameter_description_drops_a_repeated_name():
+    compiler = DescriptionCompiler()
+    assert compiler.parameter_description('deploy_env', 'Deploy env', ['Type: string']) == 'Type: string'
+
+def test_parameter_description_keeps_details_and_cuts_the_description():
+    compiler = DescriptionCompiler(parameter_budget=60)
+    details = ['Allowed values: ["dev", "prod"]']
+    text = compiler.parameter_description('env', 'word ' * 40, details)
+    assert len(text) <= 60
+    assert text.endswith('\nAllowed values: ["dev", "prod"]')
+    assert '...' in text
+
+def test_tool_description_keeps_the_job_url_line():
+    compiler = DescriptionCompiler(tool_budget=120)
+    text = compiler.tool_description(f"{'Deploys the service. ' * 20}\n{URL_LINE}")
+    assert text.endswith(f"\n\n{URL_LINE}")
+    assert '...' in text
+
+def test_tool_description_without_budget_is_only_cleaned():
+    compiler = DescriptionCompiler(tool_budget=0)
+    description = f"<p>{'Deploys the service. ' * 100}</p>"
+    assert compiler.tool_description(description) == DescriptionCompiler.clean(description)
+
+def test_tool_description_counts_the_url_line_and_hint_against_the_budget():
+    compiler = DescriptionCompiler(tool_budget=200, details_tool='jenkins_job_details')
+    text = compiler.tool_description(f"{'Deploys the service. ' * 20}\n{URL_LINE}", job_name='deploy')
+    assert len(text) <= 200
+    assert 'Full details: jenkins_job_details with job=deploy' in text
+    assert text.endswith(URL_LINE)
+
+def test_tool_description_drops_the_hint_when_the_budget_is_too_small():
+    compiler = DescriptionCompiler(tool_budget=len(URL_LINE) + 40, details_tool='jenkins_job_details')
+    text = compiler.tool_description(f"{'Deploys the service. ' * 20}\n{URL_LINE}", job_name='deploy')
+    assert len(text) <= compiler.tool_budget
+    assert 'Full details' not in text
+    assert text.endswith(URL_LINE)
+
+def test_tool_description_keeps_only_the_url_line_within_a_tiny_budget():
+    compiler = DescriptionCompiler(tool_budget=10)
+    assert compiler.tool_description(f"Deploys the service.\n{URL_LINE}") == URL_LINE
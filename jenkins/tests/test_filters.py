@@ -0,0 +1,61 @@
+from jenkins_ops.tools.filters import JobFilter, _Patterns, _literal_prefix
+
+def test_literal_prefix():
+    assert _literal_prefix('team-a/*') == 'team-a/'
+    assert _literal_prefix('team-?/deploy') == 'team-'
+    assert _literal_prefix('[ab]/deploy') == ''
+    assert _literal_prefix('team-a/deploy') == 'team-a/deploy'
+
+def test_patterns_compile_entries_by_kind():
+    patterns = _Patterns(['/team-a/deploy/', 'team-b/*', 're:-nightly$', ''])
+    assert patterns.names == {'team-a/deploy'}
+    assert patterns.name_folders == {'team-a'}
+    assert patterns.glob_patterns == ['team-b/*']
+    assert patterns.glob_prefixes == ['team-b/']
+    assert [regex.pattern for regex in patterns.regexes] == ['-nightly$']
+    assert not _Patterns(['', '/'])
+
+def test_matches_names_globs_and_regexes():
+    job_filter = JobFilter(['team-a/deploy', 'team-b/*', 're:-nightly$'], ['team-b/legacy/*'])
+    assert job_filter.matches('team-a/deploy')
+    assert not job_filter.matches('team-a/build')
+    assert job_filter.matches('team-b/nested/build')
+    assert job_filter.matches('tests/unit-nightly')
+    assert not job_filter.matches('team-b/legacy/build')
+
+def test_empty_filter_matches_everything():
+    job_filter = JobFilter()
+    assert not job_filter.active
+    assert job_filter.matches('any/job')
+    assert not job_filter.prunes('any')
+
+def test_may_contain_named_jobs():
+    job_filter = JobFilter(['platform/tools/deploy'])
+    assert job_filter.may_contain('platform')
+    assert job_filter.may_contain('platform/tools')
+    assert not job_filter.may_contain('platform/other')
+    assert not job_filter.may_contain('team-a')
+
+def test_may_contain_glob_literal_prefix():
+    job_filter = JobFilter(['team-a/svc-*'])
+    assert job_filter.may_contain('team-a')
+    assert not job_filter.may_contain('team-b')
+    # 'team-*' can match below any folder starting with 'team-'
+    job_filter = JobFilter(['team-*'])
+    assert job_filter.may_contain('team-a')
+    assert job_filter.may_contain('team-b/nested')
+    assert not job_filter.may_contain('platform')
+
+def test_include_regex_disables_include_pruning():
+    job_filter = JobFilter(['team-a/deploy', 're:deploy$'])
+    assert job_filter.may_contain('platform')
+    assert not job_filter.prunes('platform')
+
+def test_excludes_folder_only_for_trailing_star_globs():
+    job_filter = JobFilter(exclude=['legacy/*', 'archive/*-old', 're:^tmp/'])
+    assert job_filter.excludes_folder('legacy')
+    assert job_filter.excludes_folder('legacy/nested')
+    assert not job_filter.excludes_folder('legacy-2')
+    assert not job_filter.excludes_folder('archive')
+    assert not job_filter.excludes_folder('tmp')
+    assert job_filter.prunes('legacy')
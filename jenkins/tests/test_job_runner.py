@@ -0,0 +1,250 @@
+import gzip
+import json
+import threading
+import time
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+from jenkins_ops.scripts.jenkins_job_runner import (
+    BuildCancelled, BuildIndex, BuildLog, JenkinsApiClient, JenkinsApiError, JenkinsJobRunner, MAX_LINE_BYTES,
+    build_started_at, make_line_filter, normalize_parameter_names, parameter_hash
+)
+
+JENKINS_URL = 'http://jenkins.example.com'
+
+class FakeJenkins:
+    """Stands in for JenkinsApiClient: every queue item starts build 100 + its queue id."""
+
+    def __init__(self, result=None):
+        self.result = result
+        self.queued = 0
+        self.lock = threading.Lock()
+
+    def build_job(self, job_name, parameters=None):
+        with self.lock:
+            self.queued += 1
+            return self.queued
+
+    def get_queue_item(self, queue_id):
+        return {'executable': {'number': 100 + queue_id}}
+
+    def get_build_info(self, job_name, build_number):
+        return {'result': self.result}
+
+    def cancel_queue(self, queue_id):
+        pass
+
+def make_runner(tmp_path, server, window=600):
+    runner = JenkinsJobRunner(JENKINS_URL, 'user', 'token', 'app', dedup_window=window,
+                              dedup_index_path=str(tmp_path / 'dedup' / 'builds.json'))
+    runner.server = server
+    return runner
+
+def collect_log(**kwargs):
+    output = []
+    return BuildLog(output=output.extend, **kwargs), output
+
+def test_build_log_splits_chunks_into_lines():
+    log, output = collect_log()
+    log.write(b'first\nsec')
+    log.write(b'ond\nthird')
+    assert output == ['first', 'second']
+    log.close()
+    assert output == ['first', 'second', 'third']
+    assert log.lines == 3
+    assert log.bytes == len(b'first\nsecond\nthird')
+
+def test_build_log_never_splits_multibyte_characters():
+    log, output = collect_log()
+    data = 'déploiement ✅\n'.encode()
+    log.write(data[:2])
+    log.write(data[2:])
+    assert output == ['déploiement ✅']
+
+def test_build_log_flushes_overlong_partial_lines():
+    log, output = collect_log()
+    log.write(b'x' * (MAX_LINE_BYTES + 1))
+    assert output == ['x' * (MAX_LINE_BYTES + 1)]
+
+def test_build_log_filters_lines_and_keeps_a_tail():
+    log, output = collect_log(line_filter=make_line_filter('ERROR'), tail_lines=2)
+    log.write(b'step 1\nERROR: failed\nstep 2\nstep 3\n')
+    log.close()
+    assert output == ['ERROR: failed']
+    assert log.hidden == 3
+    assert list(log.tail) == ['step 2', 'step 3']
+    summary = log.summary()
+    assert summary[0].startswith('🔎 3 of 4 log lines hidden')
+    assert summary[1:] == ['step 2', 'step 3']
+
+def test_build_log_collapses_repeated_filtered_lines():
+    log, output = collect_log(line_filter=make_line_filter('retry'))
+    log.write(b'retry\nretry\nretry\nretry done\n')
+    log.close()
+    assert output == ['retry', '... previous line repeated 2 more times', 'retry done']
+
+def test_build_log_passes_unfiltered_lines_unchanged():
+    log, output = collect_log()
+    log.write(b'retry\nretry\nretry\n')
+    log.close()
+    assert output == ['retry', 'retry', 'retry']
+
+def test_build_log_strips_carriage_returns():
+    log, output = collect_log(line_filter=make_line_filter('step'), tail_lines=5)
+    log.write(b'step 1\r\nother\r\n')
+    log.close()
+    assert output == ['step 1']
+    assert list(log.tail) == ['step 1', 'other']
+
+def test_build_log_archives_the_full_log(tmp_path):
+    archive = tmp_path / 'logs' / 'build.log.gz'
+    log, _ = collect_log(archive_path=str(archive), line_filter=make_line_filter('shown'))
+    log.write(b'hidden\nshown\n')
+    log.close()
+    assert gzip.decompress(archive.read_bytes()) == b'hidden\nshown\n'
+    assert log.summary()[-1] == f"🗄️ Full log (13 bytes) archived to {archive}"
+
+def test_parameter_hash_ignores_order_and_value_types():
+    assert parameter_hash(JENKINS_URL, 'app', {'A': 1, 'B': True}) == parameter_hash(f"{JENKINS_URL}/", '/app/', {'B': 'True', 'A': '1'})
+    assert parameter_hash(JENKINS_URL, 'app', {'A': 1}) != parameter_hash(JENKINS_URL, 'app', {'A': 2})
+
+def test_build_index_drops_expired_entries(tmp_path):
+    index = BuildIndex(str(tmp_path / 'builds.json'), window=60)
+    with index.locked() as entries:
+        entries['fresh'] = {'queue_id': 1, 'triggered_at': 10 ** 10}
+        entries['expired'] = {'queue_id': 2, 'triggered_at': 0}
+    with index.locked() as entries:
+        assert list(entries) == ['fresh']
+
+def test_build_index_ignores_an_unreadable_file(tmp_path):
+    path = tmp_path / 'builds.json'
+    path.write_text('{not json')
+    with BuildIndex(str(path), window=60).locked() as entries:
+        assert entries == {}
+
+def test_trigger_deduplicated_attaches_to_a_running_build(tmp_path):
+    server = FakeJenkins()
+    first = make_runner(tmp_path, server)._trigger_deduplicated({'ENV': 'dev'})
+    second = make_runner(tmp_path, server)._trigger_deduplicated({'ENV': 'dev'})
+    other = make_runner(tmp_path, server)._trigger_deduplicated({'ENV': 'prod'})
+    assert first == (101, False)
+    assert second == (101, True)
+    assert other == (102, False)
+    assert server.queued == 2
+
+def test_trigger_deduplicated_queues_again_after_a_failed_build(tmp_path):
+    server = FakeJenkins()
+    make_runner(tmp_path, server)._trigger_deduplicated({'ENV': 'dev'})
+    server.result = 'FAILURE'
+    assert make_runner(tmp_path, server)._trigger_deduplicated({'ENV': 'dev'}) == (102, False)
+
+def test_trigger_deduplicated_records_the_build(tmp_path):
+    server = FakeJenkins()
+    runner = make_runner(tmp_path, server)
+    runner._trigger_deduplicated({'ENV': 'dev'})
+    index = json.loads((tmp_path / 'dedup' / 'builds.json').read_text())
+    entry = index[parameter_hash(JENKINS_URL, 'app', {'ENV': 'dev'})]
+    assert (entry['job'], entry['queue_id'], entry['build_number']) == ('app', 1, 101)
+
+def test_concurrent_identical_requests_queue_one_build(tmp_path):
+    server = FakeJenkins()
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(make_runner(tmp_path, server)._trigger_deduplicated({'ENV': 'qa'})))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert server.queued == 1
+    assert sorted(results) == [(101, False)] + [(101, True)] * 7
+
+def test_trigger_deduplicated_releases_the_claim_when_queueing_fails(tmp_path):
+    class FailingJenkins(FakeJenkins):
+        def build_job(self, job_name, parameters=None):
+            raise RuntimeError('Jenkins is down')
+
+    server = FailingJenkins()
+    with pytest.raises(RuntimeError):
+        make_runner(tmp_path, server)._trigger_deduplicated({'ENV': 'dev'})
+    assert json.loads((tmp_path / 'dedup' / 'builds.json').read_text()) == {}
+
+def test_trigger_deduplicated_stops_when_cancelled(tmp_path):
+    runner = make_runner(tmp_path, FakeJenkins())
+    runner.cancel()
+    with pytest.raises(BuildCancelled):
+        runner._trigger_deduplicated({'ENV': 'dev'})
+
+def make_client(*responses):
+    """Return a client whose session answers with ``responses`` in turn, and the list of sent requests."""
+    client = JenkinsApiClient(JENKINS_URL, 'user', 'token', backoff_factor=0)
+    client._crumb = {}
+    answers = iter(responses)
+    sent = []
+
+    def send(method, url, **kwargs):
+        sent.append(method)
+        answer = next(answers)
+        if isinstance(answer, Exception):
+            raise answer
+        response = requests.Response()
+        response.status_code = answer
+        response.url = url
+        response.headers['Location'] = f'{JENKINS_URL}/queue/item/7/'
+        return response
+
+    client.session.request = send
+    return client, sent
+
+def connection_refused():
+    reason = NewConnectionError(None, 'Connection refused')
+    return requests.exceptions.ConnectionError(MaxRetryError(None, JENKINS_URL, reason))
+
+def test_get_requests_are_retried_on_gateway_errors():
+    client, sent = make_client(502, 504, 200)
+    assert client.request('GET', 'api/json').status_code == 200
+    assert sent == ['GET'] * 3
+
+def test_post_requests_are_not_retried_on_gateway_errors():
+    client, sent = make_client(502, 201)
+    with pytest.raises(JenkinsApiError):
+        client.build_job('app', {'ENV': 'dev'})
+    assert sent == ['POST']
+
+def test_post_requests_are_retried_when_throttled():
+    client, sent = make_client(429, 503, 201)
+    assert client.build_job('app', {'ENV': 'dev'}) == 7
+    assert sent == ['POST'] * 3
+
+def test_post_requests_are_retried_only_when_not_sent():
+    client, sent = make_client(connection_refused(), 201)
+    assert client.build_job('app') == 7
+    assert sent == ['POST'] * 2
+
+    client, sent = make_client(requests.exceptions.ConnectionError('Connection reset by peer'), 201)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.build_job('app')
+    assert sent == ['POST']
+
+def test_parameter_sets_accept_sanitized_and_original_names():
+    param_types = {
+        'environment': {'type': 'str', 'name': 'environment', 'original_name': 'ENVIRONMENT'},
+        'dry_run': {'type': 'bool', 'name': 'dry_run', 'original_name': 'Dry Run'},
+    }
+    normalized = normalize_parameter_names({'ENVIRONMENT': 'prod', 'dry_run': True, 'EXTRA': 1}, param_types)
+    assert normalized == {'environment': 'prod', 'dry_run': True, 'EXTRA': 1}
+    # A set written with the original name overrides the common parameter
+    assert {**{'environment': 'dev'}, **normalized}['environment'] == 'prod'
+
+def test_parameters_are_sent_with_their_original_names(tmp_path):
+    runner = make_runner(tmp_path, FakeJenkins())
+    param_types = {'dry_run': {'type': 'bool', 'name': 'dry_run', 'original_name': 'Dry Run'}}
+    assert runner._prepare_parameters_for_jenkins({'dry_run': True}, param_types) == {'Dry Run': 'true'}
+
+def test_build_start_is_offset_once_onto_the_monotonic_clock():
+    started = build_started_at({'timestamp': (time.time() - 120) * 1000})
+    assert 119 <= time.monotonic() - started <= 121
+    # A server clock ahead of the local one does not give a negative elapsed time
+    assert time.monotonic() - build_started_at({'timestamp': (time.time() + 60) * 1000}) < 1
+    assert time.monotonic() - build_started_at({}) < 1
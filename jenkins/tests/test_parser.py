@@ -0,0 +1,46 @@
+from jenkins_ops.tools.filters import JobFilter
+from jenkins_ops.tools.parser import JenkinsJobParser
+
+JENKINS_URL = 'http://jenkins.example.com'
+
+def make_parser(listing, **kwargs):
+    parser = JenkinsJobParser(JENKINS_URL, 'user', 'token', **kwargs)
+    parser._make_request = lambda endpoint, **_: listing
+    return parser
+
+def folder_listing():
+    return {'jobs': [
+        {'_class': 'org.jenkinsci.plugins.workflow.job.WorkflowJob', 'name': 'deploy',
+         'url': f'{JENKINS_URL}/job/team-a/job/nested/job/deploy/'},
+        {'_class': 'hudson.model.FreeStyleProject', 'name': 'build',
+         'url': f'{JENKINS_URL}/job/team-a/job/nested/job/build/'},
+        {'_class': 'com.cloudbees.hudson.plugins.folder.Folder', 'name': 'tools',
+         'url': f'{JENKINS_URL}/job/team-a/job/nested/job/tools/'},
+    ]}
+
+def test_list_folder_derives_full_names_from_the_folder():
+    jobs, folders = make_parser(folder_listing())._list_folder(
+        f'{JENKINS_URL}/job/team-a/job/nested/api/json', 'team-a/nested'
+    )
+    assert [job['full_name'] for job in jobs] == ['team-a/nested/deploy', 'team-a/nested/build']
+    assert [job['name'] for job in jobs] == ['deploy', 'build']
+    assert folders == [(f'{JENKINS_URL}/job/team-a/job/nested/job/tools/api/json', 'team-a/nested/tools')]
+
+def test_list_folder_at_the_root_uses_short_names():
+    listing = {'jobs': [{'_class': 'hudson.model.FreeStyleProject', 'name': 'build', 'url': f'{JENKINS_URL}/job/build/'}]}
+    jobs, folders = make_parser(listing)._list_folder(f'{JENKINS_URL}/api/json')
+    assert [job['full_name'] for job in jobs] == ['build']
+    assert folders == []
+
+def test_list_folder_prefers_the_full_name_from_jenkins():
+    listing = {'jobs': [{'_class': 'hudson.model.FreeStyleProject', 'name': 'build', 'fullName': 'other/build',
+                         'url': f'{JENKINS_URL}/job/other/job/build/'}]}
+    jobs, _ = make_parser(listing)._list_folder(f'{JENKINS_URL}/job/team-a/api/json', 'team-a')
+    assert jobs[0]['full_name'] == 'other/build'
+
+def test_list_folder_prunes_sub_folders_by_full_name():
+    parser = make_parser(folder_listing())
+    parser.job_filter = JobFilter(['team-a/nested/deploy'])
+    _, folders = parser._list_folder(f'{JENKINS_URL}/job/team-a/job/nested/api/json', 'team-a/nested')
+    assert folders == []
+    assert parser.pruned_folders == 1
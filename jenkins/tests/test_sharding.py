@@ -0,0 +1,31 @@
+from jenkins_ops.tools.sharding import merge_results, shard_for, shard_path
+
+NO_JOBS = "No jobs were found in Jenkins server"
+NO_MATCH = "No jobs matched the filter: ['team-a/*']"
+NOTHING_PROCESSED = "No jobs were found or all jobs failed to process"
+
+def test_shard_for_is_stable_across_hosts():
+    assert shard_for('http://a.example.com/job/team-a/', 4) == shard_for('https://b.example.com/job/team-a', 4)
+    assert shard_for('http://a.example.com/job/team-a/', 1) == 0
+
+def test_shard_path_keeps_the_extension():
+    assert shard_path('/var/cache/jobs.json', 1, 4) == '/var/cache/jobs.shard-1-of-4.json'
+
+def test_merge_drops_empty_shard_messages_once_jobs_were_found():
+    jobs_info, warnings, errors = merge_results([
+        ({'team-a/deploy': {}}, [], []),
+        ({}, [NO_JOBS], [NOTHING_PROCESSED]),
+        ({}, [NO_MATCH], [NOTHING_PROCESSED]),
+    ])
+    assert list(jobs_info) == ['team-a/deploy']
+    assert warnings == []
+    assert errors == []
+
+def test_merge_keeps_empty_shard_messages_when_no_shard_found_jobs():
+    _, warnings, errors = merge_results([({}, [NO_MATCH], []), ({}, [NO_MATCH], [NOTHING_PROCESSED])])
+    assert warnings == [NO_MATCH]
+    assert errors == [NOTHING_PROCESSED]
+
+def test_merge_reports_jobs_found_by_several_shards():
+    _, warnings, _ = merge_results([({'deploy': {}}, [], []), ({'deploy': {}}, [], [])])
+    assert warnings == ["Job deploy was discovered by more than one shard"]